@@ -288,10 +288,19 @@ class EpBunch(Bunch):
             except IndexError:
                 extendlist(self.fieldvalues, i)
                 self.fieldvalues[i] = value
+            if 'Node' in name:
+                self._nodechanged(i)
         else:
             astr = "unable to find field %s" % (name,)
             raise BadEPFieldError(astr)  # TODO: could raise AttributeError
 
+    def _nodechanged(self, i):
+        """tell the node index of the idf (see idf_helpers.nodeindex) that
+        the field i may be a node field with a new value"""
+        index = getattr(self.theidf, '_nodeindex', None)
+        if index is not None:
+            index.addfield(self, i)
+
     def __getattr__(self, name):
         try:
             func = self['__functions'][name]
@@ -321,7 +330,8 @@ class EpBunch(Bunch):
 
     def __getitem__(self, key):
         if key in ('obj', 'objls', 'objidd',
-                '__functions', '__aliases', 'theidf'):
+                '__functions', '__aliases', '__geometry', '__thermal',
+                'theidf'):
             return super(EpBunch, self).__getitem__(key)
         elif key in self.fieldnames:
             i = self.fieldnames.index(key)
@@ -335,7 +345,8 @@ class EpBunch(Bunch):
 
     def __setitem__(self, key, value):
         if key in ('obj', 'objls', 'objidd',
-                '__functions', '__aliases', 'theidf'):
+                '__functions', '__aliases', '__geometry', '__thermal',
+                'theidf'):
             super(EpBunch, self).__setitem__(key, value)
             return None
         elif key in self.fieldnames:
@@ -345,6 +356,8 @@ class EpBunch(Bunch):
             except IndexError:
                 extendlist(self.fieldvalues, i)
                 self.fieldvalues[i] = value
+            if 'Node' in key:
+                self._nodechanged(i)
         else:
             astr = "unknown field %s" % (key,)
             raise BadEPFieldError(astr)
@@ -19,49 +19,84 @@ import warnings
 
 INSIDE_FILM_R = 0.12
 OUTSIDE_FILM_R = 0.03
+UFACTOR_IP = 0.076 / 0.429  # base on doing conversion in the table report
 
 
-def rvalue(ddtt):
+def materialindex(idf, validobjects):
+    """{NAME: material, ...} for all the objects of the keys in validobjects.
+    Used to find the layers of constructions without searching the idf"""
+    index = {}
+    for key in validobjects:
+        for material in idf.idfobjects[key.upper()]:
+            index.setdefault(material.obj[1].upper(), material)
+    return index
+
+
+def layers(ddtt, index=None):
+    """the materials of the layers of the construction ddtt.
+    index is from materialindex. It is made if it is None"""
+    if index is None:
+        field_idd = ddtt.getfieldidd('Outside_Layer')
+        index = materialindex(ddtt.theidf, field_idd['validobjects'])
+    materials = []
+    for layer in ddtt.obj[2:]:
+        try:
+            materials.append(index[layer.upper()])
+        except KeyError:
+            raise AttributeError("%s material not found in IDF" % layer)
+    return materials
+
+
+def _materialvalue(material, name, func):
+    """func(material), kept in material['__thermal'].
+    It is worked out again when any field of the material changes"""
+    fields = tuple(material.obj)
+    try:
+        cache = material['__thermal']
+    except KeyError:
+        cache = material['__thermal'] = {}
+    if cache.get('fields') != fields:
+        cache.clear()
+        cache['fields'] = fields
+    try:
+        return cache[name]
+    except KeyError:
+        value = cache[name] = func(material)
+        return value
+
+
+def rvalue(ddtt, index=None):
     """
     R value (W/K) of a construction or material.
     thickness (m) / conductivity (W/m-K)
+    index is from materialindex. It is made if it is None
     """
     object_type = ddtt.obj[0]
     if object_type == 'Construction':
-        rvalue = INSIDE_FILM_R + OUTSIDE_FILM_R
-        layers = ddtt.obj[2:]
-        field_idd = ddtt.getfieldidd('Outside_Layer')
-        validobjects = field_idd['validobjects']
-        for layer in layers:
-            found = False
-            for key in validobjects:
-                try:
-                    rvalue += ddtt.theidf.getobject(key, layer).rvalue
-                    found = True
-                except AttributeError:
-                    pass
-            if not found:
-                raise AttributeError("%s material not found in IDF" % layer)
+        total = INSIDE_FILM_R + OUTSIDE_FILM_R
+        for material in layers(ddtt, index):
+            total += _materialvalue(material, 'rvalue', rvalue)
+        return total
     elif object_type == 'Material':
         thickness = ddtt.obj[ddtt.objls.index('Thickness')]
         conductivity = ddtt.obj[ddtt.objls.index('Conductivity')]
-        rvalue = thickness / conductivity
+        value = thickness / conductivity
     elif object_type == 'Material:AirGap':
-        rvalue = ddtt.obj[ddtt.objls.index('Thermal_Resistance')] 
+        value = ddtt.obj[ddtt.objls.index('Thermal_Resistance')] 
     elif object_type == 'Material:InfraredTransparent':
-        rvalue = 0
+        value = 0
     elif object_type == 'Material:NoMass':
-        rvalue = ddtt.obj[ddtt.objls.index('Thermal_Resistance')] 
+        value = ddtt.obj[ddtt.objls.index('Thermal_Resistance')] 
     elif object_type == 'Material:RoofVegetation':
         warnings.warn(
             "Material:RoofVegetation thermal properties are based on dry soil",
             UserWarning)
         thickness = ddtt.obj[ddtt.objls.index('Thickness')]
         conductivity = ddtt.obj[ddtt.objls.index('Conductivity_of_Dry_Soil')]
-        rvalue = thickness / conductivity
+        value = thickness / conductivity
     else:
         raise AttributeError("%s rvalue property not implemented" % object_type)
-    return rvalue
+    return value
 
 def ufactor(ddtt):
     """
@@ -76,49 +111,39 @@ def ufactor_ip(ddtt):
     1 / R value (ft^2 °F hr/Btu)
     """
     # quick fix for Santosh. Needs to thought thru
-    mult = 0.076 / 0.429 # base on doing conversion in the table report
-    return ufactor(ddtt) * mult
+    return ufactor(ddtt) * UFACTOR_IP
 
 def rvalue_ip(ddtt):
     """return R value in IP units"""
     # quick fix for Santosh. Needs to thought thru
     return 1 /  ufactor_ip(ddtt)       
 
-def heatcapacity(ddtt):
+def heatcapacity(ddtt, index=None):
     """
     Heat capacity (kJ/m2-K) of a construction or material.
     thickness (m) * density (kg/m3) * specific heat (J/kg-K) * 0.001
+    index is from materialindex. It is made if it is None
     """
     object_type = ddtt.obj[0]
     if object_type == 'Construction':
-        heatcapacity = 0
-        layers = ddtt.obj[2:]
-        field_idd = ddtt.getfieldidd('Outside_Layer')
-        validobjects = field_idd['validobjects']
-        for layer in layers:
-            found = False
-            for key in validobjects:
-                try:
-                    heatcapacity += ddtt.theidf.getobject(key, layer).heatcapacity
-                    found = True
-                except AttributeError:
-                    pass
-            if not found:
-                raise AttributeError("%s material not found in IDF" % layer)
+        total = 0
+        for material in layers(ddtt, index):
+            total += _materialvalue(material, 'heatcapacity', heatcapacity)
+        return total
     elif object_type == 'Material':
         thickness = ddtt.obj[ddtt.objls.index('Thickness')]
         density = ddtt.obj[ddtt.objls.index('Density')]
         specificheat = ddtt.obj[ddtt.objls.index('Specific_Heat')]
-        heatcapacity = thickness * density * specificheat * 0.001
+        value = thickness * density * specificheat * 0.001
     elif object_type == 'Material:AirGap':
-        heatcapacity = 0
+        value = 0
     elif object_type == 'Material:InfraredTransparent':
-        heatcapacity = 0
+        value = 0
     elif object_type == 'Material:NoMass':
         warnings.warn(
             "Material:NoMass materials included in heat capacity calculation",
             UserWarning)
-        heatcapacity = 0
+        value = 0
     elif object_type == 'Material:RoofVegetation':
         warnings.warn(
             "Material:RoofVegetation thermal properties are based on dry soil",
@@ -126,8 +151,34 @@ def heatcapacity(ddtt):
         thickness = ddtt.obj[ddtt.objls.index('Thickness')]
         density = ddtt.obj[ddtt.objls.index('Density_of_Dry_Soil')]
         specificheat = ddtt.obj[ddtt.objls.index('Specific_Heat_of_Dry_Soil')]
-        heatcapacity = thickness * density * specificheat * 0.001
+        value = thickness * density * specificheat * 0.001
     else:
         raise AttributeError("%s has no heatcapacity property" % object_type)
-    return heatcapacity
-        
+    return value
+
+
+def constructionproperties(idf):
+    """R value, U factor and heat capacity of all the constructions
+    {name: dict(rvalue=, ufactor=, rvalue_ip=, ufactor_ip=, heatcapacity=)}
+
+    The layers are found in one index of the materials, and the values of
+    each material are worked out once. A value is nan if a layer is not in
+    the idf or its material does not have the property"""
+    constructions = idf.idfobjects['CONSTRUCTION']
+    if not constructions:
+        return {}
+    field_idd = constructions[0].getfieldidd('Outside_Layer')
+    index = materialindex(idf, field_idd['validobjects'])
+    result = {}
+    for construction in constructions:
+        values = {}
+        for name, func in (('rvalue', rvalue), ('heatcapacity', heatcapacity)):
+            try:
+                values[name] = func(construction, index)
+            except (AttributeError, TypeError, ValueError):
+                values[name] = float('nan')
+        values['ufactor'] = 1 / values['rvalue']
+        values['ufactor_ip'] = values['ufactor'] * UFACTOR_IP
+        values['rvalue_ip'] = 1 / values['ufactor_ip']
+        result[construction.Name] = values
+    return result
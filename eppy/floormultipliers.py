@@ -0,0 +1,352 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""collapse identical zones stacked over each other into one zone with
+a zone multiplier.
+
+High-rise models often repeat the same floor many times. Zones that have
+the same surfaces (shifted vertically), constructions, boundary conditions
+and loads, and sit directly on top of each other are grouped. The lowest
+zone of each group is kept and its Multiplier is set. The other zones, their
+surfaces and every object that refers to them are removed. Interzone
+surfaces that pointed at a removed zone become Adiabatic.
+
+The node names of the loads and HVAC objects of a zone are left out of its
+signature, and the objects that only one object refers to (like the
+ZoneHVAC:EquipmentList of a ZoneHVAC:EquipmentConnections) are compared by
+their fields, not by their names. So conditioned floors are stacked too.
+The objects that only the removed objects refer to are removed with them,
+and the nodes of the removed zones are taken out of the zone splitters,
+mixers, plenums and NodeLists. Plant branches of the coils of a removed
+zone are not touched. Fix those up after collapsing.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import itertools
+
+from eppy.function_helpers import getcoords
+import eppy.idf_helpers as idf_helpers
+
+
+ZONESURFACEKEYS = [
+    'BUILDINGSURFACE:DETAILED',
+    'WALL:DETAILED',
+    'ROOFCEILING:DETAILED',
+    'FLOOR:DETAILED', ]
+SUBSURFACEKEYS = ['FENESTRATIONSURFACE:DETAILED', ]
+ZONESHADINGKEYS = ['SHADING:ZONE:DETAILED', ]
+ZONEREFNAMES = ['ZoneNames', 'ZoneAndZoneListNames']
+
+# these fields hold names that are different on every floor
+SURFACESKIPFIELDS = ('key', 'Name', 'Zone_Name', 'Building_Surface_Name',
+                     'Base_Surface_Name', 'Outside_Boundary_Condition_Object')
+ZONESKIPFIELDS = ('Name', 'Z_Origin', 'Multiplier')
+# lists of nodes, with the index of the first node of the list
+NODELISTSTARTS = {
+    'AIRLOOPHVAC:ZONESPLITTER': 3,
+    'AIRLOOPHVAC:ZONEMIXER': 3,
+    'AIRLOOPHVAC:SUPPLYPLENUM': 5,
+    'AIRLOOPHVAC:RETURNPLENUM': 6,
+    'NODELIST': 2, }
+
+
+def _fieldsignature(idfobject, skipfields, stopfield=None):
+    """values of the fields not in skipfields, upto stopfield"""
+    values = []
+    for fieldname, value in zip(idfobject.objls, idfobject.obj):
+        if fieldname == stopfield:
+            break
+        if fieldname not in skipfields:
+            values.append(('%s' % (value, )).upper())
+    return tuple(values)
+
+
+class _References(object):
+    """the names that the objects of the idf refer to
+
+    An object owns the objects that only it refers to, like the
+    ZoneHVAC:EquipmentList of a ZoneHVAC:EquipmentConnections"""
+
+    def __init__(self, idf):
+        self.nodefields = idf_helpers.allnodefields(idf)
+        self.fields = idf_helpers.referencefields(idf)
+        self.byname = {}
+        self.counts = {}
+        for key in idf.model.dtls:
+            idfobjects = idf.idfobjects[key]
+            if not idfobjects:
+                continue
+            named = idfobjects[0].objls[1:2] == ['Name']
+            findexes = self.fields.get(key, [])
+            for idfobject in idfobjects:
+                obj = idfobject['obj']  # faster than idfobject.obj
+                if named and len(obj) > 1:
+                    self.byname.setdefault(
+                        ('%s' % (obj[1], )).upper(), []).append(idfobject)
+                for i in findexes:
+                    if i < len(obj) and ('%s' % (obj[i], )).strip():
+                        name = ('%s' % (obj[i], )).upper()
+                        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def owned(self, idfobject, i):
+        """the objects named in field i of idfobject, if nothing else
+        refers to them"""
+        obj = idfobject['obj']
+        if i >= len(obj) or i not in self.fields.get(obj[0].upper(), ()):
+            return []
+        name = ('%s' % (obj[i], )).upper()
+        if self.counts.get(name) != 1:
+            return []
+        return self.byname.get(name, [])
+
+    def signature(self, idfobject, skipfields, seen):
+        """_fieldsignature of idfobject without its node names. The objects
+        it owns are in it as their own signatures. seen is the set of the
+        ids of the objects already in the signature"""
+        seen.add(id(idfobject))
+        obj = idfobject['obj']
+        nodes = self.nodefields.get(obj[0].upper(), ())
+        values = []
+        for i, (fieldname, value) in enumerate(zip(idfobject.objls, obj)):
+            if i == 0 or i in nodes or fieldname in skipfields:
+                continue
+            owned = [other for other in self.owned(idfobject, i)
+                     if id(other) not in seen]
+            if owned:
+                values.append(('', tuple(sorted(
+                    (other.key.upper(), self.signature(other, ('Name', ),
+                                                       seen))
+                    for other in owned))))
+            else:
+                values.append((('%s' % (value, )).upper(), ))
+        return tuple(values)
+
+    def allowned(self, idfobject, seen):
+        """all the objects that idfobject owns, and the objects they own"""
+        seen.add(id(idfobject))
+        result = []
+        for i in range(1, len(idfobject['obj'])):
+            for other in self.owned(idfobject, i):
+                if id(other) not in seen:
+                    result.append(other)
+                    result.extend(self.allowned(other, seen))
+        return result
+
+
+def _relativecoords(coords, zlevel, places):
+    """round the coords and make z relative to zlevel"""
+    return tuple((round(x, places), round(y, places), round(z - zlevel, places))
+                 for x, y, z in coords)
+
+
+def _isrelative(idf):
+    """True if the vertices are relative to the zone origin"""
+    rules = idf.idfobjects['GLOBALGEOMETRYRULES']
+    if not rules:
+        return False
+    return rules[0].Coordinate_System.upper() == 'RELATIVE'
+
+
+def _zorigin(zone, relative):
+    """z origin of the zone if the vertices are relative to it"""
+    if not relative:
+        return 0
+    try:
+        return float(zone.Z_Origin)
+    except ValueError:  # blank field
+        return 0
+
+
+def _multiplier(zone):
+    """Multiplier of the zone as an int"""
+    try:
+        return int(zone.Multiplier)
+    except ValueError:  # blank field
+        return 1
+
+
+def _subsurfaces(idf):
+    """dict of {HOSTNAME: [subsurface, ...]} for all subsurfaces"""
+    hosts = {}
+    for key in SUBSURFACEKEYS:
+        for subsurface in idf.idfobjects[key]:
+            hostname = subsurface.Building_Surface_Name.upper()
+            hosts.setdefault(hostname, []).append(subsurface)
+    return hosts
+
+
+def zonesignatures(idf, places=3):
+    """return {zonename: (signature, zbottom, ztop)} for all zones
+
+    Two zones with the same signature have the same surfaces (after a
+    vertical shift), constructions, boundary conditions, loads and HVAC
+    objects, apart from their names and node names.
+    zbottom and ztop are the lowest and highest vertex of the zone."""
+    relative = _isrelative(idf)
+    zonerefs = idf_helpers.referringfields(idf, ZONEREFNAMES)
+    references = _References(idf)
+    hosts = _subsurfaces(idf)
+    signatures = {}
+    for zone in idf.idfobjects['ZONE']:
+        surfaces = []
+        loads = []
+        for idfobject, fieldname in zonerefs.get(zone.Name.upper(), []):
+            key = idfobject.key.upper()
+            if key in ZONESURFACEKEYS and fieldname == 'Zone_Name':
+                surfaces.append(idfobject)
+            elif key != 'ZONELIST':
+                loads.append((idfobject, fieldname))
+        allcoords = [getcoords(surface) for surface in surfaces]
+        zvalues = [z for x, y, z in itertools.chain(*allcoords)]
+        if not zvalues:
+            continue  # a zone without detailed surfaces
+        zbottom = min(zvalues)
+        surfsigs = []
+        for surface, coords in zip(surfaces, allcoords):
+            subsigs = tuple(sorted(
+                (_fieldsignature(sub, SURFACESKIPFIELDS, 'Number_of_Vertices'),
+                 _relativecoords(getcoords(sub), zbottom, places))
+                for sub in hosts.get(surface.Name.upper(), [])))
+            surfsigs.append(
+                (surface.key.upper(),
+                 _fieldsignature(surface, SURFACESKIPFIELDS,
+                                 'Number_of_Vertices'),
+                 _relativecoords(coords, zbottom, places),
+                 subsigs))
+        seen = set()
+        loadsigs = [(load.key.upper(),
+                     references.signature(load, ('Name', fieldname), seen))
+                    for load, fieldname in loads]
+        signature = (_fieldsignature(zone, ZONESKIPFIELDS),
+                     tuple(sorted(surfsigs)),
+                     tuple(sorted(loadsigs)))
+        zorigin = _zorigin(zone, relative)
+        signatures[zone.Name] = (signature,
+                                 zbottom + zorigin,
+                                 max(zvalues) + zorigin)
+    return signatures
+
+
+def stackedgroups(idf, places=3):
+    """return groups of identical zones stacked directly over each other
+
+    Each group is a list of zone names from the bottom to the top.
+    Only groups with more than one zone are returned."""
+    tolerance = 10 ** -places
+    stacks = {}
+    for zonename, (signature, zbottom, ztop) in zonesignatures(
+            idf, places).items():
+        stacks.setdefault(signature, []).append((zbottom, ztop, zonename))
+    groups = []
+    for stack in stacks.values():
+        stack.sort()
+        run = [stack[0]]
+        for level in stack[1:]:
+            if abs(level[0] - run[-1][1]) < tolerance:
+                run.append(level)
+            else:
+                groups.append(run)
+                run = [level]
+        groups.append(run)
+    groups = [group for group in groups if len(group) > 1]
+    groups.sort()
+    return [[zonename for _zb, _zt, zonename in group] for group in groups]
+
+
+def _removenodes(idf, toremove, references):
+    """take the nodes of the objects in toremove out of the lists of nodes.
+    NodeLists named in their node fields are added to toremove"""
+    removedids = set(id(idfobject) for idfobject in toremove)
+    nodes = set()
+    for idfobject in toremove:
+        obj = idfobject['obj']
+        for i in references.nodefields.get(obj[0].upper(), ()):
+            if i < len(obj) and ('%s' % (obj[i], )).strip():
+                nodes.add(('%s' % (obj[i], )).upper())
+    for key, start in NODELISTSTARTS.items():
+        for nodelist in idf.idfobjects[key]:
+            if id(nodelist) in removedids:
+                continue
+            if key == 'NODELIST' and nodelist.Name.upper() in nodes:
+                toremove.append(nodelist)
+                continue
+            values = nodelist.obj[start:]
+            kept = [value for value in values
+                    if ('%s' % (value, )).upper() not in nodes]
+            if len(kept) < len(values):
+                nodelist.obj[start:] = kept
+
+
+def collapsefloors(idf, groups=None, places=3):
+    """keep one zone of each group and set its Multiplier
+
+    groups is a list of lists of zone names as returned by stackedgroups.
+    If groups is None, stackedgroups(idf, places) is used.
+    The first zone of each group is kept. Its Multiplier becomes the sum of
+    the multipliers of the group.
+
+    returns {keptzonename: [removedzonename, ...], ...}"""
+    if groups is None:
+        groups = stackedgroups(idf, places)
+    zones = dict((zone.Name.upper(), zone) for zone in idf.idfobjects['ZONE'])
+    collapsed = {}
+    removedzones = set()
+    for group in groups:
+        keep = zones[group[0].upper()]
+        keep.Multiplier = sum(_multiplier(zones[zonename.upper()])
+                              for zonename in group)
+        collapsed[keep.Name] = list(group[1:])
+        removedzones.update(zonename.upper() for zonename in group[1:])
+
+    zonerefs = idf_helpers.referringfields(idf, ZONEREFNAMES)
+    references = _References(idf)
+    toremove = [zones[zonename] for zonename in removedzones]
+    removednames = set(removedzones)
+    zonelists = []
+    seen = set()
+    for zonename in removedzones:
+        for idfobject, fieldname in zonerefs.get(zonename, []):
+            key = idfobject.key.upper()
+            if key == 'ZONELIST':
+                zonelists.append(idfobject)
+            elif key in ZONESURFACEKEYS:
+                toremove.append(idfobject)
+                removednames.add(idfobject.Name.upper())
+            elif id(idfobject) not in seen:
+                toremove.append(idfobject)
+                toremove.extend(references.allowned(idfobject, seen))
+    for key in SUBSURFACEKEYS:
+        for subsurface in idf.idfobjects[key]:
+            if subsurface.Building_Surface_Name.upper() in removednames:
+                toremove.append(subsurface)
+                removednames.add(subsurface.Name.upper())
+    for key in ZONESHADINGKEYS:
+        for shading in idf.idfobjects[key]:
+            if shading.Base_Surface_Name.upper() in removednames:
+                toremove.append(shading)
+
+    # surfaces that see a removed zone or surface become adiabatic
+    removedids = set(id(idfobject) for idfobject in toremove)
+    for key in ZONESURFACEKEYS + SUBSURFACEKEYS:
+        for surface in idf.idfobjects[key]:
+            if id(surface) in removedids:
+                continue
+            otherside = surface.Outside_Boundary_Condition_Object
+            if otherside.upper() not in removednames:
+                continue
+            surface.Outside_Boundary_Condition_Object = ''
+            if key in ZONESURFACEKEYS:
+                surface.Outside_Boundary_Condition = 'Adiabatic'
+
+    for zonelist in zonelists:
+        zonelist.obj[2:] = [value for value in zonelist.obj[2:]
+                            if value.upper() not in removedzones]
+    _removenodes(idf, toremove, references)
+    idf_helpers.removeidfobjects(idf, toremove)
+    return collapsed
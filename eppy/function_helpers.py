@@ -31,30 +31,50 @@ def getcoords(ddtt):
     pts = ddtt.obj[first_x:]
     return list(grouper(3, pts))
 
+def setcoords(ddtt, coords):
+    """set the coordinates of the surface and its Number_of_Vertices"""
+    n_vertices_index = ddtt.objls.index('Number_of_Vertices')
+    first_x = n_vertices_index + 1 # X of first coordinate
+    ddtt.obj[n_vertices_index] = len(coords)
+    ddtt.obj[first_x:] = list(itertools.chain.from_iterable(coords))
+
+def _cachedgeometry(ddtt, name, func):
+    """func(coords) of the surface, kept in ddtt['__geometry'].
+    It is worked out again when the vertices or Number_of_Vertices change"""
+    n_vertices_index = ddtt.objls.index('Number_of_Vertices')
+    pts = tuple(ddtt.obj[n_vertices_index:])
+    try:
+        cache = ddtt['__geometry']
+    except KeyError:
+        cache = ddtt['__geometry'] = {}
+    if cache.get('pts') != pts:
+        cache.clear()
+        cache['pts'] = pts
+    try:
+        return cache[name]
+    except KeyError:
+        value = cache[name] = func(list(grouper(3, pts[1:])))
+        return value
+
 def area(ddtt):
     """area of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.area(coords)
+    return _cachedgeometry(ddtt, 'area', g_surface.area)
 
 def height(ddtt):
     """height of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.height(coords)
+    return _cachedgeometry(ddtt, 'height', g_surface.height)
 
 def width(ddtt):
     """width of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.width(coords)
+    return _cachedgeometry(ddtt, 'width', g_surface.width)
 
 def azimuth(ddtt):
     """azimuth of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.azimuth(coords)
+    return _cachedgeometry(ddtt, 'azimuth', g_surface.azimuth)
 
 def tilt(ddtt):
     """tilt of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.tilt(coords)
+    return _cachedgeometry(ddtt, 'tilt', g_surface.tilt)
 
 def buildingname(ddtt):
     """return building name"""
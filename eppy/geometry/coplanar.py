@@ -0,0 +1,176 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""merge coplanar polygons that share edges into single polygons"""
+
+# the polygons are merged by cancelling the edges they share.
+# - edges are split where a vertex of another polygon lies on them
+#   (T-junctions), so that shared edges match segment by segment
+# - a segment seen in both directions is inside the merged polygon
+# - the remaining segments are chained into the outline
+# polygons are expected to be wound the same way (same normal)
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import numpy as np
+
+
+def newell_normal(poly):
+    """unit normal of a polygon by Newell's method.
+    Works for any polygon, even if the first three points are in a line"""
+    pts = np.asarray(poly, dtype=float)
+    nxt = np.roll(pts, -1, axis=0)
+    total = np.cross(pts, nxt).sum(axis=0)
+    magnitude = np.sqrt((total ** 2).sum())
+    if magnitude < 0.00000001:
+        return (0.0, 0.0, 0.0)
+    return tuple(float(value) for value in total / magnitude)
+
+
+def plane(poly, places=4):
+    """(normal, offset) of the plane of poly, rounded to places.
+    Polygons on the same plane and facing the same way have the same plane"""
+    normal = newell_normal(poly)
+    offset = float(np.dot(normal, np.asarray(poly[0], dtype=float)))
+    normal = tuple(round(value, places) + 0.0 for value in normal)
+    return normal, round(offset, places) + 0.0
+
+
+def _vertexkey(pnt, places):
+    """hashable rounded vertex"""
+    return tuple(round(value, places) + 0.0 for value in pnt)
+
+
+def _splitedges(polykeys, points, places):
+    """split the edges of each polygon at the vertices of the others
+
+    returns a list of directed edges [(key1, key2), ...] for each polygon"""
+    allkeys = list(points.keys())
+    allpnts = np.array([points[key] for key in allkeys])
+    tolerance = 10 ** -places
+    polyedges = []
+    for keys in polykeys:
+        edges = []
+        for i, key1 in enumerate(keys):
+            key2 = keys[(i + 1) % len(keys)]
+            pnt1 = np.array(points[key1])
+            vec = np.array(points[key2]) - pnt1
+            length2 = np.dot(vec, vec)
+            if length2 == 0:
+                continue
+            rel = allpnts - pnt1
+            tvals = rel.dot(vec) / length2
+            dists = np.sqrt(((rel - np.outer(tvals, vec)) ** 2).sum(axis=1))
+            onedge = (dists < tolerance) & (tvals > 0) & (tvals < 1)
+            between = sorted((tvals[j], allkeys[j])
+                             for j in np.nonzero(onedge)[0])
+            chain = [key1] + [key for _t, key in between] + [key2]
+            for start, end in zip(chain[:-1], chain[1:]):
+                if start != end:
+                    edges.append((start, end))
+        polyedges.append(edges)
+    return polyedges
+
+
+def _components(polyedges):
+    """group the polygons that share an edge (in opposite directions)"""
+    parents = list(range(len(polyedges)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    owners = {}
+    for i, edges in enumerate(polyedges):
+        for edge in edges:
+            owners.setdefault(edge, []).append(i)
+    for (start, end), polys in owners.items():
+        for j in owners.get((end, start), []):
+            parents[find(polys[0])] = find(j)
+    groups = {}
+    for i in range(len(polyedges)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values())
+
+
+def _outline(edges, points, places):
+    """chain the edges into a single loop. None if it is not one loop"""
+    edgeset = set(edges)
+    boundary = [edge for edge in edges if (edge[1], edge[0]) not in edgeset]
+    nexts = {}
+    for start, end in boundary:
+        if start in nexts:
+            return None  # polygons touch at a vertex
+        nexts[start] = end
+    if not boundary:
+        return None
+    first = boundary[0][0]
+    loop = [first]
+    current = nexts[first]
+    while current != first:
+        if current not in nexts or len(loop) > len(boundary):
+            return None
+        loop.append(current)
+        current = nexts[current]
+    if len(loop) != len(boundary):
+        return None  # more than one loop (a hole or disjoint polygons)
+    return _dropcollinear([points[key] for key in loop], places)
+
+
+def _dropcollinear(poly, places):
+    """remove the vertices that are in a line with their neighbours"""
+    tolerance = 10 ** -places
+    pnts = np.asarray(poly, dtype=float)
+    prevs = np.roll(pnts, 1, axis=0)
+    nexts = np.roll(pnts, -1, axis=0)
+    crosses = np.cross(pnts - prevs, nexts - pnts)
+    keep = np.sqrt((crosses ** 2).sum(axis=1)) > tolerance
+    return [tuple(pnt) for pnt, kept in zip(poly, keep) if kept]
+
+
+def mergepolygons(polys, places=4):
+    """merge coplanar polygons that share edges
+
+    polys are on the same plane and wound the same way.
+    returns a list of (indexes, poly) where indexes are the positions in
+    polys of the polygons merged into poly. A polygon that could not be
+    merged (it shares no edge, or the merge would make a hole) is returned
+    alone with its original vertices."""
+    points = {}
+    polykeys = []
+    for poly in polys:
+        keys = []
+        for pnt in poly:
+            key = _vertexkey(pnt, places)
+            points.setdefault(key, tuple(float(value) for value in pnt))
+            if not keys or keys[-1] != key:
+                keys.append(key)
+        if len(keys) > 1 and keys[0] == keys[-1]:
+            keys.pop()
+        polykeys.append(keys)
+    polyedges = _splitedges(polykeys, points, places)
+    merged = []
+    for indexes in _components(polyedges):
+        outline = None
+        if len(indexes) > 1:
+            edges = [edge for i in indexes for edge in polyedges[i]]
+            outline = _outline(edges, points, places)
+        if outline is None:
+            merged.extend(([i], list(polys[i])) for i in indexes)
+            continue
+        # start where the first polygon started, if that vertex is still there
+        start = points[polykeys[indexes[0]][0]]
+        if start in outline:
+            i = outline.index(start)
+            outline = outline[i:] + outline[:i]
+        merged.append((indexes, outline))
+    return merged
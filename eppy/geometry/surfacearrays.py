@@ -0,0 +1,248 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""geometry of all the surfaces of an idf at once, with numpy arrays
+
+The vertices of the surfaces are packed into one array of shape
+(surfaces, vertices, 3). Polygons with fewer vertices are padded with their
+first vertex, which adds nothing to the sums over the edges. The area,
+normal, azimuth, tilt, width and height of every surface are then worked
+out together, instead of one surface at a time as in surface.py.
+
+The normal is found by Newell's method (the sum over the edges), so it is
+right even when the first three vertices are in a line. For the planar
+convex surfaces that E+ uses, the results are the same as in surface.py."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+
+import numpy as np
+
+
+SURFACEKEYS = [
+    "BuildingSurface:Detailed",
+    "Wall:Detailed",
+    "RoofCeiling:Detailed",
+    "Floor:Detailed",
+    "FenestrationSurface:Detailed",
+    "Shading:Site:Detailed",
+    "Shading:Building:Detailed",
+    "Shading:Zone:Detailed", ]
+
+SurfaceGeometry = collections.namedtuple(
+    'SurfaceGeometry',
+    'surfaces vertices nvertices area normal azimuth tilt width height')
+
+
+def _flatcoords(pts):
+    """the coordinates in pts, without trailing blank fields"""
+    end = len(pts)
+    while end and pts[end - 1] == '':
+        end -= 1
+    return pts[:end // 3 * 3]
+
+
+def _pack(flats):
+    """(vertices, nvertices) from a list of flat coordinate lists"""
+    nvertices = np.array([len(flat) // 3 for flat in flats], dtype=int)
+    maxn = max(3, nvertices.max()) if len(flats) else 3
+    rows = []
+    for flat, num in zip(flats, nvertices):
+        pad = list(flat[:3]) if num else [0.0, 0.0, 0.0]
+        rows.append(list(flat) + pad * (maxn - num))
+    vertices = np.array(rows, dtype=float).reshape((len(flats), maxn, 3))
+    return vertices, nvertices
+
+
+def packcoords(polys):
+    """pack the polygons [[(x, y, z), ...], ...] into arrays
+
+    returns (vertices, nvertices)
+    vertices has the shape (len(polys), most vertices, 3)
+    nvertices is the number of vertices of each polygon"""
+    return _pack([[value for pnt in poly for value in pnt] for poly in polys])
+
+
+def _vertexfields(surfaces):
+    """(fields, index of the first vertex field) of each surface"""
+    firsts = {}
+    for surface in surfaces:
+        fields = surface.obj  # epbunch attributes are slow. get it once
+        key = fields[0].upper()
+        if key not in firsts:
+            firsts[key] = surface.objls.index('Number_of_Vertices') + 1
+        yield fields, firsts[key]
+
+
+def packsurfaces(surfaces):
+    """pack the vertices of the surfaces (epbunches) into arrays
+
+    returns (vertices, nvertices). see packcoords"""
+    return _pack([_flatcoords(fields[first:])
+                  for fields, first in _vertexfields(surfaces)])
+
+
+def gathervertices(surfaces):
+    """all the vertices of the surfaces (epbunches) in one array
+
+    returns (points, nvertices)
+    points has a row (x, y, z) for each vertex, surface after surface
+    nvertices is the number of vertices of each surface"""
+    flat = []
+    nvertices = []
+    for fields, first in _vertexfields(surfaces):
+        coords = _flatcoords(fields[first:])
+        flat.extend(coords)
+        nvertices.append(len(coords) // 3)
+    points = np.array(flat, dtype=float).reshape((len(flat) // 3, 3))
+    return points, np.array(nvertices, dtype=int)
+
+
+def scattervertices(surfaces, points, nvertices):
+    """write the vertices in points back into the surfaces (epbunches).
+    The opposite of gathervertices"""
+    flat = points.ravel().tolist()
+    start = 0
+    for (fields, first), num in zip(_vertexfields(surfaces), nvertices):
+        end = start + num * 3
+        fields[first:first + num * 3] = flat[start:end]
+        start = end
+
+
+def getsurfaces(idf, keys=None):
+    """all the surfaces of the idf that have vertices
+
+    keys limits them to these kinds of surfaces. default: SURFACEKEYS"""
+    if keys is None:
+        keys = SURFACEKEYS
+    surfaces = []
+    for key in keys:
+        surfaces.extend(idf.idfobjects[key.upper()])
+    return surfaces
+
+
+def newellvectors(vertices):
+    """sum of the cross products over the edges of each polygon.
+    Its length is twice the area and it points along the normal"""
+    vertices = vertices - vertices[:, :1]  # better precision far from 0
+    nxt = np.roll(vertices, -1, axis=1)
+    return np.cross(vertices, nxt).sum(axis=1)
+
+
+def areas(vertices):
+    """area of each polygon"""
+    return np.sqrt((newellvectors(vertices) ** 2).sum(axis=1)) / 2
+
+
+def unitnormals(vertices):
+    """unit normal of each polygon. (0, 0, 0) if it has no area"""
+    total = newellvectors(vertices)
+    magnitude = np.sqrt((total ** 2).sum(axis=1))
+    flat = magnitude < 0.00000001
+    magnitude[flat] = 1
+    total[flat] = 0
+    return total / magnitude[:, None]
+
+
+def azimuths(normals):
+    """azimuth of each unit normal, clockwise from north in degrees.
+    0 for horizontal surfaces"""
+    return np.degrees(np.arctan2(normals[:, 0], normals[:, 1])) % 360
+
+
+def tilts(normals):
+    """tilt of each unit normal from the vertical in degrees.
+    0 if the normal is (0, 0, 0)"""
+    angles = np.degrees(np.arccos(np.clip(normals[:, 2], -1, 1)))
+    return np.where((normals == 0).all(axis=1), 0.0, angles)
+
+
+def _sides(vertices, nvertices):
+    """(rise, length) of the first and the last edges of each polygon"""
+    index = np.arange(len(vertices))
+    first = vertices[:, 0]
+    nxt = vertices[:, 1]
+    last = vertices[index, np.maximum(nvertices, 1) - 1]
+    rise1 = np.abs(nxt[:, 2] - first[:, 2])
+    riselast = np.abs(last[:, 2] - first[:, 2])
+    length1 = np.sqrt(((nxt - first) ** 2).sum(axis=1))
+    lengthlast = np.sqrt(((last - first) ** 2).sum(axis=1))
+    return rise1, riselast, length1, lengthlast
+
+
+def widths(vertices, nvertices):
+    """width of each rectangular polygon. (as surface.width)"""
+    rise1, riselast, length1, lengthlast = _sides(vertices, nvertices)
+    return np.where(riselast < rise1, lengthlast,
+                    np.where(riselast > rise1, length1,
+                             np.maximum(length1, lengthlast)))
+
+
+def heights(vertices, nvertices):
+    """height of each rectangular polygon. (as surface.height)"""
+    rise1, riselast, length1, lengthlast = _sides(vertices, nvertices)
+    return np.where(riselast > rise1, lengthlast,
+                    np.where(riselast < rise1, length1,
+                             np.minimum(length1, lengthlast)))
+
+
+def geometry(surfaces):
+    """the geometry of the surfaces (epbunches) as a SurfaceGeometry
+
+    Each field is an array with a row for each surface, in the order of
+    surfaces. normal has a row (x, y, z) for each surface."""
+    surfaces = list(surfaces)
+    vertices, nvertices = packsurfaces(surfaces)
+    normal = unitnormals(vertices)
+    return SurfaceGeometry(
+        surfaces=surfaces, vertices=vertices, nvertices=nvertices,
+        area=areas(vertices), normal=normal, azimuth=azimuths(normal),
+        tilt=tilts(normal), width=widths(vertices, nvertices),
+        height=heights(vertices, nvertices))
+
+
+def idfgeometry(idf, keys=None):
+    """the geometry of all the surfaces of the idf as a SurfaceGeometry
+
+    keys limits it to these kinds of surfaces. default: SURFACEKEYS"""
+    return geometry(getsurfaces(idf, keys))
+
+
+def enclosedvolumes(vertices, groups, ngroups=None, tolerance=0.01):
+    """volume enclosed by each group of polygons, by the divergence theorem
+
+    groups gives the group (0, 1, 2 ..) of each polygon. The polygons of a
+    group must make a closed polyhedron with the normals pointing out, as
+    the surfaces of a zone do. Then the volume is the sum over the polygons
+    of (a vertex . newell vector) / 6. Any shape of zone can be worked out.
+    A group that is not closed has the volume nan. It is not closed if the
+    area vectors of its polygons do not add up to zero, within tolerance
+    times their total area."""
+    groups = np.asarray(groups, dtype=int)
+    if ngroups is None:
+        ngroups = groups.max() + 1 if len(groups) else 0
+    counts = np.bincount(groups, minlength=ngroups)
+    # move each group near the origin for precision
+    firsts = vertices[:, 0]
+    centres = np.array([np.bincount(groups, firsts[:, i], minlength=ngroups)
+                        for i in range(3)], dtype=float).T
+    centres /= np.maximum(counts, 1)[:, None]
+    newells = newellvectors(vertices)
+    points = firsts - centres[groups]
+    volumes = np.bincount(groups, (points * newells).sum(axis=1),
+                          minlength=ngroups) / 6
+    sums = np.array([np.bincount(groups, newells[:, i], minlength=ngroups)
+                     for i in range(3)]).T
+    totals = np.bincount(groups, np.sqrt((newells ** 2).sum(axis=1)),
+                         minlength=ngroups)
+    opened = np.sqrt((sums ** 2).sum(axis=1)) > tolerance * totals
+    volumes[opened | (counts == 0)] = np.nan
+    return volumes
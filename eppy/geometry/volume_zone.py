@@ -45,8 +45,8 @@ def vol(poly1, poly2):
     c_point = (c_point[0], c_point[1], c_point[2])
     vol_therah = 0
     num = len(poly1)
-    poly1.append(poly1[0])
-    poly2.append(poly2[0])
+    poly1 = list(poly1) + [poly1[0]]  # do not change the arguments
+    poly2 = list(poly2) + [poly2[0]]
     for i in range(num - 2):
         # the upper part
         tehrahedron = [c_point, poly1[0], poly1[i+1], poly1[i+2]]
@@ -61,3 +61,11 @@ def vol(poly1, poly2):
         tehrahedron = [c_point, poly1[i], poly1[i+1], poly2[i]]
         vol_therah += vol_tehrahedron(tehrahedron)
     return vol_therah
+
+def vol_polyhedron(polys):
+    """volume of a zone of any shape, bounded by the polygons polys.
+    The polygons must close the zone and face out. nan if they do not"""
+    from eppy.geometry import surfacearrays
+    vertices, _nvertices = surfacearrays.packcoords(polys)
+    return float(surfacearrays.enclosedvolumes(vertices, [0] * len(polys),
+                                               1)[0])
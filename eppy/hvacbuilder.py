@@ -14,6 +14,7 @@ from __future__ import unicode_literals
 import copy
 
 import eppy.bunch_subclass as bunch_subclass
+import eppy.idf_helpers as idf_helpers
 from eppy.modeleditor import IDF
 import eppy.modeleditor as modeleditor
 from six.moves import xrange
@@ -22,6 +23,9 @@ from six.moves import xrange
 class WhichLoopError(Exception):
     pass
 
+class LoopSpecError(Exception):
+    pass
+
 class SomeFields(object):
     """Some fields"""
     c_fields = ['Condenser Side Inlet Node Name',
@@ -135,7 +139,37 @@ def getbranchcomponents(idf, branch, utest=False):
         return [idf.getobject(ot, on) for ot, on in complist]
 
 def renamenodes(idf, fieldtype):
-    """rename all the changed nodes"""
+    """rename all the changed nodes
+
+    a changed node is a field set to [oldname, newname]. It is set to
+    newname and the other fields of fieldtype with oldname are renamed.
+    For fieldtype 'node' the changed nodes and the fields to rename are
+    found in the node index of the idf (idf_helpers.nodeindex)"""
+    if fieldtype != 'node':
+        return _renamefields(idf, fieldtype)
+    index = idf_helpers.nodeindex(idf)
+    changed = []
+    renameds = {}
+    for idfobject, i in index.renames:
+        fieldvalue = idfobject.obj[i]
+        if type(fieldvalue) is list and idfobject.theidf is idf:
+            changed.append((idfobject, i, fieldvalue[-1]))
+            renameds[fieldvalue[0]] = fieldvalue[-1]
+    index.renames = []
+    for oldname, newname in renameds.items():
+        for idfobject, i in index.getentries(oldname):
+            if idfobject.obj[i] == oldname:
+                changed.append((idfobject, i, newname))
+    # do the renaming
+    for idfobject, i, fieldvalue in changed:
+        itsidd = idfobject['objidd'][i]
+        if itsidd.get('type', [None])[0] == fieldtype:
+            idfobject.obj[i] = fieldvalue
+        index.addfield(idfobject, i)
+
+def _renamefields(idf, fieldtype):
+    """renamenodes for fields that are not in the node index. The whole idf
+    is searched"""
     renameds = []
     for key in idf.model.dtls:
         for idfobject in idf.idfobjects[key]:
@@ -146,13 +180,13 @@ def renamenodes(idf, fieldtype):
                         renameds.append(cpvalue)
 
     # do the renaming
+    tempdct = dict(renameds)
     for key in idf.model.dtls:
         for idfobject in idf.idfobjects[key]:
             for i, fieldvalue in enumerate(idfobject.obj):
                 itsidd = idfobject.objidd[i]
                 if 'type' in itsidd:
                     if itsidd['type'][0] == fieldtype:
-                        tempdct = dict(renameds)
                         if type(fieldvalue) is list:
                             fieldvalue = fieldvalue[-1]
                             idfobject.obj[i] = fieldvalue
@@ -286,6 +320,7 @@ def componentsintobranch(idf, branch, listofcomponents, fluid=None):
                                           fluid=fluid, startswith=compnode)
         theobj.append(comp[outletnodename])
         theobj.append('')
+    idf_helpers.nodeindex(idf).add(thebranch)  # the node fields were set in obj
 
     return thebranch
 
@@ -302,6 +337,14 @@ def returnnone():
     """return None"""
     return None
 
+def zoneequipconnections(idf):
+    """return {ZONE NAME: the first ZoneHVAC:EquipmentConnections of the
+    zone}"""
+    equipconns = {}
+    for equipconn in idf.idfobjects["ZoneHVAC:EquipmentConnections".upper()]:
+        equipconns.setdefault(equipconn.Zone_Name.upper(), equipconn)
+    return equipconns
+
 def makeairloop(idf, loopname, sloop, dloop, testing=None):
     """make an airloop"""
     # -------- testing ---------
@@ -434,6 +477,7 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
         equipconn[fldname] = "%s Node" % (zone,)
         fldname = "Zone_Return_Air_Node_Name"
         equipconn[fldname] = "%s Outlet Node" % (zone,)
+    equipconns = zoneequipconnections(idf)
     # -------- testing ---------
     testn = doingtesting(testing, testn, newairloop)
     if testn == None:
@@ -442,11 +486,7 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
     # make ZoneHVAC:EquipmentList
     for zone in dloop:
         z_equiplst = idf.newidfobject("ZoneHVAC:EquipmentList".upper())
-        z_equipconn = modeleditor.getobjects(
-            idf.idfobjects,
-            idf.model, idf.idd_info,
-            "ZoneHVAC:EquipmentConnections".upper(),  # places=7,
-            **dict(Zone_Name=zone))[0]
+        z_equipconn = equipconns[zone.upper()]
         z_equiplst.Name = z_equipconn.Zone_Conditioning_Equipment_List_Name
         fld = "Zone_Equipment_1_Object_Type"
         z_equiplst[fld] = "AirTerminal:SingleDuct:Uncontrolled"
@@ -460,11 +500,7 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
     # -------- testing ---------
     # make AirTerminal:SingleDuct:Uncontrolled
     for zone in dloop:
-        z_equipconn = modeleditor.getobjects(
-            idf.idfobjects,
-            idf.model, idf.idd_info,
-            "ZoneHVAC:EquipmentConnections".upper(),  # places=7,
-            **dict(Zone_Name=zone))[0]
+        z_equipconn = equipconns[zone.upper()]
         key = "AirTerminal:SingleDuct:Uncontrolled".upper()
         z_airterm = idf.newidfobject(key)
         z_airterm.Name = "%sDirectAir" % (zone,)
@@ -489,11 +525,7 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
     z_splitter.Name = "%s Demand Side Splitter" % (loopname,)
     z_splitter.Inlet_Node_Name = newairloop.Demand_Side_Inlet_Node_Names
     for i, zone in enumerate(dloop):
-        z_equipconn = modeleditor.getobjects(
-            idf.idfobjects,
-            idf.model, idf.idd_info,
-            "ZoneHVAC:EquipmentConnections".upper(),  # places=7,
-            **dict(Zone_Name=zone))[0]
+        z_equipconn = equipconns[zone.upper()]
         fld = "Outlet_%s_Node_Name" % (i + 1,)
         z_splitter[fld] = z_equipconn.Zone_Air_Inlet_Node_or_NodeList_Name
     # -------- testing ---------
@@ -541,11 +573,7 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
         returnnone()
     # -------- testing ---------
     for i, zone in enumerate(dloop):
-        z_equipconn = modeleditor.getobjects(
-            idf.idfobjects,
-            idf.model, idf.idd_info,
-            "ZoneHVAC:EquipmentConnections".upper(),  # places=7,
-            **dict(Zone_Name=zone))[0]
+        z_equipconn = equipconns[zone.upper()]
         fld = "Inlet_%s_Node_Name" % (i + 1,)
         z_mixer[fld] = z_equipconn.Zone_Return_Air_Node_Name
     # -------- testing ---------
@@ -1177,6 +1205,96 @@ def replacebranch(idf, loop, branch,
         idf.savecopy("hhh9.idf")
     return thebranch
 
+LOOPMAKERS = {
+    'airloop': (makeairloop, 'Air'),
+    'plantloop': (makeplantloop, 'Water'),
+    'condenserloop': (makecondenserloop, 'Water'), }
+
+def _checkloopspecs(loopspecs):
+    """check the loop specs before anything is made. raise LoopSpecError"""
+    loopnames = set()
+    branchnames = set()
+    for spec in loopspecs:
+        looptype = spec.get('type', '').lower()
+        if looptype not in LOOPMAKERS:
+            raise LoopSpecError("unknown loop type %s for loop %s" % (
+                spec.get('type'), spec.get('name')))
+        name = spec['name']
+        if name.upper() in loopnames:
+            raise LoopSpecError("loop %s is there twice" % (name, ))
+        loopnames.add(name.upper())
+        supply = flattencopy(spec['supply'])
+        demand = flattencopy(spec['demand'])
+        if looptype == 'airloop':
+            demand = []  # the zones
+        loopbranches = set(bname.upper() for bname in supply + demand)
+        for bname in supply + demand:
+            if bname.upper() in branchnames:
+                raise LoopSpecError("branch %s is there twice" % (bname, ))
+            branchnames.add(bname.upper())
+        for bname in spec.get('branches', {}):
+            if bname.upper() not in loopbranches:
+                raise LoopSpecError("branch %s is not in loop %s" % (
+                    bname, name))
+
+def _objectsbyname(idf, key, objects):
+    """{NAME: idfobject} for the objects of key, the first of each name as
+    in idf.getobject. objects is {KEY: {NAME: idfobject}}, filled as
+    needed"""
+    key = key.upper()
+    if key not in objects:
+        names = objects[key] = {}
+        for idfobject in idf.idfobjects[key]:
+            names.setdefault(idfobject.obj[1].upper(), idfobject)
+    return objects[key]
+
+def makeloops(idf, loopspecs):
+    """make many loops and their branches from a list of loop specs
+
+    a loop spec is a dict like
+        dict(type='plantloop', name='p_loop',
+             supply=['sb0', ['sb1', 'sb2'], 'sb3'],
+             demand=['db0', ['db1', 'db2'], 'db3'],
+             branches={'sb1': [('Chiller:Electric', 'chiller',
+                                'Chilled_Water_'),
+                               ('Pump:VariableSpeed', 'pump')]},
+             fluid='Water')
+    type is 'airloop', 'plantloop' or 'condenserloop'. For an airloop
+    demand is the list of zones. The branches replace the pipes and ducts
+    of the branches of the loop, as replacebranch1 does. The components are
+    (object type, name) or (object type, name, thisnode) and are made if
+    they are not in the idf. fluid is 'Air' for airloops and 'Water' for
+    the others if it is not given.
+
+    All the specs are checked before anything is made and the branches and
+    components are found by name in one pass, instead of a search for each
+    one. The objects are the same as those from makeairloop, makeplantloop,
+    makecondenserloop and replacebranch1. All the loops are made before the
+    branches are replaced, so the order of the objects may not be the same.
+    returns the loops"""
+    _checkloopspecs(loopspecs)
+    loops = []
+    for spec in loopspecs:
+        maker, _fluid = LOOPMAKERS[spec['type'].lower()]
+        loops.append(maker(idf, spec['name'], spec['supply'], spec['demand']))
+    objects = {}
+    for loop, spec in zip(loops, loopspecs):
+        fluid = spec.get('fluid', LOOPMAKERS[spec['type'].lower()][1])
+        branches = _objectsbyname(idf, 'BRANCH', objects)
+        for bname, components in spec.get('branches', {}).items():
+            listofcomponents = []
+            for comp_type, comp_name, compnode in \
+                    _clean_listofcomponents_tuples(components):
+                names = _objectsbyname(idf, comp_type, objects)
+                comp = names.get(comp_name.upper())
+                if comp is None:
+                    comp = idf.newidfobject(comp_type.upper(), Name=comp_name)
+                    names[comp_name.upper()] = comp
+                listofcomponents.append((comp, compnode))
+            replacebranch(idf, loop, branches[bname.upper()],
+                          listofcomponents, fluid=fluid)
+    return loops
+
 def main():
     """the main routine"""
     from six import StringIO
@@ -20,6 +20,9 @@ from past.builtins import basestring    # pip install future
 
 from eppy.modeleditor import IDF
 from eppy.bunch_subclass import BadEPFieldError
+from eppy.bunchhelpers import makefieldname
+
+_IDDFIELDS = {}  # {(id(idd_info), kind): (idd_info, fields)}
 
 def idfobjectkeys(idf):
     """returns the object keys in the order they were in the IDD file
@@ -59,37 +62,201 @@ def getobject_use_prevfield(idf, idfobject, fieldname):
         return None
     return foundobj
     
-def getidfkeyswithnodes():
+def _iddfields(idf, kind, isfield):
+    """return {KEY: [indexes of the fields where isfield(name, fieldidd)]}
+    for the keys of the IDD that have such fields. It is worked out once
+    for each IDD and kind"""
+    iddinfo = idf.idd_info
+    found = _IDDFIELDS.get((id(iddinfo), kind))
+    if found is None or found[0] is not iddinfo:
+        fields = {}
+        for key, fieldidds in zip(idf.model.dtls, iddinfo):
+            indexes = [i for i, fieldidd in enumerate(fieldidds)
+                       if i > 0 and isfield(
+                           makefieldname(fieldidd.get('field', [''])[0]),
+                           fieldidd)]
+            if indexes:
+                fields[key.upper()] = indexes
+        found = (iddinfo, fields)
+        _IDDFIELDS[(id(iddinfo), kind)] = found
+    return found[1]
+
+def nodefields(idf):
+    """return {KEY: [indexes of the Node_Name fields], ...} for the keys of
+    the IDD that have node fields. It is worked out once for each IDD"""
+    return _iddfields(idf, 'nodename',
+                      lambda name, fieldidd: name.endswith('Node_Name'))
+
+def _isnodefield(name, fieldidd):
+    """True for Node_Name fields and fields of type node"""
+    return (name.endswith('Node_Name') or
+            fieldidd.get('type', [''])[0] == 'node')
+
+def allnodefields(idf):
+    """return {KEY: [indexes of the node fields], ...}. The node fields are
+    the Node_Name fields and the fields of type node"""
+    return _iddfields(idf, 'node', _isnodefield)
+
+def _isreferencefield(name, fieldidd):
+    """True for the fields that hold the name of another object"""
+    if _isnodefield(name, fieldidd):
+        return False
+    return 'object-list' in fieldidd or name.endswith('_Name')
+
+def referencefields(idf):
+    """return {KEY: [indexes of the fields that hold the name of another
+    object], ...}. These are the fields with an object-list and the other
+    fields ending in _Name, but not the node fields"""
+    return _iddfields(idf, 'reference', _isreferencefield)
+
+def getidfkeyswithnodes(idf=None):
     """return a list of keys of idfobjects that hve 'None Name' fields"""
-    idf = IDF(StringIO(""))
-    keys = idfobjectkeys(idf)
-    keysfieldnames = ((key, idf.newidfobject(key.upper()).fieldnames) 
-                for key in keys)
-    keysnodefdnames = ((key,  (name for name in fdnames 
-                                if (name.endswith('Node_Name')))) 
-                            for key, fdnames in keysfieldnames)
-    nodekeys = [key for key, fdnames in keysnodefdnames if list(fdnames)]
-    return nodekeys
-
-def getobjectswithnode(idf, nodekeys, nodename):
-    """return all objects that mention this node name"""
-    keys = nodekeys
-    # TODO getidfkeyswithnodes needs to be done only once. take out of here
-    listofidfobjects = (idf.idfobjects[key.upper()] 
-                for key in keys if idf.idfobjects[key.upper()])
-    idfobjects = [idfobj 
-                    for idfobjs in listofidfobjects 
-                        for idfobj in idfobjs]
+    if idf is None:
+        idf = IDF(StringIO(""))
+    fields = nodefields(idf)
+    return [key for key in idfobjectkeys(idf) if key.upper() in fields]
+
+def getobjectswithnode(idf, nodekeys, nodename, useindex=False):
+    """return all objects that mention this node name, in the order of
+    nodekeys
+
+    useindex: look the node up in nodeindex(idf) instead of reading the
+    node fields of all the objects of nodekeys. The index is faster on
+    large idfs, but it does not see changes made to idfobject.obj directly.
+    see NodeIndex"""
+    keys = []
+    seen = set()
+    for key in nodekeys:
+        if key.upper() not in seen:
+            seen.add(key.upper())
+            keys.append(key.upper())
+    if useindex:
+        order = dict((key, i) for i, key in enumerate(keys))
+        fields = sorted(
+            (entry for entry in nodeindex(idf).getentries(nodename)
+             if entry[0]['obj'][0].upper() in order),
+            key=lambda entry: order[entry[0]['obj'][0].upper()])
+    else:
+        namefields = nodefields(idf)
+        fields = [(idfobject, i)
+                  for key in keys if key in namefields
+                  for idfobject in idf.idfobjects[key]
+                  for i in namefields[key]]
     objwithnodes = []
-    for obj in idfobjects:
-        values = obj.fieldvalues
-        fdnames = obj.fieldnames
-        for value, fdname in zip(values, fdnames):
-            if fdname.endswith('Node_Name'):
-                if value == nodename:
-                    objwithnodes.append(obj)
-                    break
+    found = set()
+    for idfobject, i in fields:
+        obj = idfobject['obj']  # faster than idfobject.obj
+        if i >= len(obj) or obj[i] != nodename: # the index ignores case
+            continue
+        if not idfobject.objls[i].endswith('Node_Name'):
+            continue
+        if id(idfobject) not in found:
+            found.add(id(idfobject))
+            objwithnodes.append(idfobject)
     return objwithnodes
+
+class NodeIndex(object):
+    """the node fields of the idf by node name
+
+    The node fields are the Node_Name fields and the fields of type node.
+    Make it with nodeindex(idf). It is kept current when node fields are
+    set through the idfobjects (idfobject.Inlet_Node_Name = 'a node' or
+    idfobject['Inlet_Node_Name'] = 'a node') and when objects are added
+    to the idf or set in idf.idfobjects[key]. Fields that no longer have
+    the node, and objects that were removed from the idf, are dropped when
+    the node is looked up. Use refresh after changing idfobject.obj
+    directly.
+
+    Node fields set to [oldname, newname] (see hvacbuilder.renamenodes)
+    are kept in renames until they are renamed."""
+
+    def __init__(self, idf):
+        self.idf = idf
+        self.fields = allnodefields(idf)
+        self.nodes = {}
+        self.renames = []
+        self.refresh()
+
+    def refresh(self):
+        """index all the node fields of the idf again"""
+        self.nodes = {}
+        self.renames = []
+        for key in idfobjectkeys(self.idf):
+            if key.upper() in self.fields:
+                for idfobject in self.idf.idfobjects[key.upper()]:
+                    self.add(idfobject)
+
+    def add(self, idfobject):
+        """index the node fields of the idfobject"""
+        for i in self.fields.get(idfobject['obj'][0].upper(), []):
+            self.addfield(idfobject, i)
+
+    def addfield(self, idfobject, i):
+        """index the field i of the idfobject, if it is a node field"""
+        obj = idfobject['obj']  # faster than idfobject.obj
+        if i not in self.fields.get(obj[0].upper(), ()):
+            return
+        try:
+            value = obj[i]
+        except IndexError:
+            return
+        if isinstance(value, basestring) and value.strip():
+            self.nodes.setdefault(value.upper(), []).append((idfobject, i))
+        elif isinstance(value, list):
+            self.renames.append((idfobject, i))
+
+    def _current(self, idfobject, i, name):
+        """True if the field i of the idfobject still has the node name"""
+        if idfobject.theidf is not self.idf:
+            return False
+        try:
+            value = idfobject.obj[i]
+        except IndexError:
+            return False
+        return isinstance(value, basestring) and value.upper() == name
+
+    def getfields(self, nodename):
+        """return [(idfobject, fieldname), ...] of the node. Case is
+        ignored"""
+        return [(idfobject, idfobject.objls[i])
+                for idfobject, i in self.getentries(nodename)]
+
+    def getentries(self, nodename):
+        """return [(idfobject, field index), ...] of the node. Case is
+        ignored"""
+        name = nodename.upper()
+        entries = self.nodes.get(name, [])
+        current = []
+        seen = set()
+        for idfobject, i in entries:
+            if (id(idfobject), i) in seen:
+                continue
+            if self._current(idfobject, i, name):
+                seen.add((id(idfobject), i))
+                current.append((idfobject, i))
+        if current:
+            self.nodes[name] = current
+        else:
+            self.nodes.pop(name, None)
+        return current
+
+    def getobjects(self, nodename):
+        """return the idfobjects that have the node"""
+        objects = []
+        found = set()
+        for idfobject, _fieldname in self.getfields(nodename):
+            if id(idfobject) not in found:
+                found.add(id(idfobject))
+                objects.append(idfobject)
+        return objects
+
+def nodeindex(idf):
+    """return the NodeIndex of the idf. It is made the first time"""
+    index = getattr(idf, '_nodeindex', None)
+    if index is None:
+        index = NodeIndex(idf)
+        idf._nodeindex = index
+    return index
     
 def name2idfobject(idf, groupnamess=None, objkeys=None, **kwargs):
     """return the object, if the Name or some other field is known.
@@ -126,3 +293,45 @@ def copyidfintoidf(toidf, fromidf):
     idfobjlst = getidfobjectlist(fromidf)
     for idfobj in idfobjlst:
         toidf.copyidfobject(idfobj)
+
+def referringfields(idf, refnames):
+    """return a dict of all the fields that refer to names in refnames
+
+    refnames is a list of IDD reference names, like ['ZoneNames', ]
+    returns {NAME: [(idfobject, fieldname), ...], ...}
+    NAME is upper case. The idf is scanned only once."""
+    refnames = set(refnames)
+    namefields = {}
+    for key, fieldidds in zip(idf.model.dtls, idf.idd_info):
+        idfobjects = idf.idfobjects[key]
+        if not idfobjects:
+            continue
+        findexes = [i for i, fieldidd in enumerate(fieldidds)
+                    if refnames.intersection(fieldidd.get('object-list', []))]
+        for idfobject in idfobjects:
+            values = idfobject.obj
+            for i in findexes:
+                try:
+                    value = values[i]
+                except IndexError:
+                    break
+                if isinstance(value, basestring) and value.strip():
+                    item = (idfobject, idfobject.objls[i])
+                    namefields.setdefault(value.upper(), []).append(item)
+    return namefields
+
+def removeidfobjects(idf, idfobjects):
+    """remove all the idfobjects from the idf in a single pass.
+    Objects are matched by identity, not by equality"""
+    ids = set(id(idfobject) for idfobject in idfobjects)
+    keys = set(idfobject.key.upper() for idfobject in idfobjects)
+    for key in keys:
+        thebunches = idf.idfobjects[key]
+        keep = []
+        for idfobject in thebunches:
+            if id(idfobject) in ids:
+                idfobject.theidf = None
+            else:
+                keep.append(idfobject)
+        thebunches.list1[:] = keep
+        thebunches.list2[:] = [idfobject.obj for idfobject in keep]
@@ -53,8 +53,14 @@ class Idf_MSequence(collections.MutableSequence):
 
     def __setitem__(self, i, v):
         """Sets an idfobject (bunch) to list1 and its object to list2."""
+        old = self.list1[i]
+        if isinstance(old, EpBunch):
+            old.theidf = None
         self.list1[i] = v
         self.list2[i] = v.obj
+        if isinstance(v, EpBunch):
+            v.theidf = self.theidf
+            self._addnodes(v)
 
     def __delitem__(self, i):
         """Deletes an idfobject (bunch) from list1 and its object from list2."""
@@ -74,6 +80,13 @@ class Idf_MSequence(collections.MutableSequence):
         self.list2.insert(i, v.obj)
         if isinstance(v, EpBunch):
             v.theidf = self.theidf
+            self._addnodes(v)
+
+    def _addnodes(self, v):
+        """add the node fields of v to the node index of the idf"""
+        index = getattr(self.theidf, '_nodeindex', None)
+        if index is not None:  # see idf_helpers.nodeindex
+            index.add(v)
 
     def __str__(self):
         """String representation of the list of idfobjects (bunches)."""
@@ -0,0 +1,87 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""find the surfaces of adjacent zones that face each other
+
+Two surfaces are adjacent if they have the same vertices (in any order and
+starting anywhere) and face opposite ways. The surfaces are indexed by their
+set of rounded vertices, so all the pairs are found in one pass over the
+surfaces instead of comparing every surface with every other one.
+
+matchsurfaces sets the boundary conditions of the pairs it finds, so that
+each surface has the other as its Outside_Boundary_Condition_Object.
+Surfaces that overlap only in part are not matched. They have to be split
+first.
+
+When the Coordinate_System in GlobalGeometryRules is Relative, the zone
+origins are added to the vertices before they are compared.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import numpy as np
+
+from eppy.geometry import surfacearrays
+from eppy.transforms import ORIGINFIELDS
+from eppy.transforms import isrelative
+
+
+SURFACEKEYS = [
+    'BUILDINGSURFACE:DETAILED',
+    'WALL:DETAILED',
+    'ROOFCEILING:DETAILED',
+    'FLOOR:DETAILED', ]
+
+
+def adjacentpairs(idf, places=4):
+    """return the pairs of surfaces that have the same vertices and face
+    opposite ways [(surface1, surface2), ...]
+
+    The vertices are compared rounded to places. A surface is in one pair
+    at most."""
+    surfaces = surfacearrays.getsurfaces(idf, SURFACEKEYS)
+    vertices, nvertices = surfacearrays.packsurfaces(surfaces)
+    if isrelative(idf):
+        origins = dict((zone.Name.upper(),
+                        [float(zone[field] or 0) for field in ORIGINFIELDS])
+                       for zone in idf.idfobjects['ZONE'])
+        offsets = np.array([origins.get(surface.Zone_Name.upper(), [0, 0, 0])
+                            for surface in surfaces]).reshape((-1, 3))
+        vertices = vertices + offsets[:, None, :]
+    normals = surfacearrays.unitnormals(vertices)
+    rounded = (np.round(vertices, places) + 0.0).tolist()  # no -0.0
+    unmatched = {}
+    pairs = []
+    for i, num in enumerate(nvertices):
+        if not normals[i].any():  # no area
+            continue
+        key = tuple(sorted(set(tuple(pnt) for pnt in rounded[i][:num])))
+        candidates = unmatched.setdefault(key, [])
+        for j in candidates:
+            if np.dot(normals[i], normals[j]) < 0:
+                candidates.remove(j)
+                pairs.append((surfaces[j], surfaces[i]))
+                break
+        else:
+            candidates.append(i)
+    return pairs
+
+
+def matchsurfaces(idf, places=4):
+    """set the boundary conditions of the adjacent surfaces in the idf
+
+    Each surface of a pair gets Outside_Boundary_Condition = Surface, the
+    other surface as the Outside_Boundary_Condition_Object, NoSun and
+    NoWind. returns the names of the pairs [(name1, name2), ...]"""
+    pairs = adjacentpairs(idf, places)
+    for surface, other in pairs + [(s2, s1) for s1, s2 in pairs]:
+        surface.Outside_Boundary_Condition = 'Surface'
+        surface.Outside_Boundary_Condition_Object = other.Name
+        surface.Sun_Exposure = 'NoSun'
+        surface.Wind_Exposure = 'NoWind'
+    return [(surface.Name, other.Name) for surface, other in pairs]
@@ -0,0 +1,99 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""merge coplanar surface fragments into single surfaces
+
+Models exported from CAD tools often split a wall or a floor into many
+fragments. Fragments that are on the same plane, face the same way and have
+the same zone, construction and boundary condition are merged, if together
+they make a single polygon without holes. The first fragment becomes the
+merged surface. The other fragments are removed and all references to them
+(like the Building_Surface_Name of windows) now point to the merged surface.
+
+Interzone surfaces (Outside_Boundary_Condition = Surface) are not merged,
+since the surfaces on the other side would have to be merged the same way.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from eppy.function_helpers import getcoords
+from eppy.function_helpers import setcoords
+from eppy.geometry import coplanar
+import eppy.idf_helpers as idf_helpers
+
+
+SURFACEKEYS = [
+    'BUILDINGSURFACE:DETAILED',
+    'WALL:DETAILED',
+    'ROOFCEILING:DETAILED',
+    'FLOOR:DETAILED', ]
+# 'OutFaceEnvNames' also holds zone names, and surfaces that are the outside
+# face of another surface are never merged
+SKIPREFNAMES = ['OutFaceEnvNames', ]
+
+
+def _groupkey(surface, places):
+    """surfaces with the same groupkey can be merged"""
+    fields = []
+    for fieldname, value in zip(surface.objls, surface.obj):
+        if fieldname == 'Number_of_Vertices':
+            break
+        if fieldname != 'Name':
+            fields.append(('%s' % (value, )).upper())
+    return tuple(fields), coplanar.plane(getcoords(surface), places)
+
+
+def coplanargroups(idf, places=4):
+    """return groups of surfaces that are candidates for merging
+
+    The surfaces in a group have the same fields (other than the Name and
+    the vertices) and are on the same plane. Returns a list of lists of
+    surfaces. Only groups with more than one surface are returned"""
+    groups = {}
+    for key in SURFACEKEYS:
+        for surface in idf.idfobjects[key]:
+            condition = surface.Outside_Boundary_Condition.upper()
+            if condition == 'SURFACE':
+                continue
+            groupkey = _groupkey(surface, places)
+            groups.setdefault(groupkey, []).append(surface)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def mergecoplanar(idf, places=4):
+    """merge the coplanar surface fragments in the idf
+
+    returns {mergedname: [removedname, ...], ...}"""
+    merged = {}
+    renames = {}
+    toremove = []
+    for group in coplanargroups(idf, places):
+        polys = [getcoords(surface) for surface in group]
+        for indexes, poly in coplanar.mergepolygons(polys, places):
+            if len(indexes) < 2:
+                continue
+            host = group[indexes[0]]
+            setcoords(host, poly)
+            removed = [group[i] for i in indexes[1:]]
+            merged[host.Name] = [surface.Name for surface in removed]
+            for surface in removed:
+                renames[surface.Name.upper()] = host.Name
+            toremove.extend(removed)
+    if not renames:
+        return merged
+    namefield = toremove[0].getfieldidd('Name')
+    refnames = [refname for refname in namefield['reference']
+                if refname not in SKIPREFNAMES]
+    removedids = set(id(surface) for surface in toremove)
+    referring = idf_helpers.referringfields(idf, refnames)
+    for name, newname in renames.items():
+        for idfobject, fieldname in referring.get(name, []):
+            if id(idfobject) not in removedids:
+                idfobject[fieldname] = newname
+    idf_helpers.removeidfobjects(idf, toremove)
+    return merged
@@ -205,15 +205,17 @@ def getobject(bunchdt, key, name):
     You should not have more than one"""
     # TODO : throw exception if more than one object, or return more objects
     idfobjects = bunchdt[key]
-    if idfobjects:
-        # second item in list is a unique ID
-        unique_id = idfobjects[0].objls[1]
-    theobjs = [idfobj for idfobj in idfobjects if
-               idfobj[unique_id].upper() == name.upper()]
     try:
-        return theobjs[0]
-    except IndexError:
-        return None
+        objs = idfobjects.list2  # the lists in data.dt. faster than bunches
+    except AttributeError:
+        objs = [idfobj.obj for idfobj in idfobjects]
+    name = name.upper()
+    # second item in list is a unique ID
+    for idfobj, obj in zip(idfobjects, objs):
+        unique_id = obj[1] if len(obj) > 1 else ''
+        if unique_id.upper() == name:
+            return idfobj
+    return None
 
 
 def __objecthasfields(bunchdt, data, commdct, idfobject, places=7, **kwargs):
@@ -495,6 +497,79 @@ def zonevolume(idf, zonename):
 
     return volume
 
+
+def zonesummary(idf):
+    """area, height and volume of all the zones
+    {zonename: dict(area=area, height=height, volume=volume), ...}
+
+    They are worked out as in zonearea, zoneheight and zonevolume, but the
+    surfaces are grouped by zone once and the geometry of all of them is
+    worked out together. A zone without surfaces has a height of nan"""
+    import numpy as np
+    from eppy.geometry import surfacearrays
+    zonenames = [zone.Name for zone in idf.idfobjects['ZONE']]
+    zoneindex = dict((name, i) for i, name in enumerate(zonenames))
+    surfs = [s for s in idf.idfobjects['BuildingSurface:Detailed'.upper()]
+             if s.Zone_Name in zoneindex]
+    nzones = len(zonenames)
+    izone = np.array([zoneindex[s.Zone_Name] for s in surfs], dtype=int)
+    stypes = np.array([s.Surface_Type.upper() for s in surfs], dtype=object)
+    vertices, _nvertices = surfacearrays.packsurfaces(surfs)
+    areas = surfacearrays.areas(vertices)
+    topz = vertices[:, :, 2].max(axis=1)  # padding repeats a vertex
+    botz = vertices[:, :, 2].min(axis=1)
+    floors = stypes == 'FLOOR'
+    roofs = stypes == 'ROOF'
+    tops = roofs | (stypes == 'CEILING')
+
+    def zonesum(where, values):
+        return np.bincount(izone[where], values[where], minlength=nzones)
+
+    def zoneextreme(where, values, extreme, start):
+        result = np.full(nzones, start)
+        extreme.at(result, izone[where], values[where])
+        return result
+
+    everywhere = np.ones(len(surfs), dtype=bool)
+    nfloors = zonesum(floors, np.ones(len(surfs)))
+    nroofs = zonesum(roofs, np.ones(len(surfs)))
+    area = np.where(nfloors > 0, zonesum(floors, areas), zonesum(tops, areas))
+    floor2roof = (zoneextreme(tops, topz, np.maximum, -np.inf) -
+                  zoneextreme(floors, botz, np.minimum, np.inf))
+    min2max = (zoneextreme(everywhere, topz, np.maximum, -np.inf) -
+               zoneextreme(everywhere, botz, np.minimum, np.inf))
+    height = np.where((nfloors > 0) & (nroofs > 0), floor2roof, min2max)
+    height[~np.isfinite(height)] = np.nan
+    volume = area * height
+    return dict((name, dict(area=float(area[i]), height=float(height[i]),
+                            volume=float(volume[i])))
+                for i, name in enumerate(zonenames))
+
+
+ZONESURFACEKEYS = [
+    "BuildingSurface:Detailed",
+    "Wall:Detailed",
+    "RoofCeiling:Detailed",
+    "Floor:Detailed", ]
+
+
+def zonevolumes(idf, tolerance=0.01):
+    """volume enclosed by the surfaces of each zone {zonename: volume, ...}
+
+    Unlike zonevolume, this is the exact volume of a zone of any shape. The
+    surfaces of a zone must close it, else its volume is nan.
+    see geometry.surfacearrays.enclosedvolumes"""
+    from eppy.geometry import surfacearrays
+    zonenames = [zone.Name for zone in idf.idfobjects['ZONE']]
+    zoneindex = dict((name, i) for i, name in enumerate(zonenames))
+    surfs = [s for s in surfacearrays.getsurfaces(idf, ZONESURFACEKEYS)
+             if s.Zone_Name in zoneindex]
+    vertices, _nvertices = surfacearrays.packsurfaces(surfs)
+    izone = [zoneindex[s.Zone_Name] for s in surfs]
+    volumes = surfacearrays.enclosedvolumes(vertices, izone, len(zonenames),
+                                            tolerance)
+    return dict((name, float(volumes[i])) for i, name in enumerate(zonenames))
+
 def refname2key(idf, refname):
     """return all keys that have the reference name"""
     return [item[0] for item in getallobjlists(idf, refname)]
@@ -0,0 +1,226 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""a cache of the results of reading the output files
+
+Reading a large html report takes time. ReportCache keeps what a reader
+returned for a file, so reading the same file again only loads the cached
+result::
+
+    cache = ReportCache('/path/to/cachedir')
+    tables = cache.read('eplustbl.htm', readhtml.titletable)
+
+A result is found again by the path, size and modification time of the
+file. If those have changed, the contents of the file are hashed, so a copy
+of a file that was read before is still found in the cache. The results are
+pickled and compressed. The least recently used results are removed when
+there are more than maxentries of them.
+
+The subclasses of str in a result are made into plain strings before it
+is pickled. The result of the first read is the same, so a read from the
+cache gives the same types as the first read."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+import hashlib
+import io
+import json
+import os
+import time
+import zlib
+
+from bs4 import UnicodeDammit
+import six
+from six.moves import cPickle as pickle
+
+
+CACHEDIRNAME = '.eppy_cache'
+INDEXNAME = 'index.json'
+BLOCKSIZE = 1 << 20  # bytes hashed at a time
+
+
+def _readerkey(reader, args, kwargs):
+    """a string that identifies the reader and its arguments"""
+    return '%s.%s%r%r' % (reader.__module__, reader.__name__, tuple(args),
+                          sorted(kwargs.items()))
+
+
+def _plain(obj):
+    """obj with the subclasses of str (like the NavigableString of
+    BeautifulSoup) made into plain strings, so they pickle small.
+    namedtuples and OrderedDicts keep their types"""
+    if isinstance(obj, six.text_type):
+        return six.text_type(obj)
+    if type(obj) is list:
+        return [_plain(item) for item in obj]
+    if type(obj) is tuple:
+        return tuple(_plain(item) for item in obj)
+    if isinstance(obj, tuple) and hasattr(obj, '_fields'):  # namedtuple
+        return type(obj)(*[_plain(item) for item in obj])
+    if type(obj) in (dict, collections.OrderedDict):
+        return type(obj)((_plain(key), _plain(value))
+                         for key, value in obj.items())
+    return obj
+
+
+def _decode(contents, encoding=None):
+    """the text of contents. The encoding is worked out if it is None"""
+    if encoding is not None:
+        return contents.decode(encoding)
+    try:
+        return contents.decode('utf-8')
+    except UnicodeDecodeError:
+        return UnicodeDammit(contents).unicode_markup
+
+
+class ReportCache(object):
+    """cache of the results of reading output files
+
+    cachedir is where the results are kept. If it is None, they are kept in
+    the directory .eppy_cache next to each file that is read.
+    maxentries is the number of results kept in a cachedir"""
+
+    def __init__(self, cachedir=None, maxentries=256):
+        self.cachedir = cachedir
+        self.maxentries = maxentries
+
+    def _dir(self, path):
+        """the cache directory for the file path"""
+        if self.cachedir is not None:
+            return self.cachedir
+        return os.path.join(os.path.dirname(path), CACHEDIRNAME)
+
+    @staticmethod
+    def _loadindex(cachedir):
+        """the index of the cache"""
+        try:
+            with io.open(os.path.join(cachedir, INDEXNAME), 'r') as fhandle:
+                return json.load(fhandle)
+        except (IOError, OSError, ValueError):
+            return dict(sources={}, entries={})
+
+    @staticmethod
+    def _saveindex(cachedir, index):
+        """write the index. A new file is renamed over the old one"""
+        fname = os.path.join(cachedir, INDEXNAME)
+        tmpname = '%s.%s.tmp' % (fname, os.getpid())
+        with io.open(tmpname, 'w') as fhandle:
+            fhandle.write(six.text_type(json.dumps(index)))
+        try:
+            os.replace(tmpname, fname)
+        except AttributeError:  # python 2
+            if os.path.exists(fname):
+                os.remove(fname)
+            os.rename(tmpname, fname)
+
+    @staticmethod
+    def _load(cachedir, entry):
+        """the cached result. None if it is not there"""
+        try:
+            with open(os.path.join(cachedir, entry), 'rb') as fhandle:
+                return pickle.loads(zlib.decompress(fhandle.read()))
+        except (IOError, OSError, ValueError, zlib.error,
+                pickle.UnpicklingError, EOFError):
+            return None
+
+    @staticmethod
+    def _dump(cachedir, entry, result):
+        """cache the result"""
+        data = zlib.compress(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        with open(os.path.join(cachedir, entry), 'wb') as fhandle:
+            fhandle.write(data)
+
+    def _evict(self, cachedir, index):
+        """remove the least recently used results"""
+        entries = index['entries']
+        if len(entries) <= self.maxentries:
+            return
+        byage = sorted(entries, key=lambda entry: entries[entry])
+        removed = set(byage[:len(entries) - self.maxentries])
+        for entry in removed:
+            del entries[entry]
+            try:
+                os.remove(os.path.join(cachedir, entry))
+            except OSError:
+                pass
+        index['sources'] = dict(
+            (key, source) for key, source in index['sources'].items()
+            if source['entry'] not in removed)
+
+    def read(self, fname, reader, args=(), kwargs=None, astext=True,
+             encoding=None):
+        """return reader(contents of fname, *args, **kwargs), from the cache
+        if it has been read before
+
+        astext: give the reader the text of the file (for readhtml and
+            readcsv). Otherwise give it the path (for readeso and readsql)
+        encoding: of the text. It is worked out if it is None"""
+        if kwargs is None:
+            kwargs = {}
+        path = os.path.abspath(fname)
+        stat = os.stat(path)
+        readerkey = _readerkey(reader, args, kwargs)
+        if astext and encoding is not None:
+            readerkey = '%s|%s' % (readerkey, encoding)
+        cachedir = self._dir(path)
+        index = self._loadindex(cachedir)
+        sourcekey = '%s|%s' % (path, readerkey)
+        source = index['sources'].get(sourcekey)
+        result = None
+        if (source is not None and source['size'] == stat.st_size and
+                source['mtime'] == stat.st_mtime):
+            entry = source['entry']
+            result = self._load(cachedir, entry)
+        if result is None:
+            contents = []  # kept only if the reader gets the text
+            sha1 = hashlib.sha1()
+            with open(path, 'rb') as fhandle:
+                for block in iter(lambda: fhandle.read(BLOCKSIZE), b''):
+                    sha1.update(block)
+                    if astext:
+                        contents.append(block)
+            digest = sha1.hexdigest()
+            entry = '%s.pickle' % (hashlib.sha1(
+                ('%s|%s' % (readerkey, digest)).encode('utf-8')).hexdigest(), )
+            result = self._load(cachedir, entry)
+            if result is None:
+                if astext:
+                    result = reader(_decode(b''.join(contents), encoding),
+                                    *args, **kwargs)
+                else:
+                    result = reader(path, *args, **kwargs)
+                result = _plain(result)
+                if not os.path.isdir(cachedir):
+                    os.makedirs(cachedir)
+                self._dump(cachedir, entry, result)
+            index['sources'][sourcekey] = dict(
+                size=stat.st_size, mtime=stat.st_mtime, hash=digest,
+                entry=entry)
+        index['entries'][entry] = time.time()
+        self._evict(cachedir, index)
+        self._saveindex(cachedir, index)
+        return result
+
+    def clear(self, fname=None):
+        """remove the cached results in cachedir, or in the cache next to
+        fname if cachedir is None"""
+        if fname is None:
+            cachedir = self.cachedir
+        else:
+            cachedir = self._dir(os.path.abspath(fname))
+        if cachedir is None or not os.path.isdir(cachedir):
+            return
+        index = self._loadindex(cachedir)
+        for entry in index['entries']:
+            try:
+                os.remove(os.path.join(cachedir, entry))
+            except OSError:
+                pass
+        self._saveindex(cachedir, dict(sources={}, entries={}))
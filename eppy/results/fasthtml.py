@@ -0,0 +1,439 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""extract the tables from the html output in one pass over the parser
+events, without building a BeautifulSoup tree
+
+titletable and lines_table give the same output as the functions of the
+same name in readhtml, which use this module and fall back on
+BeautifulSoup when NotStreamable is raised.
+
+The events come from the html.parser of the standard library, or from
+lxml (backend='lxml'), which is faster. lxml repairs broken html the way
+a browser does, so on badly broken html its output may differ."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+
+import six
+from six.moves.html_entities import name2codepoint
+from six.moves.html_parser import HTMLParser
+
+
+class NotStreamable(Exception):
+    """the html cannot be read in one pass with the same output as
+    BeautifulSoup. (nested tables, tags in a cell etc.)"""
+    pass
+
+
+# tags that BeautifulSoup treats as having no contents
+VOIDTAGS = set(['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                'keygen', 'link', 'menuitem', 'meta', 'param', 'source',
+                'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+                'image', 'isindex', 'nextid', 'spacer'])
+PRETAGS = ('pre', 'textarea')  # whitespace is kept in these
+# lines_table looks back from a table upto one of these
+LINEBREAKTAGS = ('table', 'hr', 'tr', 'td')
+ASCIISPACES = '\x20\x0a\x09\x0c\x0d'
+# the reports in the html output are separated by <hr>
+SECTIONBREAK = re.compile(r'<hr\b', re.IGNORECASE)
+REPORTNAME = re.compile(r'Report:\s*<b>(.*?)</b>', re.IGNORECASE | re.DOTALL)
+
+
+def _collapse(text):
+    """a string of only spaces becomes a newline or a space,
+    like BeautifulSoup does"""
+    if text.strip(ASCIISPACES):
+        return text
+    if '\n' in text:
+        return '\n'
+    return ' '
+
+
+def _cellvalue(text, tofloat):
+    """the value of the cell as read by readhtml.table2matrix"""
+    if not text:
+        return ''
+    text = _collapse(text)
+    for char in text:
+        if char < ' ' and char not in '\n\t':
+            raise NotStreamable("control character in a cell")
+    if tofloat:
+        try:
+            return float(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _titlekey(title):
+    """titles are matched without case and surrounding spaces"""
+    return title.strip().upper()
+
+
+def _reportkey(reportname):
+    """report names are matched without case and spaces. Some versions of
+    EnergyPlus write 'AnnualBuildingUtilityPerformanceSummary' and others
+    'Annual Building Utility Performance Summary'"""
+    return ''.join(reportname.split()).upper()
+
+
+class _Done(Exception):
+    """all the tables that were asked for are found"""
+    pass
+
+
+class _Element(object):
+    """an open element. text gathers its strings if it may be a line"""
+    __slots__ = ('name', 'parent', 'text', 'isopen')
+
+    def __init__(self, name, parent, text=None):
+        self.name = name
+        self.parent = parent
+        self.text = text
+        self.isopen = True
+
+
+class _Extractor(object):
+    """receives the parser events and collects the tables
+
+    titles: collect (title, rows) for titletable
+    else: collect [lines, rows] for lines_table
+    wanted: collect only the tables with these titles (titlekeys)
+    firstmatch: collect each wanted title once and stop when all are found
+
+    The methods start, end, data, comment and close make it a target for
+    the lxml parser."""
+
+    def __init__(self, titles=True, tofloat=True, wanted=None,
+                 firstmatch=False):
+        self.titles = titles
+        self.tofloat = tofloat
+        self.wanted = wanted
+        self.firstmatch = firstmatch
+        self.found = set()
+        self.keep = True  # collect the open table
+        self.stack = []
+        self.strings = []  # data of the string being read
+        self.pretags = 0
+        self.tables = []
+        self.rows = None  # rows of the open table
+        self.row = None
+        self.cell = None
+        self.heading = None  # (lines or title) of the open table
+        # titles
+        self.title = None  # [text] of the last <b>. text None if no string
+        self.firstchild = None  # the <b> waiting for its first string
+        # lines
+        self.segment = []  # elements since the last LINEBREAKTAGS
+        self.seenp = False
+
+    def _enddata(self):
+        """a string ends"""
+        if not self.strings:
+            return
+        text = ''.join(self.strings)
+        self.strings = []
+        if not self.pretags:
+            text = _collapse(text)
+        if self.cell is not None:
+            self.cell.append(text)
+        if self.firstchild is not None:
+            self.firstchild[0] = text
+            self.firstchild = None
+        if not self.titles:
+            for element in self.stack:
+                if element.text is not None:
+                    element.text.append(text)
+
+    def _endstrings(self):
+        """a tag or comment ends the string, and is the first child of a <b>
+        that has not seen a string"""
+        self._enddata()
+        if self.firstchild is not None:
+            self.firstchild[0] = None
+            self.firstchild = None
+
+    def data(self, text):
+        self.strings.append(text)
+
+    def comment(self, text=None):
+        self._endstrings()
+        if self.cell is not None:
+            raise NotStreamable("comment in a cell")
+
+    def _lines(self):
+        """the lines before the table"""
+        lines = []
+        for element in self.segment:
+            if element.parent == 'p':
+                continue  # its text is in the text of the <p>
+            if element.isopen:
+                raise NotStreamable("table inside a line")
+            text = ''.join(element.text)
+            if text:
+                lines.append(text)
+        return lines
+
+    def start(self, name, attrs=None):
+        self._endstrings()
+        if self.cell is not None:
+            if name == 'br':
+                self.cell.append('\n')
+                return
+            raise NotStreamable("<%s> in a cell" % (name, ))
+        if self.rows is not None:
+            if name == 'table':
+                raise NotStreamable("nested table")
+            if name == 'tr':
+                if self.row is not None:
+                    raise NotStreamable("nested row")
+                self.row = []
+            elif name == 'td':
+                if self.row is None:
+                    raise NotStreamable("cell outside a row")
+                if self.keep:
+                    self.cell = []
+        elif name == 'table':
+            if self.titles:
+                if self.title is None or self.title[0] is None:
+                    raise NotStreamable("table without a title")
+                self.heading = self.title[0]
+                self.keep = self._wanted(self.heading)
+            elif self.seenp:
+                self.heading = self._lines()
+            else:
+                self.heading = None  # lines_table starts at the first <p>
+            self.rows = []
+
+        if self.stack:
+            parent = self.stack[-1].name
+        else:
+            parent = '[document]'
+        element = _Element(name, parent)
+        if not self.titles:
+            if name in ('script', 'style', 'template'):
+                raise NotStreamable("<%s> is not text" % (name, ))
+            if name in LINEBREAKTAGS:
+                self.segment = []
+                for openelement in self.stack:
+                    openelement.text = None
+            elif name != 'br':
+                element.text = []
+                self.segment.append(element)
+            if name == 'p':
+                self.seenp = True
+        elif name == 'b':
+            self.title = [None]
+            self.firstchild = self.title
+
+        if name in VOIDTAGS:
+            element.isopen = False
+            return
+        if name in PRETAGS:
+            self.pretags += 1
+        self.stack.append(element)
+
+    def end(self, name):
+        self._endstrings()
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i].name == name:
+                break
+        else:
+            return  # not open
+        while len(self.stack) > i:
+            self._close(self.stack.pop())
+
+    def _close(self, element):
+        """the element is closed"""
+        element.isopen = False
+        name = element.name
+        if name in PRETAGS:
+            self.pretags -= 1
+        if name == 'td' and self.cell is not None:
+            self.row.append(_cellvalue(''.join(self.cell), self.tofloat))
+            self.cell = None
+        elif name == 'tr' and self.row is not None:
+            self.rows.append(self.row)
+            self.row = None
+        elif name == 'table' and self.rows is not None:
+            if self.titles:
+                if self.keep:
+                    self.tables.append((self.heading, self.rows))
+                    self._found(self.heading)
+            elif self.heading is not None:
+                self.tables.append([self.heading, self.rows])
+            self.rows = None
+
+    def _wanted(self, title):
+        """True if the table with this title is collected"""
+        if self.wanted is None:
+            return True
+        key = _titlekey(title)
+        if self.firstmatch and key in self.found:
+            return False
+        return key in self.wanted
+
+    def _found(self, title):
+        """the table with this title is collected"""
+        if self.wanted is None or not self.firstmatch:
+            return
+        self.found.add(_titlekey(title))
+        if self.found >= self.wanted:
+            self.rows = None
+            raise _Done()
+
+    def close(self):
+        self._endstrings()
+        while self.stack:
+            self._close(self.stack.pop())
+        return self.tables
+
+
+class _HTMLParser(HTMLParser):
+    """html.parser that sends its events to an _Extractor.
+    Character references are read the way BeautifulSoup reads them"""
+
+    def __init__(self, target):
+        try:
+            HTMLParser.__init__(self, convert_charrefs=False)
+        except TypeError:  # python 2
+            HTMLParser.__init__(self)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag)
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+    def handle_entityref(self, name):
+        if name not in name2codepoint:
+            raise NotStreamable("unknown entity &%s" % (name, ))
+        self.target.data(six.unichr(name2codepoint[name]))
+
+    def handle_charref(self, name):
+        try:
+            if name[:1] in 'xX':
+                codepoint = int(name[1:], 16)
+            else:
+                codepoint = int(name)
+        except ValueError:
+            raise NotStreamable("bad character reference &#%s" % (name, ))
+        if not (0x20 <= codepoint < 0x80 or 0xa0 <= codepoint < 0xd800 or
+                0xe000 <= codepoint < 0xfffe):
+            raise NotStreamable("character reference &#%s" % (name, ))
+        self.target.data(six.unichr(codepoint))
+
+    def handle_comment(self, data):
+        self.target.comment()
+
+    def handle_decl(self, decl):
+        self.target.comment()
+
+    def unknown_decl(self, data):
+        self.target.comment()
+
+    def handle_pi(self, data):
+        self.target.comment()
+
+
+def _text(html_doc):
+    """html_doc as text"""
+    if hasattr(html_doc, 'read'):
+        html_doc = html_doc.read()
+    if not isinstance(html_doc, six.text_type):
+        # BeautifulSoup works out the encoding
+        raise NotStreamable("html_doc is not text")
+    return html_doc
+
+
+def _extract(html_doc, extractor, backend):
+    """run the parser over html_doc"""
+    html_doc = _text(html_doc)
+    if backend == 'lxml':
+        from lxml import etree
+        parser = etree.HTMLParser(target=extractor)
+        try:
+            parser.feed(html_doc)
+            return parser.close()
+        except _Done:
+            return extractor.tables
+    if backend != 'html.parser':
+        raise ValueError("unknown backend %s" % (backend, ))
+    parser = _HTMLParser(extractor)
+    try:
+        parser.feed(html_doc)
+        parser.close()
+    except _Done:
+        return extractor.tables
+    return extractor.close()
+
+
+def titletable(html_doc, tofloat=True, backend='html.parser'):
+    """return a list of [(title, table), .....]
+
+    see readhtml.titletable"""
+    return _extract(html_doc, _Extractor(True, tofloat), backend)
+
+
+def lines_table(html_doc, tofloat=True, backend='html.parser'):
+    """return a list of [(lines, table), .....]
+
+    see readhtml.lines_table"""
+    return _extract(html_doc, _Extractor(False, tofloat), backend)
+
+
+def sections(html_doc):
+    """split the html output at each <hr>
+
+    returns [(reportname, html), ...]. reportname is from the line
+    'Report: <b>name</b>'. It is None for a section without that line."""
+    html_doc = _text(html_doc)
+    starts = [0] + [match.start() for match in SECTIONBREAK.finditer(html_doc)]
+    ends = starts[1:] + [len(html_doc)]
+    result = []
+    for start, end in zip(starts, ends):
+        match = REPORTNAME.search(html_doc, start, end)
+        reportname = None
+        if match:
+            reportname = match.group(1).strip()
+        result.append((reportname, html_doc[start:end]))
+    return result
+
+
+def selectedhtml(html_doc, reports):
+    """the html of the sections of the reports. All of it if reports is None"""
+    if reports is None:
+        return _text(html_doc)
+    wanted = set(_reportkey(report) for report in reports)
+    return ''.join(html for reportname, html in sections(html_doc)
+                   if reportname is not None and
+                   _reportkey(reportname) in wanted)
+
+
+def select_tables(html_doc, titles=None, reports=None, tofloat=True,
+                  firstmatch=True, backend='html.parser'):
+    """return a list of [(title, table), .....] of the tables asked for
+
+    see readhtml.select_tables"""
+    html_doc = selectedhtml(html_doc, reports)
+    wanted = None
+    if titles is not None:
+        wanted = set(_titlekey(title) for title in titles)
+    extractor = _Extractor(True, tofloat, wanted, firstmatch)
+    return _extract(html_doc, extractor, backend)
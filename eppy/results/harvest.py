@@ -0,0 +1,236 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""harvest the same table cells from the html output of many runs into one
+dataset
+
+The run directories are read in parallel in a process pool. The result is an
+array with a row for each run and a column for each cell. It can be saved as
+a csv or a numpy .npz file, with an index of the runs and of the runs that
+failed.
+
+Each run has a runid, which must be unique. By default it is the name of
+the run directory, or its path from the common parent of the run
+directories if two of them have the same name."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import csv
+import glob
+import io
+import os
+
+import numpy as np
+import six
+
+from eppy.results import readhtml
+
+try:
+    import multiprocessing as mp
+except ImportError:
+    pass
+
+
+# names of the html output. 'eplustbl.htm' is the legacy name
+HTMLPATTERNS = ['*Table.html', '*Table.htm', 'eplustbl.htm', '*tbl.htm']
+
+
+def tablehtml(rundir):
+    """return the path of the html output in rundir"""
+    for pattern in HTMLPATTERNS:
+        found = sorted(glob.glob(os.path.join(rundir, pattern)))
+        if found:
+            return found[0]
+    raise IOError("no html output in %s" % (rundir, ))
+
+
+def columnname(cell):
+    """name of the column of the cell (title, row, column)"""
+    return ':'.join(cell)
+
+
+def cellvalue(rows, rowname, column):
+    """value in rows at rowname and column. nan if missing or not a number
+
+    rowname is in the first column, column is in the first row"""
+    if not rows:
+        return np.nan
+    header = [('%s' % (name, )).strip() for name in rows[0]]
+    try:
+        j = header.index(column.strip())
+    except ValueError:
+        return np.nan
+    for row in rows[1:]:
+        if ('%s' % (row[0], )).strip() == rowname.strip():
+            try:
+                return float(row[j])
+            except (ValueError, IndexError):
+                return np.nan
+    return np.nan
+
+
+def harvestrun(rundir, cells, reports=None):
+    """return the values of the cells in the html output of rundir
+
+    cells is a list of (title, row, column).
+    reports limits the search to these reports. see readhtml.select_tables"""
+    fname = tablehtml(rundir)
+    with open(fname, 'rb') as fhandle:  # select_tables works out the encoding
+        html_doc = fhandle.read()
+    titles = set(title for title, _row, _column in cells)
+    tables = readhtml.select_tables(html_doc, titles, reports)
+    bytitle = dict((title.strip().upper(), rows) for title, rows in tables)
+    return [cellvalue(bytitle.get(title.strip().upper()), rowname, column)
+            for title, rowname, column in cells]
+
+
+def _harvestjob(args):
+    """harvestrun for the pool. returns (values, error)"""
+    rundir, cells, reports = args
+    try:
+        return harvestrun(rundir, cells, reports), None
+    except Exception as error:
+        return [np.nan] * len(cells), '%s: %s' % (
+            error.__class__.__name__, error)
+
+
+def defaultrunids(rundirs):
+    """the names of the run directories. Their paths from their common
+    parent if two of them have the same name"""
+    paths = [os.path.normpath(os.path.abspath(rundir)) for rundir in rundirs]
+    names = [os.path.basename(path) for path in paths]
+    if len(set(names)) == len(names):
+        return names
+    parts = [path.split(os.sep) for path in paths]
+    start = min(len(os.path.commonprefix(parts)),
+                min(len(pathparts) for pathparts in parts) - 1)
+    return ['/'.join(pathparts[start:]) for pathparts in parts]
+
+
+def checkrunids(runids):
+    """raise ValueError if a runid is not unique"""
+    seen = set()
+    duplicates = []
+    for runid in runids:
+        if runid in seen:
+            duplicates.append(runid)
+        seen.add(runid)
+    if duplicates:
+        names = sorted(set('%s' % (runid, ) for runid in duplicates))
+        raise ValueError("runids are not unique: %s" % (', '.join(names), ))
+
+
+def harvest(rundirs, cells, outfile=None, reports=None, runids=None,
+            processors=1, progress=None):
+    """read the cells from the html output of each run directory
+
+    Parameters
+    ----------
+    rundirs : list
+        The run directories.
+    cells : list
+        (title, row, column) of each cell to read.
+    outfile : str, optional
+        Save the result as csv (.csv) or numpy (.npz). See savedataset.
+    reports : list, optional
+        Read the tables only in these reports. Faster.
+    runids : list, optional
+        A unique id for each run. See defaultrunids for the default.
+    processors : int, optional
+        Number of processes (default: 1). If 0 is passed then all CPUs are
+        used, -1 means one less than all CPUs, etc.
+    progress : callable, optional
+        Called as progress(done, total, runid, error) after each run.
+        error is None if the run was read.
+
+    Returns
+    -------
+    runids : list
+    values : numpy array
+        A row for each run, a column for each cell. nan if not found.
+    failed : list
+        (runid, error) of the runs that could not be read.
+
+    """
+    cells = [tuple(cell) for cell in cells]
+    if runids is None:
+        runids = defaultrunids(rundirs)
+    checkrunids(runids)
+    jobs = [(rundir, cells, reports) for rundir in rundirs]
+    if processors <= 0:
+        processors = max(1, mp.cpu_count() + processors)
+    values = np.full((len(jobs), len(cells)), np.nan)
+    failed = []
+
+    def collect(results):
+        for i, (rowvalues, error) in enumerate(results):
+            values[i] = rowvalues
+            if error is not None:
+                failed.append((runids[i], error))
+            if progress is not None:
+                progress(i + 1, len(jobs), runids[i], error)
+
+    if processors == 1:
+        collect(six.moves.map(_harvestjob, jobs))
+    else:
+        pool = mp.Pool(processors)
+        try:
+            chunksize = max(1, len(jobs) // (processors * 4))
+            collect(pool.imap(_harvestjob, jobs, chunksize))
+        finally:
+            pool.close()
+            pool.join()
+    if outfile is not None:
+        savedataset(outfile, runids, cells, values, failed, rundirs)
+    return runids, values, failed
+
+
+def indexname(outfile):
+    """name of the index file of outfile"""
+    root, _ext = os.path.splitext(outfile)
+    return '%s_index.csv' % (root, )
+
+
+def _opencsv(fname):
+    """open fname to write a csv file"""
+    if six.PY2:
+        return open(fname, 'wb')
+    return io.open(fname, 'w', newline='')
+
+
+def savedataset(outfile, runids, cells, values, failed=(), rundirs=None):
+    """save the harvested values in outfile
+
+    outfile ending in .npz: a numpy file with the arrays runids, columns,
+        values and failed (the failed runids)
+    else: a csv file with a column for the runid and one for each cell
+    Both also write an index outfile_index.csv, with the runid, the run
+    directory and the error of each run ('' if it was read).
+    The runids must be unique"""
+    checkrunids(runids)
+    columns = [columnname(cell) for cell in cells]
+    errors = dict(failed)
+    if outfile.endswith('.npz'):
+        np.savez_compressed(
+            outfile, runids=np.array(runids), columns=np.array(columns),
+            values=values, failed=np.array([runid for runid, _e in failed]))
+    else:
+        with _opencsv(outfile) as fhandle:
+            writer = csv.writer(fhandle)
+            writer.writerow(['runid'] + columns)
+            for runid, rowvalues in zip(runids, values):
+                writer.writerow([runid] + [repr(float(value))
+                                           for value in rowvalues])
+    if rundirs is None:
+        rundirs = [''] * len(runids)
+    with _opencsv(indexname(outfile)) as fhandle:
+        writer = csv.writer(fhandle)
+        writer.writerow(['runid', 'rundir', 'error'])
+        for runid, rundir in zip(runids, rundirs):
+            writer.writerow([runid, rundir, errors.get(runid, '')])
@@ -0,0 +1,70 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""read the tabular csv output (eplustbl.csv)
+
+EnergyPlus writes the tabular reports as csv when the idf has
+OutputControl:Table:Style with Comma (or CommaAndHTML). titletable gives the
+same [(title, rows), ...] as readhtml.titletable, so the csv can be used in
+place of the html. Reading it is much faster.
+
+In the csv, a table is a block of lines that start with an empty cell. The
+title of the table is the last line of text before it."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import csv
+import io
+
+import six
+
+
+def _csvrows(csv_doc):
+    """the rows of csv_doc"""
+    if six.PY2:
+        lines = io.BytesIO(csv_doc.encode('utf-8'))
+        return ([cell.decode('utf-8') for cell in row]
+                for row in csv.reader(lines))
+    return csv.reader(io.StringIO(csv_doc))
+
+
+def _tovalue(cell):
+    """cell as a float if it is a number. (as in readhtml.table2val_matrix)"""
+    try:
+        return float(cell)
+    except ValueError:
+        return cell
+
+
+def titletable(csv_doc, tofloat=True):
+    """return a list of [(title, table), .....]
+
+    title = the last line of text before the table
+    table = rows -> [[cell1, cell2, ..], [cell1, cell2, ..], ..]
+    the empty cell at the start of each line of the table is dropped"""
+    if hasattr(csv_doc, 'read'):
+        csv_doc = csv_doc.read()
+    titlerows = []
+    title = ''
+    rows = None
+    for row in _csvrows(csv_doc):
+        if len(row) > 1 and row[0] == '':  # a line of a table
+            if rows is None:
+                rows = []
+                titlerows.append((title, rows))
+            cells = row[1:]
+            if tofloat:
+                cells = [_tovalue(cell) for cell in cells]
+            rows.append(cells)
+            continue
+        rows = None
+        text = ','.join(row).strip()
+        if text:
+            title = text
+    return titlerows
@@ -0,0 +1,350 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""read the time series in the eso output (eplusout.eso) into numpy arrays
+
+The data dictionary at the top of the file is read first. The data lines
+are then streamed and only the lines of the requested variables are parsed,
+so a few variables can be read from a very large file quickly.
+
+A variable is identified by its report id (the first number on its line).
+Use datadictionary and findvariables to get the ids.
+
+Optionally the whole file can be converted once into a binary cache (one
+.npy file per report id). Later reads memory-map the cache and do not parse
+the eso file again."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+import io
+import json
+import os
+
+import numpy as np
+
+
+Variable = collections.namedtuple(
+    'Variable', 'id key name units frequency nvalues')
+
+ENVIRONMENTID = 1
+# report id of the timestamps for each reporting frequency
+TIMESTAMPIDS = {
+    'EACH CALL': 2,
+    'TIMESTEP': 2,
+    'HOURLY': 2,
+    'DAILY': 3,
+    'MONTHLY': 4,
+    'RUNPERIOD': 5,
+    'ANNUAL': 6, }
+ENDOFDICTIONARY = 'End of Data Dictionary'
+ENDOFDATA = 'End of Data'
+BLOCKSIZE = 8760  # rows allocated at a time
+CACHEINDEX = 'index.json'
+
+
+def _readlines(fname):
+    """open the eso file for reading"""
+    return io.open(fname, 'r', encoding='latin-1')
+
+
+def _dictionaryline(line):
+    """parse a line of the data dictionary.
+    returns a Variable or (id, [labels]) for a timestamp line"""
+    line, _, comment = line.partition('!')
+    comment = comment.strip()
+    fields = [field.strip() for field in line.split(',')]
+    reportid, nvalues = int(fields[0]), int(fields[1])
+    if not comment or comment.startswith('When'):
+        # a timestamp: the labels of the fields. DayType is not a number
+        labels = [label for label in fields[2:] if label and label != 'DayType']
+        return reportid, labels
+    frequency = comment.split('[')[0].strip()  # Daily [Value,Min,..]
+    rest = ','.join(fields[2:])
+    key, _, rest = rest.rpartition(',')  # meters have no key
+    name, _, units = rest.partition('[')
+    return Variable(reportid, key.strip(), name.strip(), units.strip(' ]'),
+                    frequency, nvalues)
+
+
+def datadictionary(fhandle):
+    """read the data dictionary from the open eso file fhandle
+
+    returns (variables, timestamps)
+    variables = OrderedDict of {id: Variable, ...}
+    timestamps = {id: [label, ...], ...} for the timestamp lines.
+        the labels are of the numeric fields of the timestamp
+    fhandle is left at the first line of the data"""
+    variables = collections.OrderedDict()
+    timestamps = {}
+    for line in fhandle:
+        if line.startswith(ENDOFDICTIONARY):
+            break
+        if not line[:1].isdigit():
+            continue  # Program Version
+        parsed = _dictionaryline(line)
+        if isinstance(parsed, Variable):
+            variables[parsed.id] = parsed
+        elif parsed[0] != ENVIRONMENTID:
+            timestamps[parsed[0]] = parsed[1]
+    return variables, timestamps
+
+
+def readdictionary(fname):
+    """return (variables, timestamps) of the eso file fname.
+    see datadictionary"""
+    with _readlines(fname) as fhandle:
+        return datadictionary(fhandle)
+
+
+def findvariables(variables, name=None, key=None, frequency=None):
+    """return the ids of the variables that match name, key and frequency
+
+    variables is the first item returned by datadictionary.
+    The match is case insensitive. None matches anything"""
+    match = dict(name=name, key=key, frequency=frequency)
+    match = dict((field, value.upper()) for field, value in match.items()
+                 if value is not None)
+    return [variable.id for variable in variables.values()
+            if all(getattr(variable, field).upper() == value
+                   for field, value in match.items())]
+
+
+def timestampid(variable):
+    """return the id of the timestamps of the variable"""
+    return TIMESTAMPIDS[variable.frequency.upper()]
+
+
+def _ncolumns(reportid, variables, timestamps, allcolumns=True):
+    """number of numeric columns of the report id"""
+    if reportid in timestamps:
+        return len(timestamps[reportid])
+    if allcolumns:
+        return variables[reportid].nvalues
+    return 1
+
+
+class _Column(object):
+    """rows of one report id, in blocks allocated BLOCKSIZE rows at a time"""
+    def __init__(self, ncolumns):
+        self.ncolumns = ncolumns
+        self.blocks = []
+        self.block = np.empty((BLOCKSIZE, ncolumns))
+        self.nrows = 0
+
+    def append(self, fields):
+        if self.nrows == BLOCKSIZE:
+            self.blocks.append(self.block)
+            self.block = np.empty((BLOCKSIZE, self.ncolumns))
+            self.nrows = 0
+        self.block[self.nrows] = fields
+        self.nrows += 1
+
+    def array(self):
+        """all the rows. 1-D if there is one column"""
+        result = np.concatenate(self.blocks + [self.block[:self.nrows]])
+        if self.ncolumns == 1:
+            return result[:, 0]
+        return result
+
+
+def _environmentmatches(environment, index, title):
+    """True if the environment with index and title was asked for"""
+    if environment is None:
+        return True
+    try:
+        return environment.upper() == title.upper()
+    except AttributeError:  # an int
+        return environment == index
+
+
+def _readdata(fhandle, columns, environment=None):
+    """stream the data lines into the columns {'id': _Column}"""
+    ncolumns = dict((reportid, column.ncolumns)
+                    for reportid, column in columns.items())
+    index = -1
+    wanted = environment is None
+    for line in fhandle:
+        reportid, _, rest = line.partition(',')
+        if reportid == '1':
+            index += 1
+            title = rest.split(',')[0].strip()
+            wanted = _environmentmatches(environment, index, title)
+            continue
+        if not wanted or reportid not in columns:
+            if line.startswith(ENDOFDATA):
+                break
+            continue
+        fields = rest.split(',', ncolumns[reportid])[:ncolumns[reportid]]
+        columns[reportid].append([float(field) for field in fields])
+
+
+def environments(fname):
+    """return the titles of the environments (design days, run periods)
+    in the eso file fname"""
+    titles = []
+    with _readlines(fname) as fhandle:
+        datadictionary(fhandle)
+        for line in fhandle:
+            if line.startswith('1,'):
+                titles.append(line.split(',')[1].strip())
+            elif line.startswith(ENDOFDATA):
+                break
+    return titles
+
+
+def readvalues(fname, ids, environment=None, allcolumns=False, cache=False):
+    """read the values of the report ids from the eso file fname
+
+    returns {id: array, ...}
+
+    ids are the ids of variables or of timestamps (see TIMESTAMPIDS).
+    environment is the title or the index of the environment to read.
+        None reads all the environments one after the other
+    allcolumns: the daily, monthly and runperiod variables also report
+        the min and max with their times. Read them as well.
+        Otherwise only the value is read
+    cache: read from the binary cache of the file, made by esocache.
+        The cache is made if it is missing or older than the file.
+    An array is 1-D if it has one column"""
+    if cache:
+        return _readcache(esocache(fname), ids, environment, allcolumns)
+    with _readlines(fname) as fhandle:
+        variables, timestamps = datadictionary(fhandle)
+        columns = dict(
+            ('%s' % (reportid, ),
+             _Column(_ncolumns(reportid, variables, timestamps, allcolumns)))
+            for reportid in ids)
+        _readdata(fhandle, columns, environment)
+    return dict((reportid, columns['%s' % (reportid, )].array())
+                for reportid in ids)
+
+
+def _cachedir(fname):
+    """the directory of the cache of fname"""
+    return '%s.npcache' % (fname, )
+
+
+def _sourcestamp(fname):
+    """size and modification time of fname"""
+    stat = os.stat(fname)
+    return dict(size=stat.st_size, mtime=stat.st_mtime)
+
+
+def _cacheindex(cachedir):
+    """the index of the cache. None if there is no cache"""
+    try:
+        with io.open(os.path.join(cachedir, CACHEINDEX), 'r') as fhandle:
+            return json.load(fhandle)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def esocache(fname, cachedir=None):
+    """convert the eso file fname into a binary cache and return cachedir
+
+    cachedir has one .npy file per report id with all its numeric columns,
+    and an index of where each environment starts.
+    cachedir defaults to fname + '.npcache'.
+    The conversion is skipped if the cache is up to date with fname"""
+    if cachedir is None:
+        cachedir = _cachedir(fname)
+    source = _sourcestamp(fname)
+    index = _cacheindex(cachedir)
+    if index is not None and index['source'] == source:
+        return cachedir
+    if not os.path.isdir(cachedir):
+        os.makedirs(cachedir)
+
+    # first pass counts the rows, so the arrays can be allocated on disk
+    with _readlines(fname) as fhandle:
+        variables, timestamps = datadictionary(fhandle)
+        titles = []
+        counts = collections.defaultdict(list)
+        for line in fhandle:
+            reportid, _, rest = line.partition(',')
+            if reportid == '1':
+                titles.append(rest.split(',')[0].strip())
+                for envcounts in counts.values():
+                    envcounts.append(0)
+                continue
+            if line.startswith(ENDOFDATA):
+                break
+            if not titles:
+                continue
+            envcounts = counts[reportid]
+            if len(envcounts) < len(titles):
+                envcounts.extend([0] * (len(titles) - len(envcounts)))
+            envcounts[-1] += 1
+    ncolumns = {}
+    offsets = {}
+    arrays = {}
+    for reportid, envcounts in counts.items():
+        envcounts.extend([0] * (len(titles) - len(envcounts)))
+        ncolumns[reportid] = _ncolumns(int(reportid), variables, timestamps)
+        offsets[reportid] = [int(value) for value in
+                             np.cumsum([0] + envcounts)]
+        arrays[reportid] = np.lib.format.open_memmap(
+            os.path.join(cachedir, '%s.npy' % (reportid, )), mode='w+',
+            shape=(offsets[reportid][-1], ncolumns[reportid]))
+
+    # second pass fills them
+    rows = dict((reportid, 0) for reportid in arrays)
+    with _readlines(fname) as fhandle:
+        datadictionary(fhandle)
+        for line in fhandle:
+            reportid, _, rest = line.partition(',')
+            if reportid not in arrays or reportid == '1':
+                if line.startswith(ENDOFDATA):
+                    break
+                continue
+            ncols = ncolumns[reportid]
+            fields = rest.split(',', ncols)[:ncols]
+            arrays[reportid][rows[reportid]] = [float(field)
+                                                for field in fields]
+            rows[reportid] += 1
+    for array in arrays.values():
+        array.flush()
+    del arrays
+
+    index = dict(source=source, environments=titles, offsets=offsets)
+    with io.open(os.path.join(cachedir, CACHEINDEX), 'w') as fhandle:
+        fhandle.write('%s' % (json.dumps(index), ))
+    return cachedir
+
+
+def _readcache(cachedir, ids, environment=None, allcolumns=False):
+    """read the report ids from the cache. see readvalues"""
+    index = _cacheindex(cachedir)
+    titles = index['environments']
+    result = {}
+    for reportid in ids:
+        offsets = index['offsets'].get('%s' % (reportid, ))
+        if offsets is None:  # never reported
+            result[reportid] = np.empty((0, ))
+            continue
+        array = np.load(os.path.join(cachedir, '%s.npy' % (reportid, )),
+                        mmap_mode='r')
+        if environment is not None:
+            envs = [i for i, title in enumerate(titles)
+                    if _environmentmatches(environment, i, title)]
+            parts = [array[offsets[i]:offsets[i + 1]] for i in envs]
+            if len(parts) == 1:
+                array = parts[0]  # still a memmap
+            elif parts:  # all the environments with the title
+                array = np.concatenate(parts)
+            else:
+                array = array[:0]
+        if not allcolumns and reportid not in TIMESTAMPIDS.values():
+            array = array[:, :1]
+        if array.shape[1] == 1:
+            array = array[:, 0]
+        result[reportid] = array
+    return result
+
@@ -14,7 +14,9 @@ from __future__ import unicode_literals
 import string
 import collections
 import six
-from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4 import BeautifulSoup, NavigableString, Tag, UnicodeDammit
+
+from eppy.results import fasthtml
 
 
 class NotSimpleTable(Exception):
@@ -87,20 +89,40 @@ def table2val_matrix(table):
     return rows
 
 
+def _htmltext(html_doc):
+    """read html_doc once and decode it, so that the fast reader and
+    BeautifulSoup get the same text"""
+    if hasattr(html_doc, 'read'):
+        html_doc = html_doc.read()
+    if not isinstance(html_doc, six.text_type):
+        html_doc = UnicodeDammit(html_doc).unicode_markup
+    return html_doc
+
 def titletable(html_doc, tofloat=True):
     """return a list of [(title, table), .....]
 
     title = previous item with a <b> tag
     table = rows -> [[cell1, cell2, ..], [cell1, cell2, ..], ..]"""
+    html_doc = _htmltext(html_doc)
+    try:
+        return fasthtml.titletable(html_doc, tofloat)
+    except fasthtml.NotStreamable:
+        return _titletable(html_doc, tofloat)
+
+def _titletable(html_doc, tofloat=True):
+    """titletable using a BeautifulSoup tree"""
     soup = BeautifulSoup(html_doc, "html.parser")
     btables = soup.find_all(['b', 'table']) # find all the <b> and <table>
     titletables = []
-    for i, item in enumerate(btables):
-        if item.name == 'table':
-            for j in range(i + 1):
-                if btables[i-j].name == 'b':# step back to find a <b>
-                    break
-            titletables.append((btables[i - j], item))
+    lastb = None # the <b> before the table, found in the same pass
+    for item in btables:
+        if item.name == 'b':
+            lastb = item
+        else:
+            if lastb is None: # no <b> before it
+                titletables.append((btables[0], item))
+            else:
+                titletables.append((lastb, item))
     if tofloat:
         t2m = table2val_matrix
     else:
@@ -108,6 +130,37 @@ def titletable(html_doc, tofloat=True):
     titlerows = [(tl.contents[0], t2m(tb)) for tl, tb in titletables]
     return titlerows
 
+def select_tables(html_doc, titles=None, reports=None, tofloat=True,
+                  firstmatch=True):
+    """return a list of [(title, table), .....] of the tables asked for
+
+    titles = titles of the tables. None for all tables
+    reports = names of the reports to look in, as in 'Report: <b>name</b>'.
+        None for all reports. Only the html of these reports is read
+    firstmatch = return only the first table of each title, and stop
+        reading once all the titles are found
+    titles are matched ignoring case and surrounding spaces.
+    reports are matched ignoring case and all spaces"""
+    html_doc = _htmltext(html_doc)
+    try:
+        return fasthtml.select_tables(html_doc, titles, reports, tofloat,
+                                      firstmatch)
+    except fasthtml.NotStreamable:
+        pass
+    html_doc = fasthtml.selectedhtml(html_doc, reports)
+    titlerows = _titletable(html_doc, tofloat)
+    if titles is None:
+        return titlerows
+    wanted = set(title.strip().upper() for title in titles)
+    selected = []
+    for title, rows in titlerows:
+        key = title.strip().upper()
+        if key in wanted:
+            selected.append((title, rows))
+            if firstmatch:
+                wanted.remove(key)
+    return selected
+
 def _has_name(soup_obj):
     """checks if soup_obj is really a soup object or just a string
     If it has a name it is a soup object"""
@@ -129,36 +182,39 @@ def lines_table(html_doc, tofloat=True):
 
     The lines act as a description for what is in the table
     """
+    html_doc = _htmltext(html_doc)
+    try:
+        return fasthtml.lines_table(html_doc, tofloat)
+    except fasthtml.NotStreamable:
+        return _lines_table(html_doc, tofloat)
+
+def _lines_table(html_doc, tofloat=True):
+    """lines_table using a BeautifulSoup tree"""
     soup = BeautifulSoup(html_doc, "html.parser")
     linestables = []
-    elements = soup.p.next_elements # start after the first para
-    for element in elements:
-        tabletup = []
+    function_selector = {True:table2val_matrix, False:table2matrix}
+    function = function_selector[tofloat]
+    firstpara = soup.p # tables are taken after the first para
+    afterpara = False
+    beforetable = [] # elements after the previous table, 'hr', 'tr' or 'td'
+    for element in soup.descendants: # one pass through the document
         if not _has_name(element):
             continue
-        if element.name == 'table': # hit the first table
-            beforetable = []
-            prev_elements = element.previous_elements # walk back and get the lines
-            for prev_element in prev_elements:
-                if not _has_name(prev_element):
-                    continue
-                if prev_element.name not in ('br', None): # no lines here
-                    if prev_element.name in ('table', 'hr', 'tr', 'td'):
-                        # just hit the previous table. You got all the lines
-                        break
-                    if prev_element.parent.name == "p":
+        if element.name in ('table', 'hr', 'tr', 'td'):
+            if element.name == 'table' and afterpara:
+                lines = []
+                for line_element in beforetable:
+                    if line_element.parent.name == "p":
                         # if the parent is "p", you will get it's text anyways from the parent
-                        pass
-                    else:
-                        if prev_element.get_text(): # skip blank lines
-                            beforetable.append(prev_element.get_text())
-            beforetable.reverse()
-            tabletup.append(beforetable)
-            function_selector = {True:table2val_matrix, False:table2matrix}
-            function = function_selector[tofloat]
-            tabletup.append(function(element))
-        if tabletup:
-            linestables.append(tabletup)
+                        continue
+                    if line_element.get_text(): # skip blank lines
+                        lines.append(line_element.get_text())
+                linestables.append([lines, function(element)])
+            beforetable = []
+        elif element.name != 'br':
+            beforetable.append(element)
+        if element is firstpara:
+            afterpara = True
     return linestables
 
 def _asciidigits(s):
@@ -205,3 +261,106 @@ def named_grid_h(grid):
 def named_grid_v(grid):
     """make a vertical named grid"""
     return _make_ntgrid(_transpose(grid))
+
+
+class Grid(object):
+    """a table with labelled rows and columns
+
+    grid[rowlabel, columnlabel] is the value at that row and column.
+    Labels can also be given as in named_grid_h, with the spaces and other
+    characters replaced by '_', or as indexes.
+    grid[rowlabel] is the list of values in that row.
+
+    Unlike named_grid_h, no new class is made for each table."""
+    __slots__ = ('values', 'rowlabels', 'columnlabels', '_rowindex',
+                 '_columnindex')
+
+    def __init__(self, values, rowlabels, columnlabels):
+        self.values = values
+        self.rowlabels = rowlabels
+        self.columnlabels = columnlabels
+        self._rowindex = _labelindex(rowlabels)
+        self._columnindex = _labelindex(columnlabels)
+
+    @classmethod
+    def fromtable(cls, table, vertical=False):
+        """make a grid from the rows returned by table2val_matrix
+        The labels are in the first row and the first column.
+        vertical: the labels in the first row label the rows of the grid"""
+        grid = cls([row[1:] for row in table[1:]],
+                   [row[0] for row in table[1:]],
+                   table[0][1:])
+        if vertical:
+            return grid.transpose()
+        return grid
+
+    def _index(self, label, labelindex):
+        """index of the label"""
+        if isinstance(label, int):
+            return label
+        try:
+            return labelindex[label]
+        except KeyError:
+            return labelindex[_nospace(label)]
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            rowlabel, columnlabel = key
+            return self.values[self._index(rowlabel, self._rowindex)][
+                self._index(columnlabel, self._columnindex)]
+        return self.row(key)
+
+    def row(self, label):
+        """the values in the row"""
+        return list(self.values[self._index(label, self._rowindex)])
+
+    def column(self, label):
+        """the values in the column"""
+        j = self._index(label, self._columnindex)
+        return [row[j] for row in self.values]
+
+    def transpose(self):
+        """the grid with the rows and columns swapped"""
+        return Grid(_transpose(self.values), self.columnlabels,
+                    self.rowlabels)
+
+    def asarray(self):
+        """the values as a numpy array of floats. nan if not a number"""
+        import numpy as np
+        return np.array([[_floatornan(value) for value in row]
+                         for row in self.values], dtype=float)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __repr__(self):
+        return 'Grid(%r, %r, %r)' % (self.values, self.rowlabels,
+                                     self.columnlabels)
+
+
+def _labelindex(labels):
+    """{label: index} with the labels as they are and with _nospace"""
+    index = {}
+    for i, label in enumerate(labels):
+        index.setdefault(label, i)
+    for i, label in enumerate(labels):
+        index.setdefault(_nospace('%s' % (label, )), i)
+    return index
+
+def _floatornan(value):
+    """value as a float, or nan"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+def grid_h(table):
+    """make a horizontal Grid. grid[rowlabel, columnlabel]"""
+    return Grid.fromtable(table)
+
+def grid_v(table):
+    """make a vertical Grid. grid[columnlabel, rowlabel]"""
+    return Grid.fromtable(table, vertical=True)
@@ -0,0 +1,219 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""read the sqlite output (eplusout.sql)
+
+EnergyPlus writes the sqlite output when the idf has the object
+Output:SQLite. It holds the same tabular reports as the html output, and
+the report variables and meters. Reading it is much faster than reading
+the html.
+
+The file is opened read-only. All the queries are parameterized. The
+names are compared with COLLATE NOCASE on the bare column, not with UPPER,
+so that SQLite can use an index made on the column with COLLATE NOCASE."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sqlite3
+
+import numpy as np
+from six.moves.urllib.request import pathname2url
+
+
+SQLNAME = 'eplusout.sql'
+TABULARFIELDS = ('ReportName', 'ReportForString', 'TableName', 'RowName',
+                 'ColumnName')
+# parameters in one query. Older builds of sqlite allow no more than 999
+MAXPARAMETERS = 900
+
+
+def connect(fname):
+    """open the sqlite file fname read-only and return the connection"""
+    if not os.path.isfile(fname):
+        raise IOError("no sqlite file %s" % (fname, ))
+    uri = 'file:%s?mode=ro' % (pathname2url(os.path.abspath(fname)), )
+    try:
+        return sqlite3.connect(uri, uri=True)
+    except TypeError:  # python 2 cannot open it read-only
+        return sqlite3.connect(fname)
+
+
+def _where(conditions):
+    """(where clause, parameters) from a list of (column, value).
+    values that are None are left out. The match ignores the case of
+    ascii letters"""
+    clauses = []
+    params = []
+    for column, value in conditions:
+        if value is not None:
+            clauses.append('%s = ? COLLATE NOCASE' % (column, ))
+            params.append(value)
+    if not clauses:
+        return '', params
+    return ' WHERE ' + ' AND '.join(clauses), params
+
+
+def _chunks(items):
+    """the items in lists of MAXPARAMETERS at most"""
+    return [items[i:i + MAXPARAMETERS]
+            for i in range(0, len(items), MAXPARAMETERS)]
+
+
+def tofloat(value):
+    """value as a float if it is a number, else the stripped string"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value.strip()
+
+
+def tabulardata(conn, reportname=None, reportfor=None, tablename=None,
+                rowname=None, columnname=None):
+    """return the rows of the tabular reports that match the arguments
+
+    Each row is (ReportName, ReportForString, TableName, RowName,
+    ColumnName, Units, Value). Numbers in Value are converted to float.
+    Arguments that are None match anything."""
+    where, params = _where(zip(
+        TABULARFIELDS,
+        (reportname, reportfor, tablename, rowname, columnname)))
+    sql = ('SELECT ReportName, ReportForString, TableName, RowName, '
+           'ColumnName, Units, Value FROM TabularDataWithStrings%s '
+           'ORDER BY TabularDataIndex' % (where, ))
+    return [row[:-1] + (tofloat(row[-1]), )
+            for row in conn.execute(sql, params)]
+
+
+def tablevalue(conn, reportname, reportfor, tablename, rowname, columnname):
+    """return the value of one cell of a tabular report.
+    None if there is no such cell"""
+    rows = tabulardata(conn, reportname, reportfor, tablename, rowname,
+                       columnname)
+    if not rows:
+        return None
+    return rows[0][-1]
+
+
+def variables(conn, name=None, key=None, frequency=None):
+    """return the report variables and meters that match the arguments
+
+    Each is (ReportDataDictionaryIndex, KeyValue, Name, ReportingFrequency,
+    Units). Arguments that are None match anything."""
+    where, params = _where([('Name', name), ('KeyValue', key),
+                            ('ReportingFrequency', frequency)])
+    sql = ('SELECT ReportDataDictionaryIndex, KeyValue, Name, '
+           'ReportingFrequency, Units FROM ReportDataDictionary%s '
+           'ORDER BY ReportDataDictionaryIndex' % (where, ))
+    return [(row[0], row[1] or '') + tuple(row[2:])
+            for row in conn.execute(sql, params)]
+
+
+def _envjoin(environment):
+    """(join and where clause, parameters) for the environment"""
+    if environment is None:
+        return '', []
+    sql = (' JOIN EnvironmentPeriods'
+           ' ON Time.EnvironmentPeriodIndex ='
+           ' EnvironmentPeriods.EnvironmentPeriodIndex'
+           ' AND EnvironmentPeriods.EnvironmentName = ? COLLATE NOCASE')
+    return sql, [environment]
+
+
+def timeseries(conn, ids, environment=None):
+    """return the values of the report variables or meters
+    {id: array, ...} in the order of time
+
+    ids are ReportDataDictionaryIndex as returned by variables.
+    environment is the name of the environment period (a design day or a
+    run period). None reads all of them.
+    The ids are read in one query, or a few if there are very many."""
+    ids = list(ids)
+    envjoin, params = _envjoin(environment)
+    values = dict((reportid, []) for reportid in ids)
+    for chunk in _chunks(ids):
+        marks = ', '.join('?' * len(chunk))
+        sql = ('SELECT ReportData.ReportDataDictionaryIndex, ReportData.Value'
+               ' FROM ReportData JOIN Time'
+               ' ON ReportData.TimeIndex = Time.TimeIndex%s'
+               ' WHERE ReportData.ReportDataDictionaryIndex IN (%s)'
+               ' ORDER BY ReportData.TimeIndex' % (envjoin, marks))
+        for reportid, value in conn.execute(sql, params + chunk):
+            values[reportid].append(value)
+    return dict((reportid, np.array(values[reportid], dtype=float))
+                for reportid in ids)
+
+
+def timestamps(conn, reportid, environment=None):
+    """return the times of the values of the report variable reportid
+    as an array of rows [Month, Day, Hour, Minute]"""
+    envjoin, params = _envjoin(environment)
+    sql = ('SELECT Time.Month, Time.Day, Time.Hour, Time.Minute'
+           ' FROM ReportData JOIN Time'
+           ' ON ReportData.TimeIndex = Time.TimeIndex%s'
+           ' WHERE ReportData.ReportDataDictionaryIndex = ?'
+           ' ORDER BY ReportData.TimeIndex' % (envjoin, ))
+    rows = conn.execute(sql, params + [reportid]).fetchall()
+    return np.array(rows, dtype=int).reshape((len(rows), 4))
+
+
+def sqlfile(path, sqlname=SQLNAME):
+    """the sqlite file of path. path is the file or its run directory"""
+    if os.path.isdir(path):
+        return os.path.join(path, sqlname)
+    return path
+
+
+def _metricvalues(conn, metrics):
+    """the values of the metrics read from conn in one query"""
+    tablenames = sorted(set(metric[2].upper() for metric in metrics))
+    cells = {}
+    for chunk in _chunks(tablenames):
+        marks = ', '.join('?' * len(chunk))
+        sql = ('SELECT ReportName, ReportForString, TableName, RowName, '
+               'ColumnName, Value FROM TabularDataWithStrings '
+               'WHERE TableName COLLATE NOCASE IN (%s)' % (marks, ))
+        for row in conn.execute(sql, chunk):
+            cells.setdefault(tuple(field.upper() for field in row[:-1]),
+                             row[-1])
+    result = []
+    for metric in metrics:
+        value = cells.get(tuple(field.upper() for field in metric))
+        if value is not None:
+            value = tofloat(value)
+        if not isinstance(value, float):
+            value = np.nan
+        result.append(value)
+    return result
+
+
+def extractmetrics(paths, metrics, sqlname=SQLNAME):
+    """read the same tabular values from many runs
+
+    paths are sqlite files or run directories holding sqlname.
+    metrics is a list of (ReportName, ReportForString, TableName, RowName,
+    ColumnName).
+    returns (values, failed)
+    values is an array with a row for each path and a column for each
+    metric. A value that is missing or not a number is nan.
+    failed is a list of (path, error) for the paths that could not be read.
+    Their rows are all nan."""
+    metrics = [tuple(metric) for metric in metrics]
+    values = np.full((len(paths), len(metrics)), np.nan)
+    failed = []
+    for i, path in enumerate(paths):
+        try:
+            conn = connect(sqlfile(path, sqlname))
+            try:
+                values[i] = _metricvalues(conn, metrics)
+            finally:
+                conn.close()
+        except (IOError, sqlite3.Error) as error:
+            failed.append((path, error))
+    return values, failed
@@ -0,0 +1,235 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""Reduced run-period variants of an IDF for fast first-pass screening.
+
+A screening variant replaces the RunPeriod objects of an IDF with a few
+representative weeks (or drops them and simulates the design days only).
+The tabular results of a run-period variant can be scaled back to annual
+estimates with `extrapolate`.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+
+# (name, begin month, begin day, end month, end day)
+SEASONAL_WEEKS = (
+    ('Winter Week', 1, 15, 1, 21),
+    ('Spring Week', 4, 15, 4, 21),
+    ('Summer Week', 7, 15, 7, 21),
+    ('Autumn Week', 10, 15, 10, 21),
+)
+
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+DAYS_IN_YEAR = sum(DAYS_IN_MONTH)
+
+
+def dayofyear(month, day):
+    """Day of the year (1 to 365) of month/day in a non leap year."""
+    return sum(DAYS_IN_MONTH[:month - 1]) + day
+
+
+def perioddays(periods):
+    """Total number of days simulated by the periods.
+
+    Parameters
+    ----------
+    periods : list
+        List of (name, begin month, begin day, end month, end day).
+        A period that ends before it begins wraps over the end of the year.
+
+    Returns
+    -------
+    int
+
+    """
+    total = 0
+    for _name, bmonth, bday, emonth, eday in periods:
+        days = dayofyear(emonth, eday) - dayofyear(bmonth, bday) + 1
+        if days <= 0:
+            days = days + DAYS_IN_YEAR
+        total = total + days
+    return total
+
+
+def annualfactor(periods):
+    """Factor that scales results of the periods up to a full year."""
+    return DAYS_IN_YEAR / perioddays(periods)
+
+
+def copyidf(idf):
+    """Return an independent copy of the idf, keeping its weather file."""
+    newidf = idf.__class__(StringIO(idf.idfstr()))
+    newidf.idfname = idf.idfname
+    try:
+        newidf.epw = idf.epw
+    except AttributeError:
+        pass
+    return newidf
+
+
+def _simulationcontrol(idf):
+    """return the SIMULATIONCONTROL object, making one if needed"""
+    controls = idf.idfobjects['SIMULATIONCONTROL']
+    if controls:
+        return controls[0]
+    return idf.newidfobject('SIMULATIONCONTROL')
+
+
+def setrunperiods(idf, periods):
+    """Replace the RunPeriod objects in idf with periods.
+
+    Parameters
+    ----------
+    idf : IDF object
+        The IDF to modify in place.
+    periods : list
+        List of (name, begin month, begin day, end month, end day).
+
+    Returns
+    -------
+    list
+        The new RUNPERIOD objects.
+
+    """
+    runperiods = idf.idfobjects['RUNPERIOD']
+    # keep the other settings (holidays, start day etc.) of the first period
+    template = {}
+    if runperiods:
+        template = dict(zip(runperiods[0].fieldnames[1:],
+                            runperiods[0].fieldvalues[1:]))
+    for runperiod in runperiods[:]:
+        idf.removeidfobject(runperiod)
+    newperiods = []
+    for name, bmonth, bday, emonth, eday in periods:
+        runperiod = idf.newidfobject('RUNPERIOD', **template)
+        runperiod.Name = name
+        runperiod.Begin_Month = bmonth
+        runperiod.Begin_Day_of_Month = bday
+        runperiod.End_Month = emonth
+        runperiod.End_Day_of_Month = eday
+        newperiods.append(runperiod)
+    control = _simulationcontrol(idf)
+    control.Run_Simulation_for_Weather_File_Run_Periods = 'Yes'
+    return newperiods
+
+
+def runperiodvariant(idf, periods=SEASONAL_WEEKS):
+    """Copy of idf that simulates only the periods.
+
+    The default periods are one week in each season.
+
+    Parameters
+    ----------
+    idf : IDF object
+    periods : list, optional
+        List of (name, begin month, begin day, end month, end day).
+
+    Returns
+    -------
+    IDF object
+
+    """
+    newidf = copyidf(idf)
+    setrunperiods(newidf, periods)
+    return newidf
+
+
+def designdayvariant(idf):
+    """Copy of idf that simulates only the sizing periods (design days).
+
+    Raises
+    ------
+    ValueError
+        If the idf has no SizingPeriod objects.
+
+    """
+    sizingkeys = [key for key in idf.model.dtls
+                  if key.startswith('SIZINGPERIOD:') and idf.idfobjects[key]]
+    if not sizingkeys:
+        raise ValueError("%s has no SizingPeriod objects" % (idf.idfname,))
+    newidf = copyidf(idf)
+    for runperiod in newidf.idfobjects['RUNPERIOD'][:]:
+        newidf.removeidfobject(runperiod)
+    control = _simulationcontrol(newidf)
+    control.Run_Simulation_for_Sizing_Periods = 'Yes'
+    control.Run_Simulation_for_Weather_File_Run_Periods = 'No'
+    return newidf
+
+
+def screeningjobs(idfs, periods=SEASONAL_WEEKS, designdays=False, **kwargs):
+    """Make a jobs list of screening variants for `runIDFs`.
+
+    Parameters
+    ----------
+    idfs : list
+        IDF objects to make variants of.
+    periods : list, optional
+        Periods used for the run-period variants.
+    designdays : bool, optional
+        If True make design-day-only variants instead (default: False).
+    **kwargs
+        Passed on to `run` for every job.
+
+    Returns
+    -------
+    list
+        [[variant, kwargs], ...] in the same order as idfs.
+
+    """
+    jobs = []
+    for idf in idfs:
+        if designdays:
+            variant = designdayvariant(idf)
+        else:
+            variant = runperiodvariant(idf, periods)
+        jobs.append([variant, dict(kwargs)])
+    return jobs
+
+
+def extrapolate(titletables, factor, titles=None):
+    """Scale the numbers in tabular results by factor.
+
+    The first row and the first column of each table are labels and are not
+    scaled. Use this only on tables of totals (energy, cost etc.). Peaks,
+    intensities and averages do not scale with the run period.
+
+    Parameters
+    ----------
+    titletables : list
+        [(title, rows), ...] as returned by `readhtml.titletable`.
+    factor : float
+        Usually `annualfactor(periods)`.
+    titles : list, optional
+        Scale only the tables with these titles. Others are returned as is.
+        Default is to scale all tables.
+
+    Returns
+    -------
+    list
+        [(title, rows), ...] with scaled rows.
+
+    """
+    scaled = []
+    for title, rows in titletables:
+        if titles is not None and title not in titles:
+            scaled.append((title, rows))
+            continue
+        newrows = rows[:1]
+        for row in rows[1:]:
+            newrow = row[:1]
+            for cell in row[1:]:
+                if isinstance(cell, float):
+                    cell = cell * factor
+                newrow.append(cell)
+            newrows.append(newrow)
+        scaled.append((title, newrows))
+    return scaled
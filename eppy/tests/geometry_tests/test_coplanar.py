@@ -0,0 +1,87 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""pytest for coplanar.py"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import eppy.geometry.coplanar as coplanar
+from eppy.pytest_helpers import almostequal
+
+
+def test_newell_normal():
+    """test the normal of a polygon poly"""
+    data = (
+        ([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], (0, 0, 1)),
+        # polygon, answer,
+        # the first three points are in a line
+        ([(0, 0, 0), (1, 0, 0), (2, 0, 0), (2, 1, 0), (0, 1, 0)], (0, 0, 1)),
+        ([(0, 0, 3), (0, 0, 0), (5, 0, 0), (5, 0, 3)], (0, -1, 0)),
+        ([(0, 0, 0), (1, 0, 0), (2, 0, 0)], (0, 0, 0)),
+    )
+    for poly, answer in data:
+        result = coplanar.newell_normal(poly)
+        for res, ans in zip(result, answer):
+            assert almostequal(res, ans) == True
+
+
+def test_plane():
+    """test the plane of a polygon poly"""
+    data = (
+        ([(0, 0, 3), (0, 0, 0), (5, 0, 0), (5, 0, 3)], ((0, -1, 0), 0)),
+        # polygon, answer,
+        ([(0, 2, 3), (0, 2, 0), (5, 2, 0), (5, 2, 3)], ((0, -1, 0), -2)),
+        ([(0, 0, 3), (5, 0, 3), (5, 0, 0), (0, 0, 0)], ((0, 1, 0), 0)),
+    )
+    for poly, answer in data:
+        assert coplanar.plane(poly) == answer
+
+
+def test_mergepolygons():
+    """test mergepolygons"""
+    wall1 = [(0, 0, 3), (0, 0, 0), (5, 0, 0), (5, 0, 3)]
+    wall2 = [(5, 0, 3), (5, 0, 0), (10, 0, 0), (10, 0, 3)]
+    wall3 = [(10, 0, 3), (10, 0, 0), (15, 0, 0), (15, 0, 3)]
+    wall4 = [(20, 0, 3), (20, 0, 0), (25, 0, 0), (25, 0, 3)]
+    # the top of wall5 meets wall1 and wall2 at a T-junction
+    wall5 = [(0, 0, 6), (0, 0, 3), (10, 0, 3), (10, 0, 6)]
+    data = (
+        (
+            [wall1, wall2, wall3],
+            [([0, 1, 2], [(0, 0, 3), (0, 0, 0), (15, 0, 0), (15, 0, 3)])]
+        ),  # polys, merged
+        (
+            [wall1, wall4],
+            [([0], wall1), ([1], wall4)]
+        ),  # polys, merged
+        (
+            [wall1, wall4, wall2],
+            [([0, 2], [(0, 0, 3), (0, 0, 0), (10, 0, 0), (10, 0, 3)]),
+             ([1], wall4)]
+        ),  # polys, merged
+        (
+            [wall1, wall2, wall5],
+            [([0, 1, 2], [(0, 0, 0), (10, 0, 0), (10, 0, 6), (0, 0, 6)])]
+        ),  # polys, merged
+    )
+    for polys, merged in data:
+        result = coplanar.mergepolygons(polys)
+        assert result == merged
+
+
+def test_mergepolygons_hole():
+    """test that polygons around a hole are not merged"""
+    polys = [
+        [(0, 0, 0), (3, 0, 0), (3, 1, 0), (0, 1, 0)],
+        [(0, 2, 0), (3, 2, 0), (3, 3, 0), (0, 3, 0)],
+        [(0, 1, 0), (1, 1, 0), (1, 2, 0), (0, 2, 0)],
+        [(2, 1, 0), (3, 1, 0), (3, 2, 0), (2, 2, 0)],
+    ]
+    result = coplanar.mergepolygons(polys)
+    assert [indexes for indexes, poly in result] == [[0], [1], [2], [3]]
@@ -35,3 +35,34 @@ def test_volume():
     for poly1, poly2, answer in data:
         result = volume_zone.vol(poly1, poly2)
         assert almostequal(answer, result, places=4) == True
+    # vol does not change its arguments
+    poly1, poly2 = data[0][:2]
+    assert len(poly1) == 4 and len(poly2) == 4
+
+
+def prism(base, top, bottom=0):
+    """the faces of a prism, facing out. base is anticlockwise from above"""
+    faces = [[(x, y, bottom) for x, y in reversed(base)],
+             [(x, y, top) for x, y in base]]
+    for (x1, y1), (x2, y2) in zip(base, base[1:] + base[:1]):
+        faces.append([(x1, y1, bottom), (x2, y2, bottom),
+                      (x2, y2, top), (x1, y1, top)])
+    return faces
+
+
+def test_vol_polyhedron():
+    """py.test for vol_polyhedron"""
+    data = (
+        (prism([(0, 0), (1, 0), (1, 1), (0, 1)], 1), 1),
+        # polys, answer
+        (prism([(0, 0), (4, 0), (4, 2), (2, 2), (2, 4), (0, 4)], 3), 36),
+        (prism([(1e5, 1e5), (1e5 + 2, 1e5), (1e5, 1e5 + 2)], 102, 100), 4),
+        (prism([(0, 0), (1, 0), (1, 1), (0, 1)], 1)[1:], float('nan')),
+        # not closed
+        )
+    for polys, answer in data:
+        result = volume_zone.vol_polyhedron(polys)
+        if answer != answer:
+            assert result != result
+        else:
+            assert almostequal(answer, result, places=4) == True
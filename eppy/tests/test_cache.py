@@ -0,0 +1,134 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for cache.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import os
+
+from eppy.results import readeso
+from eppy.results import readhtml
+from eppy.results.cache import ReportCache
+from eppy.tests.sample_html import sample_html as SAMPLE_HTML
+from eppy.tests.test_readeso import writeeso
+
+
+CALLS = []
+
+
+def countingreader(html_doc, tofloat=True):
+    """readhtml.titletable that counts the times it is called"""
+    CALLS.append(1)
+    return readhtml.titletable(html_doc, tofloat=tofloat)
+
+
+def writehtml(fname, html_doc=SAMPLE_HTML):
+    """write html_doc to fname"""
+    with io.open(fname, 'w', encoding='latin-1') as fhandle:
+        fhandle.write(html_doc)
+
+
+def test_read(tmpdir):
+    """py.test for ReportCache.read"""
+    del CALLS[:]
+    fname = str(tmpdir.join('eplustbl.htm'))
+    writehtml(fname)
+    cache = ReportCache(str(tmpdir.join('cache')))
+    result = cache.read(fname, countingreader)
+    assert result == readhtml.titletable(SAMPLE_HTML)
+    assert len(CALLS) == 1
+    # read from the cache
+    assert cache.read(fname, countingreader) == result
+    assert len(CALLS) == 1
+    # other arguments are cached apart
+    result = cache.read(fname, countingreader, kwargs=dict(tofloat=False))
+    assert result == readhtml.titletable(SAMPLE_HTML, tofloat=False)
+    assert len(CALLS) == 2
+    # a copy of the file is found by its contents
+    other = str(tmpdir.join('copy.htm'))
+    writehtml(other)
+    cache.read(other, countingreader)
+    assert len(CALLS) == 2
+    # a changed file is read again
+    changed = SAMPLE_HTML.replace('Site and Source Energy', 'Site Energy')
+    writehtml(fname, changed)
+    os.utime(fname, (1, 1))
+    result = cache.read(fname, countingreader)
+    assert result == readhtml.titletable(changed)
+    assert len(CALLS) == 3
+    # a new cache next to the file
+    cache = ReportCache()
+    cache.read(fname, countingreader)
+    assert len(CALLS) == 4
+    assert os.path.isdir(str(tmpdir.join('.eppy_cache')))
+    cache.read(fname, countingreader)
+    assert len(CALLS) == 4
+    cache.clear(fname)
+    cache.read(fname, countingreader)
+    assert len(CALLS) == 5
+
+
+def test_evict(tmpdir):
+    """py.test for the removal of the least recently used results"""
+    del CALLS[:]
+    cachedir = str(tmpdir.join('cache'))
+    cache = ReportCache(cachedir, maxentries=2)
+    fnames = []
+    for i in range(3):
+        fname = str(tmpdir.join('run%s.htm' % (i, )))
+        writehtml(fname, SAMPLE_HTML.replace('1050PageMillRoad', 'b%s' % i))
+        fnames.append(fname)
+        cache.read(fname, countingreader)
+    assert len(CALLS) == 3
+    pickles = [name for name in os.listdir(cachedir)
+               if name.endswith('.pickle')]
+    assert len(pickles) == 2
+    cache.read(fnames[2], countingreader)
+    assert len(CALLS) == 3
+    cache.read(fnames[0], countingreader)  # was removed
+    assert len(CALLS) == 4
+
+
+def test_types(tmpdir):
+    """py.test for the types of the results read from the cache"""
+    fname = writeeso(tmpdir)
+    cache = ReportCache(str(tmpdir.join('cache')))
+    first = cache.read(fname, readeso.readdictionary, astext=False)
+    second = cache.read(fname, readeso.readdictionary, astext=False)
+    assert first == second
+    for variables, _timestamps in (first, second):
+        assert variables[9].frequency == 'Daily'
+        assert type(variables[9]) is readeso.Variable
+
+
+def test_encoding(tmpdir):
+    """py.test for reading a utf-8 report through the cache"""
+    fname = str(tmpdir.join('eplustbl.htm'))
+    html_doc = SAMPLE_HTML.replace('Site and Source Energy',
+                                   '\u00c9nergie \u2013 Site')
+    with io.open(fname, 'w', encoding='utf-8') as fhandle:
+        fhandle.write(html_doc)
+    cache = ReportCache(str(tmpdir.join('cache')))
+    for _i in range(2):
+        result = cache.read(fname, readhtml.titletable)
+        assert result[0][0] == '\u00c9nergie \u2013 Site'
+    result = cache.read(fname, readhtml.titletable, encoding='latin-1')
+    assert result[0][0] != '\u00c9nergie \u2013 Site'
+
+
+def test_blocks(tmpdir, monkeypatch):
+    """py.test for reading and hashing the file in blocks"""
+    monkeypatch.setattr('eppy.results.cache.BLOCKSIZE', 7)
+    fname = str(tmpdir.join('eplustbl.htm'))
+    writehtml(fname)
+    result = ReportCache(str(tmpdir.join('cache'))).read(
+        fname, readhtml.titletable)
+    assert result == readhtml.titletable(SAMPLE_HTML)
@@ -0,0 +1,104 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for fasthtml.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from eppy.results import fasthtml
+from eppy.results import readhtml
+from eppy.tests.sample_html import sample_html as SAMPLE_HTML
+
+
+edgehtml = """<html><body><p>first para</p>
+<hr>
+<p>Report:<b> Some Report</b></p>
+<b>Title &amp; more</b><br><br>
+<div>a line <i>with</i> tags</div>
+<table>
+<tr><td></td><td>a<br>b</td><td>
+  </td><td>  12.5 </td></tr>
+<tr><td>&lt;x&gt;&nbsp;</td><td>&#65;</td><td> </td><td>1e3</td></tr>
+</table>
+<b></b><br>
+<b>
+</b>
+<table><tr><td>x</td></tr></table>
+</body></html>"""
+
+
+def test_titletable():
+    """py.test for titletable"""
+    for html_doc in (SAMPLE_HTML, edgehtml):
+        for tofloat in (True, False):
+            expected = readhtml._titletable(html_doc, tofloat)
+            for backend in ('html.parser', 'lxml'):
+                result = fasthtml.titletable(html_doc, tofloat, backend)
+                assert result == expected
+
+
+def test_lines_table():
+    """py.test for lines_table"""
+    for html_doc in (SAMPLE_HTML, edgehtml):
+        for tofloat in (True, False):
+            expected = readhtml._lines_table(html_doc, tofloat)
+            for backend in ('html.parser', 'lxml'):
+                result = fasthtml.lines_table(html_doc, tofloat, backend)
+                assert result == expected
+
+
+def test_notstreamable():
+    """py.test for the html that fasthtml leaves to BeautifulSoup"""
+    data = (
+        "<p>x</p><b>t</b><table><tr><td><a>1</a></td></tr></table>",
+        # html_doc
+        "<p>x</p><b>t</b><table><tr><td><table></table></td></tr></table>",
+        "<p>x</p><b>t</b><table><tr><td>1<!-- c --></td></tr></table>",
+        "<p>x</p><b><i>t</i></b><table><tr><td>1</td></tr></table>",
+        "<p>x</p><table><tr><td>1</td></tr></table>",
+    )
+    for html_doc in data:
+        with pytest.raises(fasthtml.NotStreamable):
+            fasthtml.titletable(html_doc)
+    html_doc = "<b>t</b><div><p>x</p><table><tr><td>1</td></tr></table></div>"
+    with pytest.raises(fasthtml.NotStreamable):
+        fasthtml.lines_table(html_doc)
+    # readhtml falls back on BeautifulSoup
+    html_doc = data[0]
+    with pytest.raises(readhtml.NotSimpleTable):
+        readhtml.titletable(html_doc)
+    html_doc = data[3]
+    assert readhtml.titletable(html_doc) == readhtml._titletable(html_doc)
+
+
+def test_sections():
+    """py.test for sections"""
+    result = fasthtml.sections(SAMPLE_HTML)
+    assert [reportname for reportname, html in result] == [
+        None,
+        'Annual Building Utility Performance Summary',
+        'COMPONENTS OF PEAK ELECTRICAL DEMAND',
+        'COMPONENTS OF PEAK NET ELECTRICAL DEMAND']
+    assert ''.join(html for reportname, html in result) == SAMPLE_HTML
+
+
+def test_select_tables():
+    """py.test for select_tables"""
+    titles = ['Custom Monthly Report', 'site and source energy']
+    expected = [titlerow for titlerow in fasthtml.titletable(SAMPLE_HTML)
+                if titlerow[0] in ('Site and Source Energy',
+                                   'Custom Monthly Report')]
+    for backend in ('html.parser', 'lxml'):
+        result = fasthtml.select_tables(SAMPLE_HTML, titles, firstmatch=False,
+                                        backend=backend)
+        assert result == expected
+        result = fasthtml.select_tables(SAMPLE_HTML, titles, backend=backend)
+        assert result == expected[:2]
@@ -0,0 +1,154 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for floormultipliers.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+import eppy.floormultipliers as floormultipliers
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+
+def towertxt(numfloors, height=3):
+    """idf text of a tower of 10 x 10 zones, one per floor"""
+    lines = ["ZoneList, Offices, %s;" % (
+        ', '.join('F%s' % (i, ) for i in range(numfloors)), )]
+    for i in range(numfloors):
+        zb, zt = i * height, (i + 1) * height
+        lines.append("Zone, F%s;" % (i, ))
+        lines.append("Lights, F%s Lights, F%s, Sch, Watts/Area, , 10;" % (i, i))
+        if i == 0:
+            floorbc = "Ground, "
+        else:
+            floorbc = "Surface, F%s Ceiling" % (i - 1, )
+        lines.append(
+            "BuildingSurface:Detailed, F%s Floor, Floor, Slab, F%s, %s, "
+            "NoSun, NoWind, , 4, 0,0,%s, 0,10,%s, 10,10,%s, 10,0,%s;"
+            % (i, i, floorbc, zb, zb, zb, zb))
+        if i == numfloors - 1:
+            ceiling = "Roof, Slab, F%s, Outdoors, " % (i, )
+        else:
+            ceiling = "Ceiling, Slab, F%s, Surface, F%s Floor" % (i, i + 1)
+        lines.append(
+            "BuildingSurface:Detailed, F%s Ceiling, %s, "
+            "NoSun, NoWind, , 4, 0,0,%s, 10,0,%s, 10,10,%s, 0,10,%s;"
+            % (i, ceiling, zt, zt, zt, zt))
+        lines.append(
+            "BuildingSurface:Detailed, F%s Wall, Wall, Ext, F%s, Outdoors, , "
+            "SunExposed, WindExposed, , 4, 0,0,%s, 10,0,%s, 10,0,%s, 0,0,%s;"
+            % (i, i, zt, zt, zb, zb))
+        lines.append(
+            "FenestrationSurface:Detailed, F%s Window, Window, Glass, "
+            "F%s Wall, , , , , 1, 4, 1,0,%s, 2,0,%s, 2,0,%s, 1,0,%s;"
+            % (i, i, zt - 1, zt - 1, zb + 1, zb + 1))
+    return '\n'.join(lines)
+
+
+def test_stackedgroups():
+    """py.test for stackedgroups"""
+    idf = IDF(StringIO(towertxt(5)))
+    result = floormultipliers.stackedgroups(idf)
+    # top and bottom floors have different boundary conditions
+    assert result == [['F1', 'F2', 'F3']]
+    # a floor with different loads breaks the stack
+    idf = IDF(StringIO(towertxt(5)))
+    idf.idfobjects['LIGHTS'][2].Watts_per_Zone_Floor_Area = 12
+    result = floormultipliers.stackedgroups(idf)
+    assert result == []
+    idf = IDF(StringIO(towertxt(6)))
+    idf.idfobjects['LIGHTS'][2].Watts_per_Zone_Floor_Area = 12
+    result = floormultipliers.stackedgroups(idf)
+    assert result == [['F3', 'F4']]
+
+
+def test_collapsefloors():
+    """py.test for collapsefloors"""
+    idf = IDF(StringIO(towertxt(5)))
+    result = floormultipliers.collapsefloors(idf)
+    assert result == {'F1': ['F2', 'F3']}
+    zones = idf.idfobjects['ZONE']
+    assert [zone.Name for zone in zones] == ['F0', 'F1', 'F4']
+    assert zones[1].Multiplier == 3
+    surfaces = idf.idfobjects['BUILDINGSURFACE:DETAILED']
+    assert len(surfaces) == 9
+    assert len(idf.idfobjects['FENESTRATIONSURFACE:DETAILED']) == 3
+    assert len(idf.idfobjects['LIGHTS']) == 3
+    assert idf.idfobjects['ZONELIST'][0].obj[2:] == ['F0', 'F1', 'F4']
+    surfaces = dict((surface.Name, surface) for surface in surfaces)
+    # F1 Ceiling pointed at F2 Floor, which is gone
+    ceiling = surfaces['F1 Ceiling']
+    assert ceiling.Outside_Boundary_Condition == 'Adiabatic'
+    assert ceiling.Outside_Boundary_Condition_Object == ''
+    floor = surfaces['F4 Floor']
+    assert floor.Outside_Boundary_Condition == 'Adiabatic'
+    # F1 Floor still sees F0 Ceiling
+    floor = surfaces['F1 Floor']
+    assert floor.Outside_Boundary_Condition == 'Surface'
+    assert floor.Outside_Boundary_Condition_Object == 'F0 Ceiling'
+
+
+def hvactxt(numfloors):
+    """idf text of the tower with an air terminal in every zone"""
+    lines = [towertxt(numfloors)]
+    for i in range(numfloors):
+        lines.append(
+            "ZoneHVAC:EquipmentConnections, F%s, F%s Equipment, F%s Inlets, "
+            ", F%s Air Node, F%s Return Node;" % (i, i, i, i, i))
+        lines.append("NodeList, F%s Inlets, F%s Supply Node;" % (i, i))
+        lines.append(
+            "ZoneHVAC:EquipmentList, F%s Equipment, "
+            "AirTerminal:SingleDuct:Uncontrolled, F%s Terminal, 1, 1;"
+            % (i, i))
+        lines.append(
+            "AirTerminal:SingleDuct:Uncontrolled, F%s Terminal, Sch, "
+            "F%s Supply Node, 0.5;" % (i, i))
+    lines.append("AirLoopHVAC:ZoneSplitter, Splitter, Supply Inlet, %s;" % (
+        ', '.join('F%s Supply Node' % (i, ) for i in range(numfloors)), ))
+    lines.append("AirLoopHVAC:ZoneMixer, Mixer, Return Outlet, %s;" % (
+        ', '.join('F%s Return Node' % (i, ) for i in range(numfloors)), ))
+    return '\n'.join(lines)
+
+
+def test_collapsefloors_hvac():
+    """py.test for collapsefloors with a conditioned tower"""
+    idf = IDF(StringIO(hvactxt(5)))
+    assert floormultipliers.stackedgroups(idf) == [['F1', 'F2', 'F3']]
+    # a terminal with a different flow rate breaks the stack
+    idf = IDF(StringIO(hvactxt(5)))
+    terminals = idf.idfobjects['AIRTERMINAL:SINGLEDUCT:UNCONTROLLED']
+    terminals[2].Maximum_Air_Flow_Rate = 0.6
+    assert floormultipliers.stackedgroups(idf) == []
+    idf = IDF(StringIO(hvactxt(5)))
+    result = floormultipliers.collapsefloors(idf)
+    assert result == {'F1': ['F2', 'F3']}
+    kept = ['F0', 'F1', 'F4']
+    connections = idf.idfobjects['ZONEHVAC:EQUIPMENTCONNECTIONS']
+    assert [obj.Zone_Name for obj in connections] == kept
+    equipment = idf.idfobjects['ZONEHVAC:EQUIPMENTLIST']
+    assert [obj.Name for obj in equipment] == [
+        '%s Equipment' % (name, ) for name in kept]
+    terminals = idf.idfobjects['AIRTERMINAL:SINGLEDUCT:UNCONTROLLED']
+    assert [obj.Name for obj in terminals] == [
+        '%s Terminal' % (name, ) for name in kept]
+    nodelists = idf.idfobjects['NODELIST']
+    assert [obj.Name for obj in nodelists] == [
+        '%s Inlets' % (name, ) for name in kept]
+    splitter = idf.idfobjects['AIRLOOPHVAC:ZONESPLITTER'][0]
+    assert splitter.obj[3:] == [
+        '%s Supply Node' % (name, ) for name in kept]
+    mixer = idf.idfobjects['AIRLOOPHVAC:ZONEMIXER'][0]
+    assert mixer.obj[3:] == ['%s Return Node' % (name, ) for name in kept]
@@ -0,0 +1,52 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for function_helpers.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+import eppy.function_helpers as fh
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt = """
+BuildingSurface:Detailed, w1, Wall, Ext, Z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 0,0,3, 0,0,0, 5,0,0, 5,0,3;
+"""
+
+
+def test_cachedgeometry():
+    """py.test for the geometry kept in the surface"""
+    idf = IDF(StringIO(idftxt))
+    wall = idf.idfobjects['BUILDINGSURFACE:DETAILED'][0]
+    assert almostequal(wall.area, 15)
+    assert almostequal(wall.azimuth, 180)
+    assert wall['__geometry']['area'] == wall.area
+    # a vertex is changed
+    wall.Vertex_3_Xcoordinate = 10
+    wall.Vertex_4_Xcoordinate = 10
+    assert almostequal(wall.area, 30)
+    assert almostequal(wall.width, 10)
+    # the coordinates are changed
+    fh.setcoords(wall, [(0, 0, 0), (5, 0, 0), (5, 5, 0)])
+    assert almostequal(wall.area, 12.5)
+    assert almostequal(wall.tilt, 0)
+    # the field Number_of_Vertices is changed
+    fh.setcoords(wall, [(0, 0, 3), (0, 0, 0), (5, 0, 0), (5, 0, 3)])
+    wall['Number_of_Vertices'] = 3
+    assert almostequal(wall.area, 15)
+    assert almostequal(wall.height, 3)
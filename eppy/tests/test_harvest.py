@@ -0,0 +1,152 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for harvest.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import csv
+import io
+import math
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from eppy.results import harvest
+from eppy.pytest_helpers import almostequal
+
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOURCES_DIR = os.path.join(THIS_DIR, os.pardir, 'resources')
+ABUPS = os.path.join(RESOURCES_DIR, 'outputfiles', 'V_7_2',
+                     '5ZoneCAVtoVAVWarmestTempFlowTable_ABUPS.html')
+CELLS = [
+    ('Site and Source Energy', 'Total Site Energy', 'Total Energy [kWh]'),
+    ('Building Area', 'Total Building Area', 'Area [m2]'),
+    ('Building Area', 'Not There', 'Area [m2]'), ]
+
+
+def makerundirs(tmpdir):
+    """two run directories with html output and one without"""
+    rundirs = []
+    for name, htmlname in (('run0', 'eplustbl.htm'),
+                           ('run1', 'runTable.html'),
+                           ('run2', None)):
+        rundir = os.path.join('%s' % (tmpdir, ), name)
+        os.mkdir(rundir)
+        if htmlname:
+            shutil.copy(ABUPS, os.path.join(rundir, htmlname))
+        rundirs.append(rundir)
+    return rundirs
+
+
+def test_cellvalue():
+    """py.test for cellvalue"""
+    rows = [['', 'Area [m2]', 'Name'],
+            ['Total Building Area', 927.2, 'x'],
+            ['Net Conditioned Building Area', 900.0, 'y']]
+    data = (
+        ('Total Building Area', 'Area [m2]', 927.2),
+        # rowname, column, value
+        (' Net Conditioned Building Area', 'Area [m2]', 900.0),
+        ('Total Building Area', 'Name', None),
+        ('Total Building Area', 'Not There', None),
+        ('Not There', 'Area [m2]', None),
+    )
+    for rowname, column, value in data:
+        result = harvest.cellvalue(rows, rowname, column)
+        if value is None:
+            assert math.isnan(result)
+        else:
+            assert result == value
+    assert math.isnan(harvest.cellvalue(None, 'a', 'b'))
+
+
+def test_harvest(tmpdir):
+    """py.test for harvest"""
+    rundirs = makerundirs(tmpdir)
+    for processors in (1, 2):
+        calls = []
+
+        def progress(done, total, runid, error):
+            calls.append((done, total, runid, error is None))
+
+        runids, values, failed = harvest.harvest(
+            rundirs, CELLS, processors=processors, progress=progress)
+        assert runids == ['run0', 'run1', 'run2']
+        for i in (0, 1):
+            assert almostequal(values[i, 0], 47694.47)
+            assert almostequal(values[i, 1], 927.2)
+            assert math.isnan(values[i, 2])
+        assert all(math.isnan(value) for value in values[2])
+        assert [runid for runid, error in failed] == ['run2']
+        assert calls == [(1, 3, 'run0', True), (2, 3, 'run1', True),
+                         (3, 3, 'run2', False)]
+
+
+def test_savedataset(tmpdir):
+    """py.test for savedataset"""
+    rundirs = makerundirs(tmpdir)
+    outfile = os.path.join('%s' % (tmpdir, ), 'results.npz')
+    runids, values, failed = harvest.harvest(
+        rundirs, CELLS, outfile=outfile,
+        reports=['Annual Building Utility Performance Summary'])
+    saved = np.load(outfile)
+    assert saved['runids'].tolist() == runids
+    assert saved['columns'].tolist()[1] == (
+        'Building Area:Total Building Area:Area [m2]')
+    assert np.allclose(saved['values'], values, equal_nan=True)
+    assert saved['failed'].tolist() == ['run2']
+    with io.open(harvest.indexname(outfile), 'r', newline='') as fhandle:
+        index = list(csv.reader(fhandle))
+    assert index[0] == ['runid', 'rundir', 'error']
+    assert [row[0] for row in index[1:]] == runids
+    assert [row[2] == '' for row in index[1:]] == [True, True, False]
+
+    outfile = os.path.join('%s' % (tmpdir, ), 'results.csv')
+    harvest.savedataset(outfile, runids, CELLS, values, failed, rundirs)
+    with io.open(outfile, 'r', newline='') as fhandle:
+        rows = list(csv.reader(fhandle))
+    assert rows[0][0] == 'runid'
+    assert len(rows) == 4
+    assert almostequal(float(rows[1][2]), 927.2)
+    assert rows[3][1] == 'nan'
+
+
+def test_runids(tmpdir):
+    """py.test for defaultrunids and checkrunids"""
+    rundirs = [os.path.join('%s' % (tmpdir, ), name)
+               for name in ('a', 'b/run1', 'c/run1')]
+    assert harvest.defaultrunids(rundirs[1:]) == ['b/run1', 'c/run1']
+    assert harvest.defaultrunids(rundirs[:2]) == ['a', 'run1']
+    harvest.checkrunids(['run0', 'run1'])
+    with pytest.raises(ValueError):
+        harvest.checkrunids(['run1', 'run0', 'run1'])
+    with pytest.raises(ValueError):
+        harvest.harvest(rundirs[1:], CELLS, runids=['x', 'x'])
+    outfile = os.path.join('%s' % (tmpdir, ), 'results.csv')
+    with pytest.raises(ValueError):
+        harvest.savedataset(outfile, ['x', 'x'], CELLS,
+                            np.full((2, len(CELLS)), np.nan))
+
+
+def test_utf8(tmpdir):
+    """py.test for harvestrun of a utf-8 report"""
+    with io.open(ABUPS, 'r', encoding='latin-1') as fhandle:
+        html_doc = fhandle.read().replace('Area [m2]', 'Area [m\u00b2]')
+    rundir = os.path.join('%s' % (tmpdir, ), 'run0')
+    os.mkdir(rundir)
+    with io.open(os.path.join(rundir, 'eplustbl.htm'), 'w',
+                 encoding='utf-8') as fhandle:
+        fhandle.write(html_doc)
+    result = harvest.harvestrun(
+        rundir, [('Building Area', 'Total Building Area', 'Area [m\u00b2]')])
+    assert almostequal(result[0], 927.2)
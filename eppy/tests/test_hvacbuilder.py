@@ -11,9 +11,11 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import pytest
 from six import StringIO
 
 import eppy.hvacbuilder as hvacbuilder
+import eppy.idf_helpers as idf_helpers
 from eppy.iddcurrent import iddcurrent
 from eppy.modeleditor import IDF
 
@@ -273,6 +275,38 @@ def test_renamenodes():
     result = idf.idfobjects['PIPE:ADIABATIC'][0].obj
     assert result == outidf.idfobjects['PIPE:ADIABATIC'][0].obj
 
+def test_renamenodes_index():
+    """py.test for renamenodes with the node index made before the edits"""
+    idftxt = """PIPE:ADIABATIC, np1, np1_inlet, np1_outlet;
+    PIPE:ADIABATIC, np2, np1_outlet, np2_outlet;
+    AIRLOOPHVAC, a_loop, , , , , , , , np1_outlet;
+    """
+    idf = IDF(StringIO(idftxt))
+    idf_helpers.nodeindex(idf)
+    np1, np2 = idf.idfobjects['PIPE:ADIABATIC']
+    np1.Outlet_Node_Name = ['np1_outlet', 'np1_np2_node']
+    hvacbuilder.renamenodes(idf, fieldtype='node')
+    assert np1.Outlet_Node_Name == 'np1_np2_node'
+    assert np2.Inlet_Node_Name == 'np1_np2_node'
+    # a field of type node that does not end with Node_Name
+    airloop = idf.idfobjects['AIRLOOPHVAC'][0]
+    assert airloop.Demand_Side_Inlet_Node_Names == 'np1_np2_node'
+    # the index is current after the renaming
+    result = idf_helpers.nodeindex(idf).getobjects('np1_np2_node')
+    assert sorted(obj.Name for obj in result) == ['a_loop', 'np1', 'np2']
+    assert idf_helpers.nodeindex(idf).getobjects('np1_outlet') == []
+
+def test_zoneequipconnections():
+    """py.test for zoneequipconnections"""
+    idftxt = """ZONEHVAC:EQUIPMENTCONNECTIONS, Z1, list1;
+    ZONEHVAC:EQUIPMENTCONNECTIONS, z2, list2;
+    ZONEHVAC:EQUIPMENTCONNECTIONS, Z1, list3;
+    """
+    idf = IDF(StringIO(idftxt))
+    result = hvacbuilder.zoneequipconnections(idf)
+    assert sorted(result.keys()) == ['Z1', 'Z2']
+    assert result['Z1'].Zone_Conditioning_Equipment_List_Name == 'list1'
+
 def test_getfieldnamesendswith():
     """py.test for getfieldnamesendswith"""
     idftxt = """PIPE:ADIABATIC,
@@ -649,3 +683,48 @@ def test_clean_listofcomponents_tuples():
         result = hvacbuilder._clean_listofcomponents_tuples(lst)
         assert result == clst
 
+
+def test_makeloops():
+    """py.test for makeloops"""
+    sloop = ['sb0', ['sb1', 'sb2'], 'sb3']
+    dloop = ['db0', ['db1', 'db2'], 'db3']
+    chiller = [("Chiller:Electric", 'Central_Chiller', 'Chilled_Water_'),
+               ("PIPE:ADIABATIC", 'np1')]
+    condenser = [("Chiller:Electric", 'Central_Chiller', 'Condenser_'), ]
+    # made one by one
+    idf1 = IDF(StringIO(""))
+    hvacbuilder.makeairloop(idf1, 'a_loop', ['ab0', ['ab1', 'ab2'], 'ab3'],
+                            ['z1', 'z2'])
+    loop = hvacbuilder.makeplantloop(idf1, 'p_loop', sloop, dloop)
+    cloop = hvacbuilder.makecondenserloop(
+        idf1, 'c_loop', ['cs0', ['cs1', 'cs2'], 'cs3'],
+        ['cd0', ['cd1', 'cd2'], 'cd3'])
+    hvacbuilder.replacebranch1(idf1, loop, 'sb1', chiller, fluid='Water')
+    hvacbuilder.replacebranch1(idf1, cloop, 'cd1', condenser, fluid='Water')
+    # made together
+    idf2 = IDF(StringIO(""))
+    loopspecs = [
+        dict(type='airloop', name='a_loop',
+             supply=['ab0', ['ab1', 'ab2'], 'ab3'], demand=['z1', 'z2']),
+        dict(type='plantloop', name='p_loop', supply=sloop, demand=dloop,
+             branches={'sb1': chiller}),
+        dict(type='CondenserLoop', name='c_loop',
+             supply=['cs0', ['cs1', 'cs2'], 'cs3'],
+             demand=['cd0', ['cd1', 'cd2'], 'cd3'],
+             branches={'cd1': condenser}, fluid='Water'), ]
+    result = hvacbuilder.makeloops(idf2, loopspecs)
+    assert [loop.Name for loop in result] == ['a_loop', 'p_loop', 'c_loop']
+    assert idf2.idfstr() == idf1.idfstr()
+    # the specs are checked before anything is made
+    badspecs = (
+        [dict(type='waterloop', name='w', supply=sloop, demand=dloop)],
+        [dict(type='plantloop', name='p', supply=sloop, demand=dloop),
+         dict(type='plantloop', name='P', supply=[], demand=[])],
+        [dict(type='plantloop', name='p', supply=sloop, demand=sloop)],
+        [dict(type='plantloop', name='p', supply=sloop, demand=dloop,
+              branches={'xb1': chiller})], )
+    for loopspecs in badspecs:
+        idf = IDF(StringIO(""))
+        with pytest.raises(hvacbuilder.LoopSpecError):
+            hvacbuilder.makeloops(idf, loopspecs)
+        assert idf.idfstr() == ''
@@ -98,9 +98,24 @@ def test_getobjectswithnode():
     expectedset = set([item.key for item in expected])
     resultset = set([item.key for item in foundobjs]) 
     assert  resultset ==  expectedset
+    foundobjs = idf_helpers.getobjectswithnode(idf, nodekeys,
+                                        'CW Supply Inlet Node', useindex=True)
+    assert set([item.key for item in foundobjs]) == expectedset
     expectedset = set([item.Name for item in expected])
     resultset = set([item.Name for item in foundobjs]) 
     assert  resultset ==  expectedset
+    pump.obj[2] = 'Another Node' # seen without the index
+    foundobjs = idf_helpers.getobjectswithnode(idf, nodekeys,
+                                        'CW Supply Inlet Node')
+    assert set([item.key for item in foundobjs]) == set(['PLANTLOOP',
+                                                         'BRANCH'])
+    # in the order of the keys, with or without the index
+    nodekeys = ['BRANCH', 'PUMP:VARIABLESPEED', 'PLANTLOOP', 'Branch']
+    pump.obj[2] = 'CW Supply Inlet Node'
+    for useindex in (False, True):
+        foundobjs = idf_helpers.getobjectswithnode(idf, nodekeys,
+                                'CW Supply Inlet Node', useindex=useindex)
+        assert foundobjs == [branch, pump, plantloop]
 
 def test_name2idfobject():
     """py.test for name2idfobject"""
@@ -165,3 +180,76 @@ def test_copyidfintoidf():
     idf_helpers.copyidfintoidf(toidf, fromidf)
     result = idf_helpers.getidfobjectlist(toidf)
     assert [res.Name for res in result] == allnames
+
+def test_referringfields():
+    """py.test for referringfields"""
+    idf = IDF(StringIO(""))
+    idf.newidfobject("ZONE", Name="z1")
+    people = idf.newidfobject("PEOPLE", Name="p1", Zone_or_ZoneList_Name="Z1")
+    surf = idf.newidfobject("BUILDINGSURFACE:DETAILED", Name="s1",
+                            Zone_Name="z1")
+    idf.newidfobject("BUILDINGSURFACE:DETAILED", Name="s2", Zone_Name="z2")
+    result = idf_helpers.referringfields(idf, ['ZoneNames', ])
+    assert set(result) == {'Z1', 'Z2'}
+    assert result['Z1'] == [(surf, 'Zone_Name')]
+    result = idf_helpers.referringfields(idf, ['ZoneAndZoneListNames', ])
+    assert result == {'Z1': [(people, 'Zone_or_ZoneList_Name')]}
+
+def test_removeidfobjects():
+    """py.test for removeidfobjects"""
+    idf = IDF(StringIO(""))
+    zones = [idf.newidfobject("ZONE", Name=name) for name in "abcd"]
+    # an object equal to, but not the same as zones[1]
+    idf.newidfobject("ZONE", Name="b")
+    building = idf.newidfobject("BUILDING", Name="e")
+    idf_helpers.removeidfobjects(idf, [zones[1], zones[3], building])
+    assert [zone.Name for zone in idf.idfobjects['ZONE']] == ['a', 'c', 'b']
+    assert [obj[1] for obj in idf.model.dt['ZONE']] == ['a', 'c', 'b']
+    assert len(idf.idfobjects['BUILDING']) == 0
+    assert zones[1].theidf is None
+
+def test_nodefields():
+    """py.test for nodefields"""
+    idf = IDF(StringIO(""))
+    result = idf_helpers.nodefields(idf)
+    assert 'ZONE' not in result
+    pipe = idf.newidfobject('PIPE:ADIABATIC')
+    assert [pipe.objls[i] for i in result['PIPE:ADIABATIC']] == [
+        'Inlet_Node_Name', 'Outlet_Node_Name']
+    assert idf_helpers.nodefields(IDF(StringIO(""))) is result # same IDD
+
+def test_nodeindex():
+    """py.test for nodeindex"""
+    idf = IDF(StringIO("""
+    Pipe:Adiabatic, p1, n1, n2;
+    Pipe:Adiabatic, p2, n2, n3;
+    Zone, n2;
+    """))
+    index = idf_helpers.nodeindex(idf)
+    assert idf_helpers.nodeindex(idf) is index
+    p1, p2 = idf.idfobjects['PIPE:ADIABATIC']
+    result = index.getfields('N2')
+    assert [(obj.Name, field) for obj, field in result] == [
+        ('p1', 'Outlet_Node_Name'), ('p2', 'Inlet_Node_Name')]
+    # kept current on edits
+    p1.Outlet_Node_Name = 'n4'
+    p2['Outlet_Node_Name'] = 'n2'
+    result = index.getfields('n2')
+    assert [(obj.Name, field) for obj, field in result] == [
+        ('p2', 'Inlet_Node_Name'), ('p2', 'Outlet_Node_Name')]
+    assert index.getobjects('n2') == [p2]
+    assert index.getobjects('n4') == [p1]
+    p3 = idf.newidfobject('PIPE:ADIABATIC', Name='p3', Inlet_Node_Name='n4')
+    assert index.getobjects('n4') == [p1, p3]
+    idf.removeidfobject(p1)
+    assert index.getobjects('n4') == [p3]
+    assert index.getobjects('n1') == []
+    p3.obj[2] = 'n5' # not seen until refresh
+    assert index.getobjects('n5') == []
+    index.refresh()
+    assert index.getobjects('n5') == [p3]
+    pipes = idf.idfobjects['PIPE:ADIABATIC']
+    p4 = idf.newidfobject('PIPE:ADIABATIC', Name='p4', Inlet_Node_Name='n6')
+    pipes[0] = pipes.pop() # set in the idfobjects
+    assert index.getobjects('n6') == [p4]
+    assert index.getobjects('n2') == []
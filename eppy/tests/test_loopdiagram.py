@@ -15,12 +15,20 @@ from __future__ import unicode_literals
 import os
 
 import pytest
+from six import StringIO
 
+from eppy import hvacbuilder
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.useful_scripts import loopdiagram
 from eppy.useful_scripts.loopdiagram import clean_edges
 from eppy.useful_scripts.loopdiagram import dropnodes
 from eppy.useful_scripts.loopdiagram import edges2nodes
+from eppy.useful_scripts.loopdiagram import loopedges
+from eppy.useful_scripts.loopdiagram import makeairplantloop
 from eppy.useful_scripts.loopdiagram import process_idf
 from eppy.useful_scripts.loopdiagram import replace_colon
+from eppy.useful_scripts.loopdiagram import writedot
 from eppy.pytest_helpers import do_integration_tests
 
 
@@ -31,6 +39,10 @@ RESOURCES_DIR = os.path.join(THIS_DIR, os.pardir, 'resources')
 IDD_FILES = os.path.join(RESOURCES_DIR, 'iddfiles')
 IDF_FILES = os.path.join(RESOURCES_DIR, 'idffiles')
 
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
 def test_dropnodes():
     """py.test for dropnodes"""
     # test 1
@@ -97,6 +109,77 @@ def test_cleanedges():
         assert result == clean_edg
         
 
+def test_makediagram(monkeypatch):
+    """py.test for makediagram without pydot"""
+    monkeypatch.setattr(loopdiagram, 'pydot', None)
+    with pytest.raises(ImportError):
+        loopdiagram.makediagram([('a', 'b')])
+
+
+def test_writedot():
+    """py.test for writedot"""
+    edges = [(('a "in"', 'epnode'), 'b'), ('b', ('c', 'EndNode'))]
+    fhandle = StringIO()
+    writedot(edges, fhandle)
+    assert fhandle.getvalue().splitlines() == [
+        'digraph G {',
+        '"a \\"in\\"" [label="a \\"in\\"", shape=plaintext];',
+        '"b" [label="b", shape=box3d];',
+        '"c" [label="c", shape=doubleoctagon, style=filled, '
+        'fillcolor="#e4e4e4"];',
+        '"a \\"in\\"" -> "b";',
+        '"b" -> "c";',
+        '}']
+
+
+def test_loopedges():
+    """py.test for loopedges"""
+    idf = IDF(StringIO(""))
+    chiller = ("Chiller:Electric", 'Central_Chiller')
+    hvacbuilder.makeloops(idf, [
+        dict(type='airloop', name='a_loop',
+             supply=['ab0', ['ab1', 'ab2'], 'ab3'], demand=['z1', 'z2']),
+        dict(type='plantloop', name='p_loop',
+             supply=['sb0', ['sb1', 'sb2'], 'sb3'],
+             demand=['db0', ['db1', 'db2'], 'db3'],
+             branches={'sb1': [chiller + ('Chilled_Water_', )]}),
+        dict(type='condenserloop', name='c_loop',
+             supply=['cs0', ['cs1', 'cs2'], 'cs3'],
+             demand=['cd0', ['cd1', 'cd2'], 'cd3'],
+             branches={'cd1': [chiller + ('Condenser_', )]}), ])
+    edges = makeairplantloop(idf.model, idf.idd_info)
+    result = loopedges(idf.model, idf.idd_info, edges)
+    assert [loopname for loopname, _edges in result] == [
+        'a_loop', 'p_loop', 'c_loop']
+    alledges = set(edges)
+    for loopname, theedges in result:
+        assert set(theedges) <= alledges
+    components = [set(comp for edge in theedges for comp in edge
+                      if not isinstance(comp, tuple))
+                  for _loopname, theedges in result]
+    assert components[0] == set([
+        'ab0_duct', 'ab1_duct', 'ab2_duct', 'ab3_duct',
+        'a_loop_supply_splitter', 'a_loop_supply_mixer',
+        'a_loop Demand Side Splitter', 'a_loop Demand Side Mixer',
+        'z1DirectAir', 'z2DirectAir', 'z1', 'z2'])
+    assert 'db1_pipe' in components[1]
+    assert 'cd1_pipe' not in components[2]  # replaced by the chiller
+    # the chiller is in both loops, but not the nodes of the other loop
+    assert 'Central_Chiller' in components[1] & components[2]
+    nodes = set(node[0] for edge in result[1][1] for node in edge
+                if isinstance(node, tuple))
+    assert 'Central_Chiller_Chilled_Water_Inlet_Node_Name' in nodes
+    assert 'Central_Chiller_Condenser_Inlet_Node_Name' not in nodes
+    # the demand side inlet nodes in a NodeList
+    airloop = idf.idfobjects['AIRLOOPHVAC'][0]
+    idf.newidfobject('NODELIST', Name='a_loop inlets',
+                     Node_1_Name=airloop.Demand_Side_Inlet_Node_Names)
+    airloop.Demand_Side_Inlet_Node_Names = 'a_loop inlets'
+    result = loopedges(idf.model, idf.idd_info, edges)
+    assert set(comp for edge in result[0][1] for comp in edge
+               if not isinstance(comp, tuple)) == components[0]
+
+
 @pytest.mark.skipif(
     not do_integration_tests(), reason="$EPPY_INTEGRATION env var not set")
 def test_loopdiagram_integration():
@@ -0,0 +1,89 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for matchsurfaces.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+import eppy.matchsurfaces as matchsurfaces
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt = """
+BuildingSurface:Detailed, a1, Wall, Int, Z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 5,0,3, 5,0,0, 5,4,0, 5,4,3;
+BuildingSurface:Detailed, b1, Wall, Int, Z2, Outdoors, , SunExposed,
+    WindExposed, , 4, 5,4,0, 5,0,0, 5,0,3, 5,4,3;
+BuildingSurface:Detailed, a2, Floor, Int, Z1, Ground, , NoSun,
+    NoWind, , 4, 0,4,0, 5,4,0, 5,0,0, 0,0,0;
+Wall:Detailed, b2, Int, Z2, Outdoors, , SunExposed, WindExposed, , 4,
+    5.001,0,3, 5,4,3, 5,4,0, 5,0,0;
+BuildingSurface:Detailed, c1, Wall, Ext, Z3, Outdoors, , SunExposed,
+    WindExposed, , 4, 9,0,3, 9,0,0, 9,4,0, 9,4,3;
+BuildingSurface:Detailed, c2, Wall, Ext, Z3, Outdoors, , SunExposed,
+    WindExposed, , 4, 9,0,3, 9,0,0, 9,4,0, 9,4,3;
+"""
+
+
+def test_adjacentpairs():
+    """py.test for adjacentpairs"""
+    idf = IDF(StringIO(idftxt))
+    result = matchsurfaces.adjacentpairs(idf)
+    # c1 and c2 face the same way
+    assert [(s1.Name, s2.Name) for s1, s2 in result] == [('a1', 'b1')]
+    # b2 faces a1, but is off by 0.001
+    idf.removeidfobject(idf.getobject('BUILDINGSURFACE:DETAILED', 'b1'))
+    result = matchsurfaces.adjacentpairs(idf)
+    assert result == []
+    result = matchsurfaces.adjacentpairs(idf, places=1)
+    assert [(s1.Name, s2.Name) for s1, s2 in result] == [('a1', 'b2')]
+
+
+def test_matchsurfaces():
+    """py.test for matchsurfaces"""
+    idf = IDF(StringIO(idftxt))
+    result = matchsurfaces.matchsurfaces(idf)
+    assert result == [('a1', 'b1')]
+    surfaces = idf.idfobjects['BUILDINGSURFACE:DETAILED']
+    a1, b1 = surfaces[0], surfaces[1]
+    assert a1.Outside_Boundary_Condition == 'Surface'
+    assert a1.Outside_Boundary_Condition_Object == 'b1'
+    assert b1.Outside_Boundary_Condition_Object == 'a1'
+    assert (b1.Sun_Exposure, b1.Wind_Exposure) == ('NoSun', 'NoWind')
+    assert surfaces[2].Outside_Boundary_Condition == 'Ground'
+
+
+def test_relative():
+    """py.test for adjacentpairs with relative coordinates"""
+    idftxt = """
+    GlobalGeometryRules, UpperLeftCorner, Counterclockwise, Relative;
+    Zone, Z1, 0, 10, 0, 0;
+    Zone, Z2, 0, 15, 0, 0;
+    BuildingSurface:Detailed, a1, Wall, Int, Z1, Outdoors, , SunExposed,
+        WindExposed, , 4, 5,0,3, 5,0,0, 5,4,0, 5,4,3;
+    BuildingSurface:Detailed, b1, Wall, Int, Z2, Outdoors, , SunExposed,
+        WindExposed, , 4, 0,4,0, 0,0,0, 0,0,3, 0,4,3;
+    BuildingSurface:Detailed, c1, Wall, Int, Z2, Outdoors, , SunExposed,
+        WindExposed, , 4, 5,4,0, 5,0,0, 5,0,3, 5,4,3;
+    """
+    idf = IDF(StringIO(idftxt))
+    result = matchsurfaces.adjacentpairs(idf)
+    # c1 has the vertices of a1, but is 5 further along x
+    assert [(s1.Name, s2.Name) for s1, s2 in result] == [('a1', 'b1')]
+    # in world coordinates c1 faces a1
+    idf.idfobjects['GLOBALGEOMETRYRULES'][0].Coordinate_System = 'World'
+    result = matchsurfaces.adjacentpairs(idf)
+    assert [(s1.Name, s2.Name) for s1, s2 in result] == [('a1', 'c1')]
@@ -0,0 +1,62 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for mergesurfaces.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+import eppy.mergesurfaces as mergesurfaces
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt = """
+BuildingSurface:Detailed, w1, Wall, Ext, Z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 0,0,3, 0,0,0, 5,0,0, 5,0,3;
+BuildingSurface:Detailed, w2, Wall, Ext, Z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 5,0,3, 5,0,0, 10,0,0, 10,0,3;
+BuildingSurface:Detailed, w3, Wall, Int, Z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 10,0,3, 10,0,0, 15,0,0, 15,0,3;
+BuildingSurface:Detailed, w4, Wall, Ext, Z1, Surface, x1, NoSun,
+    NoWind, , 4, 20,0,3, 20,0,0, 25,0,0, 25,0,3;
+BuildingSurface:Detailed, w5, Wall, Ext, Z1, Surface, x2, NoSun,
+    NoWind, , 4, 25,0,3, 25,0,0, 30,0,0, 30,0,3;
+FenestrationSurface:Detailed, win2, Window, Glass, w2, , , , , 1, 4,
+    6,0,2, 6,0,1, 8,0,1, 8,0,2;
+"""
+
+
+def test_coplanargroups():
+    """py.test for coplanargroups"""
+    idf = IDF(StringIO(idftxt))
+    result = mergesurfaces.coplanargroups(idf)
+    assert [[surface.Name for surface in group] for group in result] == [
+        ['w1', 'w2']]
+
+
+def test_mergecoplanar():
+    """py.test for mergecoplanar"""
+    idf = IDF(StringIO(idftxt))
+    result = mergesurfaces.mergecoplanar(idf)
+    assert result == {'w1': ['w2']}
+    surfaces = idf.idfobjects['BUILDINGSURFACE:DETAILED']
+    assert [surface.Name for surface in surfaces] == ['w1', 'w3', 'w4', 'w5']
+    wall = surfaces[0]
+    assert wall.Number_of_Vertices == 4
+    assert wall.coords == [(0, 0, 3), (0, 0, 0), (10, 0, 0), (10, 0, 3)]
+    assert almostequal(wall.area, 30)
+    window = idf.idfobjects['FENESTRATIONSURFACE:DETAILED'][0]
+    assert window.Building_Surface_Name == 'w1'
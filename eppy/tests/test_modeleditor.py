@@ -621,3 +621,66 @@ def test_idd_index():
     idftxt = """"""
     idf = IDF(StringIO(idftxt))
     assert idf.idd_index == {}
+
+
+def test_zonesummary():
+    """py.test for zonesummary"""
+    idftxt = """Zone, z1;  Zone, z2;  Zone, z3;
+    BuildingSurface:Detailed, f1, Floor, , z1, Ground, , NoSun, NoWind, , 4,
+        0,4,0, 0,0,0, 5,0,0, 5,4,0;
+    BuildingSurface:Detailed, r1, Roof, , z1, Outdoors, , SunExposed,
+        WindExposed, , 4, 0,0,3, 0,4,3, 5,4,3, 5,0,3;
+    BuildingSurface:Detailed, w1, Wall, , z1, Outdoors, , SunExposed,
+        WindExposed, , 4, 0,0,3.5, 0,0,0, 5,0,0, 5,0,3.5;
+    BuildingSurface:Detailed, c2, Ceiling, , z2, Outdoors, , SunExposed,
+        WindExposed, , 4, 0,0,5, 0,2,5, 2,2,5, 2,0,5;
+    BuildingSurface:Detailed, w2, Wall, , z2, Outdoors, , SunExposed,
+        WindExposed, , 4, 0,0,5, 0,0,3, 2,0,3, 2,0,5;
+    """
+    idf = IDF(StringIO(idftxt))
+    result = modeleditor.zonesummary(idf)
+    assert sorted(result.keys()) == ['z1', 'z2', 'z3']
+    for zonename in ['z1', 'z2']:
+        summary = result[zonename]
+        area = modeleditor.zonearea(idf, zonename)
+        height = modeleditor.zoneheight(idf, zonename)
+        volume = modeleditor.zonevolume(idf, zonename)
+        assert almostequal(summary['area'], area)
+        assert almostequal(summary['height'], height)
+        assert almostequal(summary['volume'], volume)
+    assert almostequal(result['z1']['volume'], 60)  # floor to roof
+    assert almostequal(result['z2']['volume'], 8)  # lowest to highest
+    assert result['z3']['area'] == 0
+    assert result['z3']['height'] != result['z3']['height']  # nan
+
+
+def test_zonevolumes():
+    """py.test for zonevolumes"""
+    idftxt = """Zone, z1;  Zone, z2;
+    BuildingSurface:Detailed, f1, Floor, , z1, Ground, , NoSun, NoWind, , 4,
+        0,4,0, 4,4,0, 4,0,0, 0,0,0;
+    BuildingSurface:Detailed, r1, Roof, , z1, Outdoors, , SunExposed,
+        WindExposed, , 3, 0,0,3, 4,0,3, 0,4,5;
+    Wall:Detailed, w1, , z1, Outdoors, , SunExposed, WindExposed, , 4,
+        0,0,0, 4,0,0, 4,0,3, 0,0,3;
+    Wall:Detailed, w2, , z1, Outdoors, , SunExposed, WindExposed, , 4,
+        0,4,0, 0,0,0, 0,0,3, 0,4,5;
+    Wall:Detailed, w3, , z1, Outdoors, , SunExposed, WindExposed, , 3,
+        4,0,0, 4,4,0, 4,0,3;
+    RoofCeiling:Detailed, r2, , z1, Outdoors, , SunExposed, WindExposed, ,
+        3, 4,0,3, 4,4,0, 0,4,5;
+    Wall:Detailed, w4, , z1, Outdoors, , SunExposed, WindExposed, , 3,
+        4,4,0, 0,4,0, 0,4,5;
+    BuildingSurface:Detailed, f2, Floor, , z2, Ground, , NoSun, NoWind, , 4,
+        0,4,0, 4,4,0, 4,0,0, 0,0,0;
+    """
+    idf = IDF(StringIO(idftxt))
+    result = modeleditor.zonevolumes(idf)
+    # the top is two triangles of area 8. volume = area * mean height
+    answer = 8 * (3 + 3 + 5) / 3. + 8 * (3 + 0 + 5) / 3.
+    assert almostequal(result['z1'], answer)
+    assert result['z2'] != result['z2']  # not closed
+    # zones without surfaces
+    result = modeleditor.zonevolumes(IDF(StringIO("Zone, z1;")))
+    assert result['z1'] != result['z1']
+    assert modeleditor.zonevolumes(IDF(StringIO(""))) == {}
@@ -0,0 +1,75 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for readcsv.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+from eppy.results import readcsv
+from eppy.results import readhtml
+from eppy.tests.sample_html import sample_html as SAMPLE_HTML
+
+
+# the tables of SAMPLE_HTML written as eplustbl.csv
+SAMPLE_CSV = """Program Version:,EnergyPlus-Windows-32 8.1.0.008, YMD=2014.01.13 16:47
+Tabular Output Report in Format: ,Comma
+
+Building:,1050PageMillRoad
+Environment:,Mountain View Moffett Fld Nas CA USA TMY3 WMO#=745090
+Simulation Timestamp:,2014-01-13
+  16:47:19
+
+----------------------------------------------------------------------------------------------------
+REPORT:,Annual Building Utility Performance Summary
+FOR:,Entire Facility
+Timestamp: 2014-01-13
+    16:47:19
+Values gathered over      8760.00 hours
+
+Site and Source Energy
+
+,a,2
+,3,4
+
+Site to Source Energy Conversion Factors
+
+,b,6
+,7,8
+
+----------------------------------------------------------------------------------------------------
+REPORT:,COMPONENTS OF PEAK ELECTRICAL DEMAND
+FOR:,Meter
+Timestamp: 2014-01-13
+    16:47:19
+Custom Monthly Report
+
+,c,16
+,17,18
+
+----------------------------------------------------------------------------------------------------
+REPORT:,COMPONENTS OF PEAK NET ELECTRICAL DEMAND
+FOR:,Meter
+Timestamp: 2014-01-13
+    16:47:19
+Custom Monthly Report
+
+,d,26
+,27,28
+"""
+
+
+def test_titletable():
+    """py.test for titletable"""
+    for tofloat in (True, False):
+        result = readcsv.titletable(SAMPLE_CSV, tofloat)
+        assert result == readhtml.titletable(SAMPLE_HTML, tofloat)
+    result = readcsv.titletable(StringIO(",,x [m]\n,row,\"1,2\"\n,,\n"))
+    assert result == [('', [['', 'x [m]'], ['row', '1,2'], ['', '']])]
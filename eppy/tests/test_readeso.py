@@ -0,0 +1,147 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for readeso.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import os
+
+import eppy.results.readeso as readeso
+
+
+esotxt = """Program Version,EnergyPlus, Version 8.9.0-40101eaafd, YMD=2018.06.11 10:12
+1,5,Environment Title[],Latitude[deg],Longitude[deg],Time Zone[],Elevation[m]
+2,8,Day of Simulation[],Month[],Day of Month[],DST Indicator[1=yes 0=no],Hour[],StartMinute[],EndMinute[],DayType
+3,5,Cumulative Day of Simulation[],Month[],Day of Month[],DST Indicator[1=yes 0=no],DayType  ! When Daily Report Variables Requested
+4,2,Cumulative Days of Simulation[],Month[]  ! When Monthly Report Variables Requested
+5,1,Cumulative Days of Simulation[] ! When Run Period Report Variables Requested
+7,1,Environment,Site Outdoor Air Drybulb Temperature [C] !Hourly
+8,1,ZONE ONE,Zone Mean Air Temperature [C] !Hourly
+9,7,ZONE ONE,Zone Mean Air Temperature [C] !Daily [Value,Min,Hour,Minute,Max,Hour,Minute]
+10,1,Electricity:Facility [J] !Hourly
+11,1,ZONE ONE,Zone Air System Sensible Heating Rate [W] !Each Call
+End of Data Dictionary
+1,DENVER DESIGN DAY, 39.74,-105.18, -7.00,1829.00
+2,1, 1,21, 0, 1, 0.00,60.00,SummerDesignDay
+7,20.5
+8,22.0
+10,1000.0
+11,250.0
+2,1, 1,21, 0, 2, 0.00,60.00,SummerDesignDay
+7,19.5
+8,21.5
+10,1100.0
+3,1, 1,21, 0,SummerDesignDay
+9,21.75,21.5, 2,60,22.0, 1,60
+1,DENVER RUN PERIOD, 39.74,-105.18, -7.00,1829.00
+2,1, 1, 1, 0, 1, 0.00,60.00,Sunday
+7,-2.0
+8,18.0
+10,900.0
+2,1, 1, 1, 0, 2, 0.00,60.00,Sunday
+7,-3.0
+8,17.0
+10,950.0
+2,1, 1, 1, 0, 3, 0.00,60.00,Sunday
+7,-4.0
+8,16.0
+10,800.0
+3,1, 1, 1, 0,Sunday
+9,17.0,16.0, 3,60,18.0, 1,60
+End of Data
+ Number of Records Written=         30
+"""
+
+
+def writeeso(tmpdir):
+    """write the sample eso file and return its name"""
+    fname = os.path.join('%s' % (tmpdir, ), 'eplusout.eso')
+    with io.open(fname, 'w', encoding='latin-1') as fhandle:
+        fhandle.write(esotxt)
+    return fname
+
+
+def test_datadictionary():
+    """py.test for datadictionary"""
+    variables, timestamps = readeso.datadictionary(io.StringIO(esotxt))
+    assert list(variables.keys()) == [7, 8, 9, 10, 11]
+    assert variables[8] == readeso.Variable(
+        8, 'ZONE ONE', 'Zone Mean Air Temperature', 'C', 'Hourly', 1)
+    assert variables[9].frequency == 'Daily'
+    assert variables[9].nvalues == 7
+    assert variables[10] == readeso.Variable(
+        10, '', 'Electricity:Facility', 'J', 'Hourly', 1)
+    assert variables[11].frequency == 'Each Call'
+    assert sorted(timestamps.keys()) == [2, 3, 4, 5]
+    assert len(timestamps[2]) == 7
+    assert len(timestamps[3]) == 4
+    assert timestamps[5] == ['Cumulative Days of Simulation[]']
+
+
+def test_findvariables():
+    """py.test for findvariables"""
+    variables, timestamps = readeso.datadictionary(io.StringIO(esotxt))
+    data = (
+        (dict(name='zone mean air temperature'), [8, 9]),
+        # kwargs, ids
+        (dict(name='Zone Mean Air Temperature', frequency='hourly'), [8]),
+        (dict(key='zone one'), [8, 9, 11]),
+        (dict(frequency='each call'), [11]),
+        (dict(key='Environment'), [7]),
+        (dict(name='Not There'), []),
+    )
+    for kwargs, ids in data:
+        assert readeso.findvariables(variables, **kwargs) == ids
+    assert readeso.timestampid(variables[9]) == 3
+    assert readeso.timestampid(variables[11]) == 2
+
+
+def test_environments(tmpdir):
+    """py.test for environments"""
+    fname = writeeso(tmpdir)
+    result = readeso.environments(fname)
+    assert result == ['DENVER DESIGN DAY', 'DENVER RUN PERIOD']
+
+
+def test_readvalues(tmpdir):
+    """py.test for readvalues"""
+    fname = writeeso(tmpdir)
+    for cache in (False, True):
+        result = readeso.readvalues(fname, [7, 10], cache=cache)
+        assert result[7].tolist() == [20.5, 19.5, -2.0, -3.0, -4.0]
+        assert result[10].tolist() == [1000.0, 1100.0, 900.0, 950.0, 800.0]
+        result = readeso.readvalues(fname, [11], cache=cache)
+        assert result[11].tolist() == [250.0]
+        result = readeso.readvalues(fname, [8, 2, 9],
+                                    environment='denver run period',
+                                    cache=cache)
+        assert result[8].tolist() == [18.0, 17.0, 16.0]
+        assert result[2].shape == (3, 7)
+        assert result[2][:, 4].tolist() == [1, 2, 3]
+        assert result[9].tolist() == [17.0]
+        result = readeso.readvalues(fname, [9], environment=0,
+                                    allcolumns=True, cache=cache)
+        assert result[9].tolist() == [[21.75, 21.5, 2, 60, 22.0, 1, 60]]
+    assert os.path.isfile(os.path.join(readeso.esocache(fname),
+                                       readeso.CACHEINDEX))
+
+
+def test_sametitle(tmpdir):
+    """py.test for readvalues of environments with the same title"""
+    fname = os.path.join('%s' % (tmpdir, ), 'eplusout.eso')
+    with io.open(fname, 'w', encoding='latin-1') as fhandle:
+        fhandle.write(esotxt.replace('DENVER RUN PERIOD', 'DENVER DESIGN DAY'))
+    for cache in (False, True):
+        result = readeso.readvalues(fname, [7, 9],
+                                    environment='denver design day',
+                                    cache=cache)
+        assert result[7].tolist() == [20.5, 19.5, -2.0, -3.0, -4.0]
+        assert result[9].tolist() == [21.75, 17.0]
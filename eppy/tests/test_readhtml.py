@@ -12,6 +12,8 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import collections
+from io import BytesIO
+
 from bs4 import BeautifulSoup
 import eppy.results.readhtml as readhtml
 from eppy.tests.sample_html import sample_html as SAMPLE_HTML
@@ -126,6 +128,23 @@ def test_gettables():
             assert title1 == title2
             assert rows1 == rows2
         assert result == titlerows
+        # the BeautifulSoup tree version gives the same result
+        result = readhtml._titletable(SAMPLE_HTML, tofloat=tofloat)
+        assert result == titlerows
+
+def test_binaryhandle():
+    """py.test for titletable and lines_table with a binary file handle"""
+    result = readhtml.titletable(BytesIO(SAMPLE_HTML.encode('utf-8')))
+    assert result == readhtml.titletable(SAMPLE_HTML)
+    # the control character is read by BeautifulSoup, from the same text
+    html_doc = SAMPLE_HTML.replace('<td>a</td>', '<td>a\x01</td>')
+    result = readhtml.titletable(BytesIO(html_doc.encode('utf-8')))
+    assert result[0] == ('Site and Source Energy',
+                         [['a\x01', 2], [3, 4]])
+    assert len(result) == 4
+    result = readhtml.lines_table(BytesIO(html_doc.encode('utf-8')))
+    assert result[0][1] == [['a\x01', 2], [3, 4]]
+    assert len(result) == 4
 
 def test_has_name():
     """py.test for has_name"""
@@ -142,8 +161,7 @@ def test_has_name():
 def test_lines_table():
     """py.test for lines_table"""
     # soup = BeautifulSoup(SAMPLE_HTML)
-    result = readhtml.lines_table(SAMPLE_HTML, False)
-    assert result == [
+    expected = [
         [
             [
                 'Table of Contents',
@@ -176,6 +194,11 @@ def test_lines_table():
             ],
             [['d', '26'], ['27', '28']]
         ]]
+    result = readhtml.lines_table(SAMPLE_HTML, False)
+    assert result == expected
+    # the BeautifulSoup tree version gives the same result
+    result = readhtml._lines_table(SAMPLE_HTML, False)
+    assert result == expected
 
 def test_make_ntgrid():
     """py.test make_ntgrid"""
@@ -190,4 +213,73 @@ def test_make_ntgrid():
     assert result == ntcol(
         x_y=ntrow(a_b=1, b_c=2, c_d=3),
         y_z=ntrow(a_b=4, b_c=5, c_d=6),
-        z_z=ntrow(a_b=7, b_c=8, c_d=9))
\ No newline at end of file
+        z_z=ntrow(a_b=7, b_c=8, c_d=9))
+
+
+def test_select_tables():
+    """py.test for select_tables"""
+    thedata = (
+        (
+            dict(titles=['site to source energy conversion factors']),
+            [('Site to Source Energy Conversion Factors',
+              [['b', 6], [7, 8]])]
+        ), # kwargs, titlerows
+        (
+            dict(titles=['Custom Monthly Report']),
+            [('Custom Monthly Report', [['c', 16], [17, 18]])]
+        ), # kwargs, titlerows
+        (
+            dict(titles=['Custom Monthly Report'], firstmatch=False),
+            [('Custom Monthly Report', [['c', 16], [17, 18]]),
+             ('Custom Monthly Report', [['d', 26], [27, 28]])]
+        ), # kwargs, titlerows
+        (
+            dict(titles=['Custom Monthly Report'],
+                 reports=['ComponentsOfPeakNetElectricalDemand']),
+            [('Custom Monthly Report', [['d', 26], [27, 28]])]
+        ), # kwargs, titlerows
+        (
+            dict(reports=['Annual Building Utility Performance Summary'],
+                 tofloat=False),
+            [('Site and Source Energy', [['a', '2'], ['3', '4']]),
+             ('Site to Source Energy Conversion Factors',
+              [['b', '6'], ['7', '8']])]
+        ), # kwargs, titlerows
+        (
+            dict(titles=['Not There']),
+            []
+        ), # kwargs, titlerows
+    )
+    for kwargs, titlerows in thedata:
+        result = readhtml.select_tables(SAMPLE_HTML, **kwargs)
+        assert result == titlerows
+
+def test_grid():
+    """py.test for Grid, grid_h and grid_v"""
+    table = [
+    ["",  "a b", "b c", "c d"],
+    ["x y", 1,     2,     3 ],
+    ["y z", 4,     5,     6 ],
+    ["z z", 7,     8,     'eight' ],]
+    h_grid = readhtml.grid_h(table)
+    assert h_grid['x y', 'c d'] == 3
+    assert h_grid['x_y', 'c_d'] == 3
+    assert h_grid[0, 2] == 3
+    assert h_grid['y z'] == [4, 5, 6]
+    assert h_grid.column('b c') == [2, 5, 8]
+    assert h_grid.rowlabels == ['x y', 'y z', 'z z']
+    assert h_grid.columnlabels == ['a b', 'b c', 'c d']
+    v_grid = readhtml.grid_v(table)
+    assert v_grid['c d', 'x y'] == 3
+    assert v_grid['a b'] == [1, 4, 7]
+    assert len(v_grid) == 3
+    named = readhtml.named_grid_h(table)
+    for rowlabel in h_grid.rowlabels:
+        for columnlabel in h_grid.columnlabels:
+            assert h_grid[rowlabel, columnlabel] == getattr(
+                getattr(named, readhtml._nospace(rowlabel)),
+                readhtml._nospace(columnlabel))
+    result = h_grid.asarray()
+    assert result.shape == (3, 3)
+    assert result[1].tolist() == [4, 5, 6]
+    assert result[2, 2] != result[2, 2]  # nan
@@ -0,0 +1,163 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for readsql.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import os
+import sqlite3
+
+import pytest
+
+import eppy.results.readsql as readsql
+
+
+def makesql(fname, eui=17.93):
+    """make a small sqlite file with the tables that EnergyPlus writes"""
+    conn = sqlite3.connect(fname)
+    conn.executescript("""
+    CREATE TABLE TabularDataWithStrings (TabularDataIndex INTEGER,
+        Value TEXT, ReportName TEXT, ReportForString TEXT, TableName TEXT,
+        RowName TEXT, ColumnName TEXT, Units TEXT);
+    CREATE TABLE ReportDataDictionary (ReportDataDictionaryIndex INTEGER,
+        IsMeter INTEGER, Type TEXT, IndexGroup TEXT, TimestepType TEXT,
+        KeyValue TEXT, Name TEXT, ReportingFrequency TEXT,
+        ScheduleName TEXT, Units TEXT);
+    CREATE TABLE ReportData (ReportDataIndex INTEGER, TimeIndex INTEGER,
+        ReportDataDictionaryIndex INTEGER, Value REAL);
+    CREATE TABLE Time (TimeIndex INTEGER, Year INTEGER, Month INTEGER,
+        Day INTEGER, Hour INTEGER, Minute INTEGER, Dst INTEGER,
+        Interval INTEGER, IntervalType INTEGER, SimulationDays INTEGER,
+        DayType TEXT, EnvironmentPeriodIndex INTEGER, WarmupFlag INTEGER);
+    CREATE TABLE EnvironmentPeriods (EnvironmentPeriodIndex INTEGER,
+        SimulationIndex INTEGER, EnvironmentName TEXT,
+        EnvironmentType INTEGER);
+    """)
+    conn.executemany(
+        "INSERT INTO TabularDataWithStrings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(1, '       %s' % (eui, ), 'AnnualBuildingUtilityPerformanceSummary',
+          'Entire Facility', 'Site and Source Energy', 'Total Site Energy',
+          'Energy Per Total Building Area', 'MJ/m2'),
+         (2, 'Chicago Ohare Intl Ap', 'AnnualBuildingUtilityPerformanceSummary',
+          'Entire Facility', 'General', 'Weather File', '', ''), ])
+    conn.executemany(
+        "INSERT INTO ReportDataDictionary VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(7, 0, 'Avg', 'Zone', 'HVAC System', 'Environment',
+          'Site Outdoor Air Drybulb Temperature', 'Hourly', '', 'C'),
+         (13, 1, 'Sum', 'Facility:Electricity', 'HVAC System', None,
+          'Electricity:Facility', 'Hourly', '', 'J'), ])
+    conn.executemany(
+        "INSERT INTO EnvironmentPeriods VALUES (?, ?, ?, ?)",
+        [(1, 1, 'SUMMER DAY', 1), (2, 1, 'RUN PERIOD 1', 3)])
+    times = [(1, 7, 21, 1, 0, 1), (2, 7, 21, 2, 0, 1),
+             (3, 1, 1, 1, 0, 2), (4, 1, 1, 2, 0, 2), (5, 1, 1, 3, 0, 2)]
+    conn.executemany(
+        "INSERT INTO Time VALUES (?, 2018, ?, ?, ?, ?, 0, 60, 1, 1, "
+        "'Monday', ?, 0)", times)
+    data = [(7, 30.0), (7, 29.0), (7, -2.0), (7, -3.0), (7, -4.0)]
+    rows = []
+    for timeindex, (reportid, value) in enumerate(data, 1):
+        rows.append((len(rows) + 1, timeindex, reportid, value))
+        rows.append((len(rows) + 1, timeindex, 13, value * 100))
+    conn.executemany("INSERT INTO ReportData VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return fname
+
+
+def test_tabulardata(tmpdir):
+    """py.test for tabulardata and tablevalue"""
+    fname = makesql(os.path.join('%s' % (tmpdir, ), 'eplusout.sql'))
+    conn = readsql.connect(fname)
+    rows = readsql.tabulardata(conn, tablename='site and source energy')
+    assert rows == [('AnnualBuildingUtilityPerformanceSummary',
+                     'Entire Facility', 'Site and Source Energy',
+                     'Total Site Energy', 'Energy Per Total Building Area',
+                     'MJ/m2', 17.93)]
+    assert len(readsql.tabulardata(conn)) == 2
+    result = readsql.tablevalue(
+        conn, 'AnnualBuildingUtilityPerformanceSummary', 'Entire Facility',
+        'General', 'Weather File', '')
+    assert result == 'Chicago Ohare Intl Ap'
+    result = readsql.tablevalue(
+        conn, 'AnnualBuildingUtilityPerformanceSummary', 'Entire Facility',
+        'General', 'Not There', '')
+    assert result is None
+    # read-only
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM ReportData")
+    conn.close()
+    with pytest.raises(IOError):
+        readsql.connect(os.path.join('%s' % (tmpdir, ), 'notthere.sql'))
+
+
+def test_timeseries(tmpdir):
+    """py.test for variables, timeseries and timestamps"""
+    fname = makesql(os.path.join('%s' % (tmpdir, ), 'eplusout.sql'))
+    conn = readsql.connect(fname)
+    assert readsql.variables(conn, name='electricity:facility') == [
+        (13, '', 'Electricity:Facility', 'Hourly', 'J')]
+    assert [row[0] for row in readsql.variables(conn, frequency='Hourly')
+            ] == [7, 13]
+    result = readsql.timeseries(conn, [7, 13])
+    assert result[7].tolist() == [30.0, 29.0, -2.0, -3.0, -4.0]
+    assert result[13].tolist() == [3000.0, 2900.0, -200.0, -300.0, -400.0]
+    result = readsql.timeseries(conn, [7], environment='run period 1')
+    assert result[7].tolist() == [-2.0, -3.0, -4.0]
+    result = readsql.timestamps(conn, 7, environment='summer day')
+    assert result.tolist() == [[7, 21, 1, 0], [7, 21, 2, 0]]
+    conn.close()
+
+
+def test_chunks(tmpdir, monkeypatch):
+    """py.test for timeseries and extractmetrics with the ids or tables in
+    many queries"""
+    fname = makesql(os.path.join('%s' % (tmpdir, ), 'eplusout.sql'))
+    monkeypatch.setattr(readsql, 'MAXPARAMETERS', 1)
+    conn = readsql.connect(fname)
+    result = readsql.timeseries(conn, [13, 99, 7],
+                                environment='run period 1')
+    assert result[7].tolist() == [-2.0, -3.0, -4.0]
+    assert result[13].tolist() == [-200.0, -300.0, -400.0]
+    assert result[99].tolist() == []
+    conn.close()
+    metrics = [('AnnualBuildingUtilityPerformanceSummary', 'Entire Facility',
+                'Site and Source Energy', 'Total Site Energy',
+                'Energy Per Total Building Area'),
+               ('AnnualBuildingUtilityPerformanceSummary', 'Entire Facility',
+                'general', 'Weather File', '')]
+    values, failed = readsql.extractmetrics([fname], metrics)
+    assert values[0, 0] == 17.93
+    assert values[0, 1] != values[0, 1]  # not a number
+    assert failed == []
+
+
+def test_extractmetrics(tmpdir):
+    """py.test for extractmetrics"""
+    paths = []
+    for i, eui in enumerate([10.0, 20.0]):
+        rundir = os.path.join('%s' % (tmpdir, ), 'run%s' % (i, ))
+        os.mkdir(rundir)
+        makesql(os.path.join(rundir, readsql.SQLNAME), eui)
+        paths.append(rundir)
+    paths.append(os.path.join('%s' % (tmpdir, ), 'missing'))
+    metrics = [
+        ('AnnualBuildingUtilityPerformanceSummary', 'Entire Facility',
+         'Site and Source Energy', 'Total Site Energy',
+         'Energy Per Total Building Area'),
+        ('AnnualBuildingUtilityPerformanceSummary', 'Entire Facility',
+         'General', 'Weather File', ''), ]
+    values, failed = readsql.extractmetrics(paths, metrics)
+    assert values.shape == (3, 2)
+    assert values[:2, 0].tolist() == [10.0, 20.0]
+    assert math.isnan(values[0, 1])  # not a number
+    assert all(math.isnan(value) for value in values[2])
+    assert [path for path, error in failed] == [paths[2]]
@@ -0,0 +1,109 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for runner/screening.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+from six import StringIO
+
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+from eppy.runner import screening
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt = """
+SimulationControl, No, No, No, Yes, Yes;
+RunPeriod, Annual, 1, 1, 12, 31, Sunday, Yes, Yes, No, Yes, Yes;
+SizingPeriod:DesignDay, Summer Design Day, 7, 21, SummerDesignDay;
+"""
+
+
+def test_perioddays():
+    """py.test for perioddays and annualfactor"""
+    data = (
+        ([('a', 1, 1, 12, 31)], 365),  # periods, days
+        (screening.SEASONAL_WEEKS, 28),  # periods, days
+        ([('a', 12, 25, 1, 7)], 14),  # periods, days
+    )
+    for periods, days in data:
+        assert screening.perioddays(periods) == days
+        assert almostequal(screening.annualfactor(periods), 365 / days)
+
+
+def test_runperiodvariant():
+    """py.test for runperiodvariant"""
+    idf = IDF(StringIO(idftxt))
+    idf.epw = 'weather.epw'
+    variant = screening.runperiodvariant(idf)
+    runperiods = variant.idfobjects['RUNPERIOD']
+    assert len(runperiods) == 4
+    for runperiod, period in zip(runperiods, screening.SEASONAL_WEEKS):
+        assert runperiod.Name == period[0]
+        assert runperiod.Begin_Month == period[1]
+        assert runperiod.End_Day_of_Month == period[4]
+        # other settings come from the original RunPeriod
+        assert runperiod.Day_of_Week_for_Start_Day == 'Sunday'
+    control = variant.idfobjects['SIMULATIONCONTROL'][0]
+    assert control.Run_Simulation_for_Weather_File_Run_Periods == 'Yes'
+    assert variant.epw == 'weather.epw'
+    # the original is unchanged
+    assert len(idf.idfobjects['RUNPERIOD']) == 1
+    assert idf.idfobjects['RUNPERIOD'][0].Name == 'Annual'
+
+
+def test_designdayvariant():
+    """py.test for designdayvariant"""
+    idf = IDF(StringIO(idftxt))
+    variant = screening.designdayvariant(idf)
+    assert len(variant.idfobjects['RUNPERIOD']) == 0
+    control = variant.idfobjects['SIMULATIONCONTROL'][0]
+    assert control.Run_Simulation_for_Sizing_Periods == 'Yes'
+    assert control.Run_Simulation_for_Weather_File_Run_Periods == 'No'
+    assert len(idf.idfobjects['RUNPERIOD']) == 1
+    # no design days in the idf
+    idf = IDF(StringIO("RunPeriod, Annual, 1, 1, 12, 31;"))
+    with pytest.raises(ValueError):
+        screening.designdayvariant(idf)
+
+
+def test_screeningjobs():
+    """py.test for screeningjobs"""
+    idfs = [IDF(StringIO(idftxt)), IDF(StringIO(idftxt))]
+    jobs = screening.screeningjobs(idfs, output_directory='out')
+    assert len(jobs) == 2
+    for variant, kwargs in jobs:
+        assert len(variant.idfobjects['RUNPERIOD']) == 4
+        assert kwargs == {'output_directory': 'out'}
+    jobs = screening.screeningjobs(idfs, designdays=True)
+    for variant, kwargs in jobs:
+        assert len(variant.idfobjects['RUNPERIOD']) == 0
+
+
+def test_extrapolate():
+    """py.test for extrapolate"""
+    titletables = [
+        ('End Uses', [['', 'Electricity'], ['Heating', 2.0], ['Fans', 'x']]),
+        ('Peak', [['', 'Electricity'], ['Heating', 2.0]]),
+    ]
+    result = screening.extrapolate(titletables, 10, titles=['End Uses'])
+    assert result == [
+        ('End Uses', [['', 'Electricity'], ['Heating', 20.0], ['Fans', 'x']]),
+        ('Peak', [['', 'Electricity'], ['Heating', 2.0]]),
+    ]
+    result = screening.extrapolate(titletables, 10)
+    assert result[1] == ('Peak', [['', 'Electricity'], ['Heating', 20.0]])
+    # the input is not modified
+    assert titletables[0][1][1] == ['Heating', 2.0]
@@ -0,0 +1,119 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for surfacearrays.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+from eppy.geometry import surface
+from eppy.geometry import surfacearrays
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+POLYS = [
+    [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+    [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],
+    [(0, 0, 3), (0, 0, 0), (5, 0, 0), (5, 0, 3)],
+    [(5, 0, 3), (5, 0, 0), (5, 4, 0), (5, 4, 3)],
+    [(0, 4, 3), (0, 4, 0), (0, 0, 0)],
+    [(5, 4, 3), (5, 4, 0), (0, 4, 0), (0, 4, 3)],
+    [(0, 0, 0), (0, 1, 0), (0, 2, 0), (0, 3, 0)],
+    [(0, 0, 0), (4, 0, 0), (4, 2, 0), (2, 2, 0), (2, 4, 0), (0, 4, 0)],
+    [
+        (-4.611479, 6.729214, -0.332978),
+        (-0.694944, 4.990984, 2.243709),
+        (-2.147088, 0.302854, 1.288344),
+        (-6.063622, 2.041084, -1.288344)
+    ],
+    [(0, 0, 3), (1, 0, 3)],
+]
+
+
+def test_packcoords():
+    """py.test for packcoords"""
+    vertices, nvertices = surfacearrays.packcoords(
+        [[(1, 2, 3), (4, 5, 6), (7, 8, 9)],
+         [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]])
+    assert vertices.shape == (2, 4, 3)
+    assert nvertices.tolist() == [3, 4]
+    assert vertices[0, 3].tolist() == [1, 2, 3]  # padded with the first
+
+
+def test_geometry_of_polys():
+    """py.test for the arrays against surface.py"""
+    vertices, nvertices = surfacearrays.packcoords(POLYS)
+    normals = surfacearrays.unitnormals(vertices)
+    result = zip(POLYS, surfacearrays.areas(vertices),
+                 surfacearrays.azimuths(normals),
+                 surfacearrays.tilts(normals),
+                 surfacearrays.widths(vertices, nvertices),
+                 surfacearrays.heights(vertices, nvertices))
+    for poly, area, azimuth, tilt, width, height in result:
+        assert almostequal(area, surface.area(poly), places=4)
+        if len(poly) > 2 and area > 0:
+            assert almostequal(azimuth, surface.azimuth(poly), places=4)
+            assert almostequal(tilt, surface.tilt(poly), places=4)
+        assert almostequal(width, surface.width(poly), places=4)
+        assert almostequal(height, surface.height(poly), places=4)
+
+
+def test_unitnormals():
+    """py.test for unitnormals"""
+    data = (
+        ([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], (0, 0, 1)),
+        # poly, normal
+        ([(0, 0, 0), (1, 0, 0), (2, 0, 0)], (0, 0, 0)),
+        # the first three points are in a line
+        ([(0, 0, 0), (1, 0, 0), (2, 0, 0), (2, 0, 1), (0, 0, 1)], (0, -1, 0)),
+    )
+    vertices, _nvertices = surfacearrays.packcoords(
+        [poly for poly, _normal in data])
+    result = surfacearrays.unitnormals(vertices)
+    for (_poly, normal), found in zip(data, result):
+        for value, foundvalue in zip(normal, found):
+            assert almostequal(value, foundvalue)
+
+
+idftxt = """
+BuildingSurface:Detailed, w1, Wall, Ext, Z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 0,0,3, 0,0,0, 5,0,0, 5,0,3;
+BuildingSurface:Detailed, f1, Floor, Ext, Z1, Ground, , NoSun,
+    NoWind, , 3, 0,0,0, 0,4,0, 5,0,0;
+FenestrationSurface:Detailed, win1, Window, Glass, w1, , , , , 1, 4,
+    1,0,2, 1,0,1, 3,0,1, 3,0,2;
+Shading:Site:Detailed, s1, , 4, 0,-1,3, 0,-1,0, 0,-3,0, 0,-3,3;
+"""
+
+
+def test_idfgeometry():
+    """py.test for idfgeometry"""
+    idf = IDF(StringIO(idftxt))
+    result = surfacearrays.idfgeometry(idf)
+    assert [bunch.Name for bunch in result.surfaces] == [
+        'w1', 'f1', 'win1', 's1']
+    assert result.nvertices.tolist() == [4, 3, 4, 4]
+    for bunch, area, azimuth, tilt, width, height in zip(
+            result.surfaces, result.area, result.azimuth, result.tilt,
+            result.width, result.height):
+        assert almostequal(area, bunch.area)
+        assert almostequal(azimuth, bunch.azimuth)
+        assert almostequal(tilt, bunch.tilt)
+        assert almostequal(width, bunch.width)
+        assert almostequal(height, bunch.height)
+    result = surfacearrays.idfgeometry(idf, keys=['Shading:Site:Detailed'])
+    assert [bunch.Name for bunch in result.surfaces] == ['s1']
+    assert almostequal(result.azimuth[0], 270)
@@ -15,6 +15,7 @@ import warnings
 
 from six import StringIO
 
+from eppy.constructions import thermal_properties
 from eppy.constructions.thermal_properties import INSIDE_FILM_R
 from eppy.constructions.thermal_properties import OUTSIDE_FILM_R
 from eppy.iddcurrent import iddcurrent
@@ -411,3 +412,36 @@ class Test_ThermalProperties(object):
         expected = (m.Thickness * m.Specific_Heat * m.Density * 0.001)
         assert m.heatcapacity == expected
         assert m.heatcapacity == 120
+
+    def test_rvalue_material_changed(self):
+        self.idf.initreadtxt(double_layer)
+        c = self.idf.getobject('CONSTRUCTION', 'TestConstruction')
+        m = self.idf.getobject('MATERIAL', 'TestMaterial')
+        assert c.rvalue == 0.55
+        m.Thickness = 0.2
+        assert almostequal(c.rvalue, 0.95)
+        assert almostequal(c.heatcapacity, 480)
+
+    def test_constructionproperties(self):
+        self.idf.initreadtxt(double_layer + no_mass.replace(
+            'TestConstruction', 'NoMassConstruction') + """
+  Construction,
+    MissingConstruction,     !- Name
+    Missing;                 !- Outside Layer
+    """)
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("always")
+            result = thermal_properties.constructionproperties(self.idf)
+        assert sorted(result.keys()) == [
+            'MissingConstruction', 'NoMassConstruction', 'TestConstruction']
+        values = result['TestConstruction']
+        c = self.idf.getobject('CONSTRUCTION', 'TestConstruction')
+        assert values['rvalue'] == c.rvalue
+        assert values['ufactor'] == c.ufactor
+        assert values['ufactor_ip'] == c.ufactor_ip
+        assert values['rvalue_ip'] == c.rvalue_ip
+        assert values['heatcapacity'] == c.heatcapacity
+        assert almostequal(result['NoMassConstruction']['rvalue'], 0.65)
+        values = result['MissingConstruction']
+        assert values['rvalue'] != values['rvalue']  # nan
+        assert values['ufactor'] != values['ufactor']
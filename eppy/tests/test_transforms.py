@@ -0,0 +1,151 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for transforms.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import numpy as np
+from six import StringIO
+
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+import eppy.transforms as transforms
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt = """
+GlobalGeometryRules, UpperLeftCorner, Counterclockwise, World;
+Zone, z1, 0, 0, 1, 2;
+BuildingSurface:Detailed, w1, Wall, Ext, z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 0,0,3, 0,0,0, 5,0,0, 5,0,3;
+FenestrationSurface:Detailed, win1, Window, Glass, w1, , , , , 1, 3,
+    1,0,2, 1,0,1, 3,0,1;
+Shading:Site:Detailed, s1, , 3, 0,-1,3, 0,-1,0, 0,-3,0;
+"""
+
+
+def coords(idf):
+    """the coordinates of the surfaces, rounded"""
+    keys = ['BUILDINGSURFACE:DETAILED', 'FENESTRATIONSURFACE:DETAILED',
+            'SHADING:SITE:DETAILED']
+    return [[tuple(round(value, 6) + 0 for value in pnt) for pnt in s.coords]
+            for key in keys for s in idf.idfobjects[key]]
+
+
+def origin(idf):
+    """the origin of the first zone, rounded"""
+    zone = idf.idfobjects['ZONE'][0]
+    return tuple(round(value, 6) + 0
+                 for value in (zone.X_Origin, zone.Y_Origin, zone.Z_Origin))
+
+
+def test_translate():
+    """py.test for translate"""
+    idf = IDF(StringIO(idftxt))
+    result = transforms.translate(idf, (10, 20, 0))
+    assert result == 3
+    assert coords(idf) == [
+        [(10, 20, 3), (10, 20, 0), (15, 20, 0), (15, 20, 3)],
+        [(11, 20, 2), (11, 20, 1), (13, 20, 1)],
+        [(10, 19, 3), (10, 19, 0), (10, 17, 0)]]
+    assert origin(idf) == (10, 21, 2)
+
+
+def test_rotate():
+    """py.test for rotate"""
+    idf = IDF(StringIO(idftxt))
+    wall = idf.idfobjects['BUILDINGSURFACE:DETAILED'][0]
+    assert almostequal(wall.azimuth, 180)
+    transforms.rotate(idf, 90)
+    assert coords(idf)[0] == [(0, 0, 3), (0, 0, 0), (0, 5, 0), (0, 5, 3)]
+    assert almostequal(wall.azimuth, 90)  # anticlockwise
+    transforms.rotate(idf, 90, center=(0, 5, 0))
+    assert coords(idf)[0] == [(5, 5, 3), (5, 5, 0), (0, 5, 0), (0, 5, 3)]
+
+
+def test_scale():
+    """py.test for scale"""
+    idf = IDF(StringIO(idftxt))
+    transforms.scale(idf, 2)
+    assert coords(idf)[0] == [(0, 0, 6), (0, 0, 0), (10, 0, 0), (10, 0, 6)]
+    transforms.scale(idf, (0.5, 1, 0.5), center=(10, 0, 0))
+    assert coords(idf)[0] == [(5, 0, 3), (5, 0, 0), (10, 0, 0), (10, 0, 3)]
+    assert origin(idf) == (5, 2, 2)
+
+
+def test_mirror():
+    """py.test for mirror"""
+    idf = IDF(StringIO(idftxt))
+    wall = idf.idfobjects['BUILDINGSURFACE:DETAILED'][0]
+    transforms.mirror(idf)
+    # the order is reversed after the first vertex. still faces south
+    assert coords(idf)[0] == [(0, 0, 3), (-5, 0, 3), (-5, 0, 0), (0, 0, 0)]
+    assert almostequal(wall.azimuth, 180)
+    assert almostequal(wall.area, 15)
+    transforms.mirror(idf, normal=(0, 1, 0), point=(0, 1, 0))
+    assert coords(idf)[0] == [(0, 2, 3), (0, 2, 0), (-5, 2, 0), (-5, 2, 3)]
+    assert almostequal(wall.azimuth, 0)
+
+
+def test_relative():
+    """py.test for transforms with relative coordinates"""
+    idf = IDF(StringIO(idftxt.replace('World', 'Relative')))
+    assert transforms.isrelative(idf)
+    transforms.translate(idf, (10, 20, 0))
+    assert origin(idf) == (10, 21, 2)
+    assert coords(idf)[0] == [(0, 0, 3), (0, 0, 0), (5, 0, 0), (5, 0, 3)]
+    assert coords(idf)[2] == [(10, 19, 3), (10, 19, 0), (10, 17, 0)]
+    transforms.rotate(idf, 180, center=(10, 21, 0))
+    assert origin(idf) == (10, 21, 2)
+    assert coords(idf)[0] == [(0, 0, 3), (0, 0, 0), (-5, 0, 0), (-5, 0, 3)]
+
+
+def worldcoords(idf):
+    """the world coordinates of the surfaces of a relative idf"""
+    zone = idf.idfobjects['ZONE'][0]
+    matrix = transforms.northmatrix(float(zone.Direction_of_Relative_North))
+    zoneorigin = np.array(
+        [zone[field] for field in transforms.ORIGINFIELDS], dtype=float)
+    keys = ['BUILDINGSURFACE:DETAILED', 'FENESTRATIONSURFACE:DETAILED']
+    return [[matrix.dot(pnt) + zoneorigin for pnt in s.coords]
+            for key in keys for s in idf.idfobjects[key]]
+
+
+def test_relativenorth():
+    """py.test for transforms of a relative zone with a relative north"""
+    thetxt = idftxt.replace('World', 'Relative').replace(
+        'Zone, z1, 0,', 'Zone, z1, 30,')
+    for func, args, matrix in (
+            (transforms.mirror, (), np.diag([-1, 1, 1])),
+            (transforms.scale, ((2, 1, 0.5), ), np.diag([2, 1, 0.5])),
+            (transforms.rotate, (90, ), np.array([[0, -1, 0], [1, 0, 0],
+                                                  [0, 0, 1]]))):
+        idf = IDF(StringIO(thetxt))
+        before = worldcoords(idf)
+        func(idf, *args)
+        expected = []
+        for pnts in before:
+            pnts = [matrix.dot(pnt) for pnt in pnts]
+            if np.linalg.det(matrix) < 0:  # the order is reversed
+                pnts = pnts[:1] + pnts[1:][::-1]
+            expected.append(pnts)
+        after = worldcoords(idf)
+        assert [len(pnts) for pnts in after] == [len(pnts)
+                                                 for pnts in expected]
+        assert np.allclose(np.concatenate(after), np.concatenate(expected))
+    # rotate keeps the relative north, mirror negates it
+    assert idf.idfobjects['ZONE'][0].Direction_of_Relative_North == 30
+    idf = IDF(StringIO(thetxt))
+    transforms.mirror(idf)
+    assert idf.idfobjects['ZONE'][0].Direction_of_Relative_North == -30
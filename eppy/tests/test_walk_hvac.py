@@ -11,7 +11,16 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from six import StringIO
+
+from eppy import hvacbuilder
 from eppy import walk_hvac
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
 
 e1 = [(('p_loop Supply Inlet', 'epnode'), 'Central_Chiller'), ('Central_Chiller', ('Central_Chiller_np1_node', 'epnode')), (('Central_Chiller_np1_node', 'epnode'), 'np1'), ('np1', ('np1_np2_node', 'epnode')), (('np1_np2_node', 'epnode'), 'np2'), ('np2', ('np2_Outlet_Node_Name', 'epnode')), (('sb1_pipe_inlet', 'epnode'), 'sb1_pipe'), ('sb1_pipe', ('sb1_pipe_outlet', 'epnode')), (('sb2_pipe_inlet', 'epnode'), 'sb2_pipe'), ('sb2_pipe', ('sb2_pipe_outlet', 'epnode')), (('sb3_pipe_inlet', 'epnode'), 'sb3_pipe'), ('sb3_pipe', ('sb3_pipe_outlet', 'epnode')), (('sb4_pipe_inlet', 'epnode'), 'sb4_pipe'), ('sb4_pipe', ('p_loop Supply Outlet', 'epnode')), (('p_loop Demand Inlet', 'epnode'), 'db0_pipe'), ('db0_pipe', ('db0_pipe_outlet', 'epnode')), (('db1_pipe_inlet', 'epnode'), 'db1_pipe'), ('db1_pipe', ('db1_pipe_outlet', 'epnode')), (('db2_pipe_inlet', 'epnode'), 'db2_pipe'), ('db2_pipe', ('db2_pipe_outlet', 'epnode')), (('db3_pipe_inlet', 'epnode'), 'db3_pipe'), ('db3_pipe', ('db3_pipe_outlet', 'epnode')), (('db4_pipe_inlet', 'epnode'), 'db4_pipe'), ('db4_pipe', ('p_loop Demand Outlet', 'epnode')), (('np2_Outlet_Node_Name', 'epnode'), 'p_loop_supply_splitter'), ('p_loop_supply_splitter', ('sb1_pipe_inlet', 'epnode')), ('p_loop_supply_splitter', ('sb2_pipe_inlet', 'epnode')), ('p_loop_supply_splitter', ('sb3_pipe_inlet', 'epnode')), (('db0_pipe_outlet', 'epnode'), 'p_loop_demand_splitter'), ('p_loop_demand_splitter', ('db1_pipe_inlet', 'epnode')), ('p_loop_demand_splitter', ('db2_pipe_inlet', 'epnode')), ('p_loop_demand_splitter', ('db3_pipe_inlet', 'epnode')), ('p_loop_supply_mixer', ('sb4_pipe_inlet', 'epnode')), (('sb1_pipe_outlet', 'epnode'), 'p_loop_supply_mixer'), (('sb2_pipe_outlet', 'epnode'), 'p_loop_supply_mixer'), (('sb3_pipe_outlet', 'epnode'), 'p_loop_supply_mixer'), ('p_loop_demand_mixer', ('db4_pipe_inlet', 'epnode')), (('db1_pipe_outlet', 'epnode'), 'p_loop_demand_mixer'), (('db2_pipe_outlet', 'epnode'), 'p_loop_demand_mixer'), (('db3_pipe_outlet', 'epnode'), 'p_loop_demand_mixer')]
 
@@ -262,3 +271,51 @@ def test_prevnode():
         result = walk_hvac.prevnode(edges, comp)
         assert result == [prevcomp]
         
+
+def test_hvacgraph_nextprev():
+    """py.test for nextnode and prevnode with an HVACGraph"""
+    for edges in (e1, e2):
+        graph = walk_hvac.HVACGraph(edges)
+        components = [vertex for vertex in graph.vertices()
+                      if not walk_hvac.isnode(vertex)]
+        for comp in components + ['not_there']:
+            assert walk_hvac.nextnode(graph, comp) == walk_hvac.nextnode(
+                edges, comp)
+            assert walk_hvac.prevnode(graph, comp) == walk_hvac.prevnode(
+                edges, comp)
+
+def test_hvacgraph_path():
+    """py.test for HVACGraph.path"""
+    graph = walk_hvac.HVACGraph(e1)
+    result = graph.path('np2', 'sb2_pipe')
+    assert result == ['np2', ('np2_Outlet_Node_Name', 'epnode'),
+                      'p_loop_supply_splitter', ('sb2_pipe_inlet', 'epnode'),
+                      'sb2_pipe']
+    assert graph.path('sb2_pipe', 'np2') is None
+    assert graph.path('np2', 'not_there') is None
+    assert graph.path('np2', 'np2') == ['np2']
+
+def test_hvacgraph_groups():
+    """py.test for HVACGraph.groups and HVACGraph.connected"""
+    graph = walk_hvac.HVACGraph(e1)
+    groups = graph.groups()
+    assert len(groups) == 2 # supply side and demand side
+    assert graph.connected('Central_Chiller', 'sb4_pipe')
+    assert graph.connected('sb4_pipe', 'Central_Chiller')
+    assert not graph.connected('Central_Chiller', 'db1_pipe')
+    assert not graph.connected('Central_Chiller', 'not_there')
+    graph = walk_hvac.HVACGraph(e2)
+    # the chiller joins the chilled water and condenser loops
+    assert graph.connected(u'CW Circ Pump', u'Condenser Demand Inlet Pipe')
+    assert not graph.connected(u'CW Circ Pump', u'HW Circ Pump')
+
+def test_hvacgraph():
+    """py.test for hvacgraph"""
+    idf = IDF(StringIO(""))
+    hvacbuilder.makeplantloop(idf, "p_loop", ['sb0', ['sb1', 'sb2'], 'sb3'],
+                              ['db0', ['db1', 'db2'], 'db3'])
+    graph = walk_hvac.hvacgraph(idf)
+    assert graph.nextcomponents('sb0_pipe') == ['p_loop_supply_splitter']
+    assert graph.prevcomponents('p_loop_supply_mixer') == ['sb1_pipe',
+                                                           'sb2_pipe']
+    assert graph.connected('sb0_pipe', 'sb3_pipe')
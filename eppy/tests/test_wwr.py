@@ -0,0 +1,97 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for wwr.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+import eppy.wwr as wwr
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt = """
+BuildingSurface:Detailed, s1, Wall, Ext, Z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 0,0,3, 0,0,0, 10,0,0, 10,0,3;
+BuildingSurface:Detailed, s2, Wall, Ext, Z2, Outdoors, , SunExposed,
+    WindExposed, , 4, 10,0,3, 10,0,0, 20,0,0, 20,0,3;
+Wall:Detailed, e1, Ext, Z2, Outdoors, , SunExposed, WindExposed, , 4,
+    20,0,3, 20,0,0, 20,10,0, 20,10,3;
+BuildingSurface:Detailed, n1, Wall, Int, Z1, Surface, x, NoSun,
+    NoWind, , 4, 20,10,3, 20,10,0, 0,10,0, 0,10,3;
+BuildingSurface:Detailed, f1, Floor, Ext, Z1, Ground, , NoSun,
+    NoWind, , 4, 0,10,0, 20,10,0, 20,0,0, 0,0,0;
+FenestrationSurface:Detailed, win1, Window, Glass, s1, , , , , 2, 4,
+    1,0,2, 1,0,1, 4,0,1, 4,0,2;
+FenestrationSurface:Detailed, win2, Window, Glass, s2, , , , , , 4,
+    11,0,2, 11,0,1, 14,0,1, 14,0,2;
+FenestrationSurface:Detailed, door1, Door, Door, e1, , , , , , 4,
+    20,1,2, 20,1,0, 20,2,0, 20,2,2;
+FenestrationSurface:Detailed, win3, Window, Glass, n1, , , , , , 4,
+    5,10,2, 5,10,1, 3,10,1, 3,10,2;
+"""
+
+
+def test_orientations():
+    """py.test for orientations"""
+    data = (
+        (0, 4, 'North'),
+        # azimuth, bins, orientation
+        (44.9, 4, 'North'),
+        (45, 4, 'East'),
+        (180, 4, 'South'),
+        (315, 4, 'North'),
+        (270, 4, 'West'),
+        (45, 8, 'NorthEast'),
+        (350, 8, 'North'),
+        )
+    for azimuth, bins, answer in data:
+        assert wwr.orientations([azimuth], bins) == [answer]
+
+
+def test_wwr():
+    """py.test for wwr"""
+    idf = IDF(StringIO(idftxt))
+    result = wwr.wwr(idf)
+    assert sorted(result.keys()) == ['East', 'South']
+    assert almostequal(result['South']['wall'], 60)
+    assert almostequal(result['South']['window'], 9)  # win1 times 2
+    assert almostequal(result['South']['wwr'], 0.15)
+    assert result['East']['wwr'] == 0  # a door is not a window
+    result = wwr.wwr(idf, by='zone')
+    assert almostequal(result['Z1']['wwr'], 0.2)
+    assert almostequal(result['Z2']['wwr'], 3 / 60.)
+    result = wwr.wwr(idf, by='both')
+    assert sorted(result.keys()) == [
+        ('Z1', 'South'), ('Z2', 'East'), ('Z2', 'South')]
+
+
+def test_setwwr():
+    """py.test for setwwr"""
+    idf = IDF(StringIO(idftxt))
+    result = wwr.setwwr(idf, 0.3)
+    assert almostequal(result['South']['wwr'], 0.3)
+    assert result['East']['wwr'] == 0
+    window = idf.getobject('FENESTRATIONSURFACE:DETAILED', 'win2')
+    assert almostequal(window.area, 6)
+    # scaled about its centre
+    xs = [x for x, _y, _z in window.coords]
+    zs = [z for _x, _y, z in window.coords]
+    assert almostequal(sum(xs) / 4, 12.5)
+    assert almostequal(sum(zs) / 4, 1.5)
+    result = wwr.setwwr(idf, {'Z1': 0.1}, by='zone')
+    assert almostequal(result['Z1']['wwr'], 0.1)
+    assert almostequal(result['Z2']['wwr'], 6 / 60.)  # not changed
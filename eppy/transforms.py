@@ -0,0 +1,169 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""move, rotate, scale or mirror all the geometry of an idf
+
+All the vertices of the surfaces, windows and shading surfaces (the
+*:Detailed objects) are gathered into one array, transformed together and
+written back. The zone origins are transformed with them.
+
+When the Coordinate_System in GlobalGeometryRules is Relative, the vertices
+of the zone surfaces are relative to the zone origin, and turned by the
+Direction_of_Relative_North of the zone. The zone origin is then moved and
+the vertices are only rotated, scaled or mirrored, in the axes of their
+zone. A mirror negates the Direction_of_Relative_North of the zones.
+
+A mirror turns the surfaces inside out. The order of their vertices is
+reversed, so that they still face out.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+
+import numpy as np
+
+from eppy.geometry import surfacearrays
+
+
+# vertices are relative to the zone origin, if the coordinate system is
+# relative
+ZONEKEYS = [
+    "BuildingSurface:Detailed",
+    "Wall:Detailed",
+    "RoofCeiling:Detailed",
+    "Floor:Detailed",
+    "FenestrationSurface:Detailed",
+    "Shading:Zone:Detailed", ]
+OTHERKEYS = [
+    "Shading:Site:Detailed",
+    "Shading:Building:Detailed", ]
+ORIGINFIELDS = ['X_Origin', 'Y_Origin', 'Z_Origin']
+NORTHFIELD = 'Direction_of_Relative_North'
+# the field with the surface that windows and zone shades are on
+HOSTFIELDS = {
+    'FENESTRATIONSURFACE:DETAILED': 'Building_Surface_Name',
+    'SHADING:ZONE:DETAILED': 'Base_Surface_Name', }
+
+
+def isrelative(idf):
+    """True if the vertices of the zone surfaces are relative to the zone
+    origin"""
+    rules = idf.idfobjects['GLOBALGEOMETRYRULES']
+    if not rules:
+        return False
+    return rules[0].Coordinate_System.upper() == 'RELATIVE'
+
+
+def northmatrix(north):
+    """the matrix that turns relative vertices into world vertices for a
+    Direction_of_Relative_North of north degrees (clockwise)"""
+    cos, sin = math.cos(math.radians(-north)), math.sin(math.radians(-north))
+    return np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
+
+
+def _zonenorths(idf, surfaces):
+    """the Direction_of_Relative_North of the zone of each surface"""
+    norths = dict((zone.Name.upper(), float(zone[NORTHFIELD] or 0))
+                  for zone in idf.idfobjects['ZONE'])
+    zonenames = dict((surface.Name.upper(), surface.Zone_Name.upper())
+                     for surface in surfaces
+                     if surface.key.upper() not in HOSTFIELDS)
+    result = []
+    for surface in surfaces:
+        hostfield = HOSTFIELDS.get(surface.key.upper())
+        if hostfield is None:
+            zonename = surface.Zone_Name.upper()
+        else:
+            zonename = zonenames.get(surface[hostfield].upper(), '')
+        result.append(norths.get(zonename, 0.0))
+    return result
+
+
+def _transformsurfaces(surfaces, matrix, offset):
+    """points * matrix + offset for all the vertices of the surfaces"""
+    points, nvertices = surfacearrays.gathervertices(surfaces)
+    points = points.dot(matrix.T) + offset
+    if np.linalg.det(matrix) < 0:  # mirrored. keep the first vertex
+        start = 0
+        for num in nvertices:
+            rest = slice(start + 1, start + num)
+            points[rest] = points[rest][::-1].copy()
+            start += num
+    surfacearrays.scattervertices(surfaces, points, nvertices)
+
+
+def transform(idf, matrix, offset=(0, 0, 0)):
+    """transform all the geometry of the idf: point = matrix . point + offset
+
+    matrix is a 3 x 3 matrix. returns the number of surfaces transformed"""
+    matrix = np.asarray(matrix, dtype=float)
+    offset = np.asarray(offset, dtype=float)
+    relative = isrelative(idf)
+    zonesurfaces = surfacearrays.getsurfaces(idf, ZONEKEYS)
+    othersurfaces = surfacearrays.getsurfaces(idf, OTHERKEYS)
+    mirrored = np.linalg.det(matrix) < 0
+    if relative:
+        # world = northmatrix(north) . vertex + origin, for each zone
+        bynorth = {}
+        for surface, north in zip(zonesurfaces,
+                                  _zonenorths(idf, zonesurfaces)):
+            bynorth.setdefault(north, []).append(surface)
+        for north, surfaces in bynorth.items():
+            newnorth = -north if mirrored else north
+            zonematrix = northmatrix(newnorth).T.dot(matrix).dot(
+                northmatrix(north))
+            _transformsurfaces(surfaces, zonematrix, np.zeros(3))
+        _transformsurfaces(othersurfaces, matrix, offset)
+    else:
+        _transformsurfaces(zonesurfaces + othersurfaces, matrix, offset)
+    zones = idf.idfobjects['ZONE']
+    origins = np.array([[float(zone[field] or 0) for field in ORIGINFIELDS]
+                        for zone in zones]).reshape((len(zones), 3))
+    origins = origins.dot(matrix.T) + offset
+    for zone, origin in zip(zones, origins.tolist()):
+        for field, value in zip(ORIGINFIELDS, origin):
+            zone[field] = value
+        if relative and mirrored and float(zone[NORTHFIELD] or 0):
+            zone[NORTHFIELD] = -float(zone[NORTHFIELD])
+    return len(zonesurfaces) + len(othersurfaces)
+
+
+def _about(matrix, center):
+    """(matrix, offset) to transform about center"""
+    center = np.asarray(center, dtype=float)
+    return matrix, center - np.asarray(matrix).dot(center)
+
+
+def translate(idf, offset):
+    """move all the geometry of the idf by offset (x, y, z)"""
+    return transform(idf, np.identity(3), offset)
+
+
+def rotate(idf, angle, center=(0, 0, 0)):
+    """rotate all the geometry of the idf about a vertical axis through
+    center. angle is in degrees, anticlockwise seen from above"""
+    cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    matrix = np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
+    return transform(idf, *_about(matrix, center))
+
+
+def scale(idf, factor, center=(0, 0, 0)):
+    """scale all the geometry of the idf about center.
+    factor is a number or (x factor, y factor, z factor)"""
+    matrix = np.diag(np.ones(3) * factor)
+    return transform(idf, *_about(matrix, center))
+
+
+def mirror(idf, normal=(1, 0, 0), point=(0, 0, 0)):
+    """mirror all the geometry of the idf in the plane through point with
+    the normal. The default mirrors x in the plane x = 0"""
+    normal = np.asarray(normal, dtype=float)
+    normal = normal / np.sqrt((normal ** 2).sum())
+    matrix = np.identity(3) - 2 * np.outer(normal, normal)
+    return transform(idf, *_about(matrix, point))
@@ -12,6 +12,11 @@ There are two output files saved in the same location as the idf file:
 - idf_file_location/idf_filename.dot
 - idf_file_location/idf_filename.png
 
+With --loops there is a diagram for each loop:
+- idf_file_location/idf_filename_loopname.dot
+- idf_file_location/idf_filename_loopname.png
+
+With --dotonly graphviz is not run and only the .dot files are saved.
 """
 from __future__ import absolute_import
 from __future__ import division
@@ -19,6 +24,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import os
+import subprocess
 import sys
 
 pathnameto_eplusscripting = "../../"
@@ -31,10 +37,14 @@ from eppy.EPlusInterfaceFunctions import readidf
 try:
     import pydot
 except ImportError:
-    import pydot3k as pydot
+    try:
+        import pydot3k as pydot
+    except ImportError:
+        pydot = None  # only needed for makediagram. writedot does not use it
 from six import string_types
 
 import eppy.loops as loops
+from eppy.walk_hvac import HVACGraph
 
 
 pathnameto_eplusscripting = "../../"
@@ -64,38 +74,37 @@ def bothnodes(edge):
     
 def dropnodes(edges):
     """draw a graph without the nodes"""
+    into = {}  # the edges that end at each node
+    outof = {}  # the edges that start at each node
+    for edge in edges:
+        into.setdefault(edge[1], []).append(edge)
+        outof.setdefault(edge[0], []).append(edge)
     newedges = []
-    added = False
+    found = set()
+    def addedge(newtup, unique=True):
+        """add newtup to newedges"""
+        if not unique or newtup not in found:
+            newedges.append(newtup)
+            found.add(newtup)
     for edge in edges:
+        added = False
         if bothnodes(edge):
-            newtup = (edge[0][0], edge[1][0])
-            newedges.append(newtup)
+            addedge((edge[0][0], edge[1][0]), unique=False)
             added = True
         elif firstisnode(edge):
-            for edge1 in edges:
-                if edge[0] == edge1[1]:
-                    newtup = (edge1[0], edge[1])
-                    try:
-                        newedges.index(newtup)
-                    except ValueError as e:
-                        newedges.append(newtup)
-                    added = True
+            for edge1 in into.get(edge[0], []):
+                addedge((edge1[0], edge[1]))
+                added = True
         elif secondisnode(edge):
-            for edge1 in edges:
-                if edge[1] == edge1[0]:
-                    newtup = (edge[0], edge1[1])
-                    try:
-                        newedges.index(newtup)
-                    except ValueError as e:
-                        newedges.append(newtup)
-                    added = True
+            for edge1 in outof.get(edge[1], []):
+                addedge((edge[0], edge1[1]))
+                added = True
         # gets the hanging nodes - nodes with no connection
         if not added:
             if firstisnode(edge):
-                newedges.append((edge[0][0], edge[1]))
+                addedge((edge[0][0], edge[1]), unique=False)
             if secondisnode(edge):
-                newedges.append((edge[0], edge[1][0]))
-        added = False
+                addedge((edge[0], edge[1][0]), unique=False)
     return newedges
     
     
@@ -139,6 +148,9 @@ def edges2nodes(edges):
     
 def makediagram(edges):
     """make the diagram with the edges"""
+    if pydot is None:
+        raise ImportError("makediagram needs pydot. Use savedot to write "
+                          "the DOT file without it")
     graph = pydot.Dot(graph_type='digraph')
     nodes = edges2nodes(edges)
     epnodes = [(node, 
@@ -154,6 +166,143 @@ def makediagram(edges):
     return graph
 
 
+def dotid(name):
+    """the name as a quoted DOT id"""
+    return '"%s"' % (name.replace('\\', '\\\\').replace('"', '\\"'), )
+
+
+DOTSTYLES = {
+    "epnode": 'shape=plaintext',
+    "EndNode": 'shape=doubleoctagon, style=filled, fillcolor="#e4e4e4"',
+    None: 'shape=box3d', }
+
+
+def writedot(edges, fhandle):
+    """write the diagram of the edges to fhandle as DOT text
+
+    the same diagram as makediagram, without making the pydot objects"""
+    nodes = edges2nodes(edges)
+    fhandle.write("digraph G {\n")
+    for node in nodes:
+        if istuple(node):
+            name, style = node[0], DOTSTYLES.get(nodetype(node))
+            if style is None:  # not a node type that makediagram draws
+                continue
+        else:
+            name, style = node, DOTSTYLES[None]
+        fhandle.write("%s [label=%s, %s];\n" % (dotid(name), dotid(name),
+                                                 style))
+    for e1, e2 in edges:
+        e1 = e1[0] if istuple(e1) else e1
+        e2 = e2[0] if istuple(e2) else e2
+        fhandle.write("%s -> %s;\n" % (dotid(e1), dotid(e2)))
+    fhandle.write("}\n")
+
+
+def fieldvalues(data, commdct, objkey, fieldnames):
+    """the values of the fields of each object of objkey. Fields that are
+    not in the object are ''"""
+    objcomm = commdct[data.dtls.index(objkey)]
+    fieldindex = dict((comm['field'][0], i) for i, comm in enumerate(objcomm)
+                      if 'field' in comm)
+    indexes = [fieldindex[fieldname] for fieldname in fieldnames]
+    return [[obj[i] if i < len(obj) else '' for i in indexes]
+            for obj in data.dt[objkey]]
+
+
+def loopedges(data, commdct, edges):
+    """the edges of each loop [(loopname, edges), ...]
+
+    a loop has the components and connectors of its branch lists and
+    connector lists, and the nodes between them. An air loop also has all
+    that its demand side inlet nodes lead to (the zone equipment and
+    zones). The inlet nodes can be a NodeList"""
+    branchkey = 'BRANCH'
+    cnames = loops.repeatingfields(data, commdct, branchkey,
+                                   "Component %s Name")
+    nodenames = (
+        loops.repeatingfields(data, commdct, branchkey,
+                              "Component %s Inlet Node Name") +
+        loops.repeatingfields(data, commdct, branchkey,
+                              "Component %s Outlet Node Name"))
+    inbranches = {}
+    for branch, values in zip(
+            data.dt[branchkey],
+            fieldvalues(data, commdct, branchkey, cnames + nodenames)):
+        vertices = inbranches.setdefault(branch[1].upper(), set())
+        vertices.update(name for name in values[:len(cnames)] if name)
+        vertices.update((node, "epnode")
+                        for node in values[len(cnames):] if node)
+    branchlists = dict((obj[1].upper(), obj[2:])
+                       for obj in data.dt['BRANCHLIST'])
+    connectorlists = dict((obj[1].upper(), obj[3::2])
+                          for obj in data.dt['CONNECTORLIST'])
+    nodelists = dict((obj[1].upper(), [node for node in obj[2:] if node])
+                     for obj in data.dt.get('NODELIST', []))
+    loopfields = (
+        ("AIRLOOPHVAC", ["Name", "Branch List Name", "Connector List Name",
+                         "Demand Side Inlet Node Names"]),
+        ("PLANTLOOP", ["Name", "Plant Side Branch List Name",
+                       "Plant Side Connector List Name",
+                       "Demand Side Branch List Name",
+                       "Demand Side Connector List Name"]),
+        ("CONDENSERLOOP", ["Name", "Condenser Side Branch List Name",
+                           "Condenser Side Connector List Name",
+                           "Condenser Demand Side Branch List Name",
+                           "Condenser Demand Side Connector List Name"]))
+    graph = HVACGraph(edges)
+    result = []
+    for loopkey, fields in loopfields:
+        for values in fieldvalues(data, commdct, loopkey, fields):
+            vertices = set()
+            for value in values[1:]:
+                value = value.upper()
+                for bname in branchlists.get(value, []):
+                    vertices.update(inbranches.get(bname.upper(), []))
+                vertices.update(connectorlists.get(value, []))
+            if loopkey == "AIRLOOPHVAC":  # the zone side of the air loop
+                inlets = nodelists.get(values[-1].upper(), [values[-1]])
+                stack = [(node, "epnode") for node in inlets]
+                while stack:
+                    vertex = stack.pop()
+                    if vertex not in vertices:
+                        vertices.add(vertex)
+                        stack.extend(graph.successors.get(vertex, []))
+            theedges = [(e1, e2) for e1, e2 in edges
+                        if e1 in vertices and e2 in vertices]
+            result.append((values[0], theedges))
+    return result
+
+
+def savedot(fname, edges, png=True, silent=False):
+    """write the DOT file of the edges next to fname. If png is True run
+    graphviz to make the png file. returns the name of the DOT file"""
+    dotname = '%s.dot' % (os.path.splitext(fname)[0])
+    with open(dotname, 'w') as fhandle:
+        writedot(edges, fhandle)
+    if not silent:
+        print("saved file: %s" % (dotname))
+    if png:
+        pngname = '%s.png' % (os.path.splitext(fname)[0])
+        subprocess.check_call(['dot', '-Tpng', dotname, '-o', pngname])
+        if not silent:
+            print("saved file: %s" % (pngname))
+    return dotname
+
+
+def make_and_save_dot(fname, iddfile, png=True, byloop=False):
+    """save the diagram of the idf file fname as DOT text, without pydot.
+    If byloop is True save a diagram for each loop"""
+    data, commdct, _iddindex = readidf.readdatacommdct(fname, iddfile=iddfile)
+    edges = makeairplantloop(data, commdct)
+    if not byloop:
+        return [savedot(fname, edges, png=png)]
+    root, ext = os.path.splitext(fname)
+    return [savedot('%s_%s%s' % (root, replace_colon(loopname, '_'), ext),
+                    theedges, png=png)
+            for loopname, theedges in loopedges(data, commdct, edges)]
+
+
 def transpose2d(mtx):
     """Transpose a 2d matrix
        [
@@ -239,7 +388,10 @@ def makeairplantloop(data, commdct):
     branch_i_o = {}
     for br in branches:
         br_name = br[1]
-        in_out = loops.branch_inlet_outlet(data, commdct, br_name)
+        if br_name in branch_i_o:
+            continue # the first branch of that name, as branch_inlet_outlet
+        # same as loops.branch_inlet_outlet without looking up each branch
+        in_out = [br[6], br[len(br) - 2]]
         branch_i_o[br_name] = dict(list(zip(["inlet", "outlet"], in_out)))
     # for br_name, in_out in branch_i_o.items():
     #     edges.append(((in_out["inlet"], anode), br_name))
@@ -558,8 +710,19 @@ def main():
         action='store',
         help='location of idf file = ./somewhere/f1.idf',
     )
+    parser.add_argument(
+        '--loops',
+        action='store_true',
+        help='make a diagram for each loop',
+    )
+    parser.add_argument(
+        '--dotonly',
+        action='store_true',
+        help='save the .dot files only. graphviz is not run',
+    )
     args = parser.parse_args()
-    make_and_save_diagram(args.file, args.idd)
+    make_and_save_dot(args.file, args.idd, png=not args.dotonly,
+                      byloop=args.loops)
 
 
 if __name__ == "__main__":
@@ -9,12 +9,138 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from collections import deque
+
 e = [(('p_loop Supply Inlet', 'epnode'), 'Central_Chiller'), ('Central_Chiller', ('Central_Chiller_np1_node', 'epnode')), (('Central_Chiller_np1_node', 'epnode'), 'np1'), ('np1', ('np1_np2_node', 'epnode')), (('np1_np2_node', 'epnode'), 'np2'), ('np2', ('np2_Outlet_Node_Name', 'epnode')), (('sb1_pipe_inlet', 'epnode'), 'sb1_pipe'), ('sb1_pipe', ('sb1_pipe_outlet', 'epnode')), (('sb2_pipe_inlet', 'epnode'), 'sb2_pipe'), ('sb2_pipe', ('sb2_pipe_outlet', 'epnode')), (('sb3_pipe_inlet', 'epnode'), 'sb3_pipe'), ('sb3_pipe', ('sb3_pipe_outlet', 'epnode')), (('sb4_pipe_inlet', 'epnode'), 'sb4_pipe'), ('sb4_pipe', ('p_loop Supply Outlet', 'epnode')), (('p_loop Demand Inlet', 'epnode'), 'db0_pipe'), ('db0_pipe', ('db0_pipe_outlet', 'epnode')), (('db1_pipe_inlet', 'epnode'), 'db1_pipe'), ('db1_pipe', ('db1_pipe_outlet', 'epnode')), (('db2_pipe_inlet', 'epnode'), 'db2_pipe'), ('db2_pipe', ('db2_pipe_outlet', 'epnode')), (('db3_pipe_inlet', 'epnode'), 'db3_pipe'), ('db3_pipe', ('db3_pipe_outlet', 'epnode')), (('db4_pipe_inlet', 'epnode'), 'db4_pipe'), ('db4_pipe', ('p_loop Demand Outlet', 'epnode')), (('np2_Outlet_Node_Name', 'epnode'), 'p_loop_supply_splitter'), ('p_loop_supply_splitter', ('sb1_pipe_inlet', 'epnode')), ('p_loop_supply_splitter', ('sb2_pipe_inlet', 'epnode')), ('p_loop_supply_splitter', ('sb3_pipe_inlet', 'epnode')), (('db0_pipe_outlet', 'epnode'), 'p_loop_demand_splitter'), ('p_loop_demand_splitter', ('db1_pipe_inlet', 'epnode')), ('p_loop_demand_splitter', ('db2_pipe_inlet', 'epnode')), ('p_loop_demand_splitter', ('db3_pipe_inlet', 'epnode')), ('p_loop_supply_mixer', ('sb4_pipe_inlet', 'epnode')), (('sb1_pipe_outlet', 'epnode'), 'p_loop_supply_mixer'), (('sb2_pipe_outlet', 'epnode'), 'p_loop_supply_mixer'), (('sb3_pipe_outlet', 'epnode'), 'p_loop_supply_mixer'), ('p_loop_demand_mixer', ('db4_pipe_inlet', 'epnode')), (('db1_pipe_outlet', 'epnode'), 'p_loop_demand_mixer'), (('db2_pipe_outlet', 'epnode'), 'p_loop_demand_mixer'), (('db3_pipe_outlet', 'epnode'), 'p_loop_demand_mixer')]
 
 
+def isnode(vertex):
+    """True if the vertex of the edges is a node, like ('name', 'epnode')"""
+    return type(vertex) == tuple
+
+
+class HVACGraph(object):
+    """the edges of the HVAC model as adjacency lists in both directions
+
+    edges are the edges from loopdiagram.makeairplantloop. The components
+    are names and the nodes are tuples like ('name', 'epnode'). The lists
+    are made once, so each step of a walk through the loops looks at the
+    neighbours of one vertex only, instead of all the edges."""
+
+    def __init__(self, edges):
+        self.edges = list(edges)
+        self.successors = {}
+        self.predecessors = {}
+        for first, second in self.edges:
+            self.successors.setdefault(first, []).append(second)
+            self.predecessors.setdefault(second, []).append(first)
+            self.successors.setdefault(second, [])
+            self.predecessors.setdefault(first, [])
+        self._groups = None
+
+    def vertices(self):
+        """all the components and nodes"""
+        return list(self.successors.keys())
+
+    def _step(self, component, neighbours):
+        """the components next to component, through nodes or directly.
+        Same as nextnode and prevnode with the edges"""
+        comps = []
+        for vertex in neighbours[component]:
+            further = neighbours[vertex] if isnode(vertex) else None
+            if not further:
+                # an end of the loop or a direct link
+                comps = []
+                break
+            comps.append(further[0])
+        comps.extend(vertex for vertex in neighbours[component]
+                     if not isnode(vertex))
+        return comps
+
+    def nextcomponents(self, component):
+        """get the next components in the loop"""
+        if component not in self.successors:
+            return []
+        return self._step(component, self.successors)
+
+    def prevcomponents(self, component):
+        """get the previous components in the loop"""
+        if component not in self.predecessors:
+            return []
+        return self._step(component, self.predecessors)
+
+    def path(self, start, end):
+        """the shortest path of components and nodes from start to end,
+        following the direction of the edges. None if there is no path"""
+        if start not in self.successors or end not in self.successors:
+            return None
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            vertex = queue.popleft()
+            if vertex == end:
+                path = []
+                while vertex is not None:
+                    path.append(vertex)
+                    vertex = previous[vertex]
+                return path[::-1]
+            for other in self.successors[vertex]:
+                if other not in previous:
+                    previous[other] = vertex
+                    queue.append(other)
+        return None
+
+    def _makegroups(self):
+        """the number of the connected group of each vertex. The direction
+        of the edges is ignored"""
+        groups = {}
+        group = -1
+        for vertex in self.successors:
+            if vertex in groups:
+                continue
+            group += 1
+            groups[vertex] = group
+            stack = [vertex]
+            while stack:
+                current = stack.pop()
+                for other in (self.successors[current] +
+                              self.predecessors[current]):
+                    if other not in groups:
+                        groups[other] = group
+                        stack.append(other)
+        return groups
+
+    def groups(self):
+        """the connected groups of vertices [set(vertices), ...]. A plant
+        loop with its condenser loop is one group, through the chiller"""
+        if self._groups is None:
+            self._groups = self._makegroups()
+        result = {}
+        for vertex, group in self._groups.items():
+            result.setdefault(group, set()).add(vertex)
+        return [result[group] for group in sorted(result)]
+
+    def connected(self, vertex1, vertex2):
+        """True if there is a path between the vertices, in any direction"""
+        if self._groups is None:
+            self._groups = self._makegroups()
+        group1 = self._groups.get(vertex1)
+        return group1 is not None and group1 == self._groups.get(vertex2)
+
+
+def hvacgraph(idf):
+    """the HVACGraph of all the loops in the idf"""
+    from eppy.useful_scripts import loopdiagram
+    return HVACGraph(loopdiagram.makeairplantloop(idf.model, idf.idd_info))
+
 
 def nextnode(edges, component):
-    """get the next component in the loop"""
+    """get the next component in the loop
+
+    edges is the list of edges or an HVACGraph of them. Use the HVACGraph
+    to walk through large loops"""
+    if isinstance(edges, HVACGraph):
+        return edges.nextcomponents(component)
     e = edges
     c = component
     n2c = [(a, b) for a, b in e if type(a) == tuple]
@@ -37,7 +163,11 @@ def nextnode(edges, component):
     return cs
 
 def prevnode(edges, component):
-    """get the pervious component in the loop"""
+    """get the pervious component in the loop
+
+    edges is the list of edges or an HVACGraph of them"""
+    if isinstance(edges, HVACGraph):
+        return edges.prevcomponents(component)
     e = edges
     c = component
     n2c = [(a, b) for a, b in e if type(a) == tuple]
@@ -0,0 +1,157 @@
+# Copyright (c) 2018 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""window to wall ratios of the exterior walls, by orientation or by zone
+
+The exterior walls (Outside_Boundary_Condition = Outdoors) and their
+windows and glass doors are found once. The windows are grouped by the
+wall they are on (their Building_Surface_Name), so the ratios of the whole
+model come from one pass. The areas of the windows include their
+Multiplier.
+
+setwwr scales the windows about their centres to get the ratios asked for.
+The windows are not checked against the edges of their walls. A ratio that
+is too large will push them past the edges.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import numpy as np
+
+from eppy.geometry import surfacearrays
+
+
+WALLKEYS = [
+    'BUILDINGSURFACE:DETAILED',
+    'WALL:DETAILED', ]
+WINDOWTYPES = ['WINDOW', 'GLASSDOOR']
+ORIENTATIONS = {
+    4: ['North', 'East', 'South', 'West'],
+    8: ['North', 'NorthEast', 'East', 'SouthEast', 'South', 'SouthWest',
+        'West', 'NorthWest'], }
+
+
+def orientations(azimuths, bins=4):
+    """the orientation of each azimuth. bins is 4 or 8 (see ORIENTATIONS)"""
+    labels = ORIENTATIONS[bins]
+    width = 360. / bins
+    index = ((np.asarray(azimuths) + width / 2) % 360 // width).astype(int)
+    return [labels[i] for i in index]
+
+
+def exteriorwalls(idf):
+    """the walls of the idf that face outdoors"""
+    walls = []
+    for key in WALLKEYS:
+        for surface in idf.idfobjects[key]:
+            if surface.Outside_Boundary_Condition.upper() != 'OUTDOORS':
+                continue
+            if (key == 'WALL:DETAILED' or
+                    surface.Surface_Type.upper() == 'WALL'):
+                walls.append(surface)
+    return walls
+
+
+def wallwindows(idf, walls):
+    """the windows and glass doors on the walls
+
+    returns (windows, host) where host is the index in walls of the wall of
+    each window"""
+    wallindex = dict((wall.Name.upper(), i) for i, wall in enumerate(walls))
+    windows = []
+    host = []
+    for window in idf.idfobjects['FENESTRATIONSURFACE:DETAILED']:
+        if window.Surface_Type.upper() not in WINDOWTYPES:
+            continue
+        i = wallindex.get(window.Building_Surface_Name.upper())
+        if i is not None:
+            windows.append(window)
+            host.append(i)
+    return windows, np.array(host, dtype=int)
+
+
+def _wallgroups(walls, by, bins):
+    """the group of each wall: its orientation, its zone or both"""
+    vertices, _nvertices = surfacearrays.packsurfaces(walls)
+    facing = orientations(
+        surfacearrays.azimuths(surfacearrays.unitnormals(vertices)), bins)
+    if by == 'orientation':
+        return facing
+    zones = [wall.Zone_Name for wall in walls]
+    if by == 'zone':
+        return zones
+    if by == 'both':
+        return list(zip(zones, facing))
+    raise ValueError("by is 'orientation', 'zone' or 'both', not %s" % (by, ))
+
+
+def _windowareas(windows):
+    """the areas of the windows times their multipliers"""
+    vertices, _nvertices = surfacearrays.packsurfaces(windows)
+    multipliers = np.array([float(window.Multiplier or 1)
+                            for window in windows])
+    return surfacearrays.areas(vertices) * multipliers
+
+
+def _ratios(idf, by, bins):
+    """(groups, group of each window, windows, wall areas, window areas)"""
+    walls = exteriorwalls(idf)
+    windows, host = wallwindows(idf, walls)
+    wallgroups = _wallgroups(walls, by, bins)
+    groups = sorted(set(wallgroups))
+    groupindex = dict((group, i) for i, group in enumerate(groups))
+    iwall = np.array([groupindex[group] for group in wallgroups], dtype=int)
+    vertices, _nvertices = surfacearrays.packsurfaces(walls)
+    wallareas = np.bincount(iwall, surfacearrays.areas(vertices),
+                            minlength=len(groups))
+    iwindow = iwall[host] if len(host) else np.zeros(0, dtype=int)
+    windowareas = np.bincount(iwindow, _windowareas(windows),
+                              minlength=len(groups))
+    return groups, iwindow, windows, wallareas, windowareas
+
+
+def wwr(idf, by='orientation', bins=4):
+    """window to wall ratios of the exterior walls
+
+    by: 'orientation' (see orientations), 'zone' or 'both' (zone,
+    orientation). bins is the number of orientations, 4 or 8.
+    returns {group: dict(wall=wall area, window=window area, wwr=ratio)}"""
+    groups, _iwindow, _windows, wallareas, windowareas = _ratios(
+        idf, by, bins)
+    return dict((group, dict(wall=float(wallareas[i]),
+                             window=float(windowareas[i]),
+                             wwr=float(windowareas[i] / wallareas[i])
+                             if wallareas[i] else 0.0))
+                for i, group in enumerate(groups))
+
+
+def setwwr(idf, ratio, by='orientation', bins=4):
+    """scale the windows about their centres to the window to wall ratio
+
+    ratio is a number for all the groups or {group: ratio}. Groups that
+    are not in it, or that have no windows, are not changed. The groups are
+    as in wwr. returns wwr(idf, by, bins) after the windows are scaled"""
+    groups, iwindow, windows, wallareas, windowareas = _ratios(idf, by, bins)
+    if isinstance(ratio, dict):
+        targets = np.array([ratio.get(group, np.nan) for group in groups],
+                           dtype=float)
+    else:
+        targets = np.full(len(groups), float(ratio))
+    factors = np.ones(len(groups))
+    scaled = np.isfinite(targets) & (windowareas > 0)
+    factors[scaled] = np.sqrt(
+        targets[scaled] * wallareas[scaled] / windowareas[scaled])
+    points, nvertices = surfacearrays.gathervertices(windows)
+    factors = np.repeat(factors[iwindow], nvertices)  # for each vertex
+    iwindow = np.repeat(np.arange(len(windows)), nvertices)
+    sums = np.array([np.bincount(iwindow, points[:, i], len(windows))
+                     for i in range(3)]).T
+    centres = (sums / np.maximum(nvertices, 1)[:, None])[iwindow]
+    points = centres + (points - centres) * factors[:, None]
+    surfacearrays.scattervertices(windows, points, nvertices)
+    return wwr(idf, by, bins)